@@ -3,7 +3,31 @@ Backend package for SIKELAR application
 Contains data processing and utility functions
 """
 
-from .processor import BOSDataProcessor
-from .utils import FormatUtils
+import importlib
 
-__all__ = ['DataProcessor', 'FormatUtils']
\ No newline at end of file
+# Nama yang diekspor -> modul asalnya. Modul baru diimport saat nama dipakai,
+# jadi `import backend.xxx` tidak ikut memuat openpyxl/sqlite3 dan lainnya
+_EXPORTS = {
+    'BOSDataProcessor': 'processor',
+    'FormatUtils': 'utils',
+    'PengesahanValidator': 'validation',
+    'CancellationToken': 'cancellation',
+    'OperationCancelled': 'cancellation',
+    'ViewModelBuilder': 'view_models',
+    'DataSnapshot': 'snapshot',
+    'load_snapshot': 'snapshot',
+    'WorkbookSession': 'session',
+    'TransactionStore': 'store',
+}
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = ['DataProcessor', 'FormatUtils', 'PengesahanValidator', 'CancellationToken', 'OperationCancelled', 'ViewModelBuilder', 'DataSnapshot', 'load_snapshot', 'WorkbookSession', 'TransactionStore']
\ No newline at end of file
@@ -3,18 +3,78 @@ BKU Data processor for SIKELAR application
 Handles Excel BKU data extraction and processing
 """
 
-import openpyxl
+import hashlib
+from collections import namedtuple
 from typing import Dict, List
 from .utils import ExcelUtils
+from .cancellation import CancellationToken
+from .sheet_loader import load_sheet, BKU_SHEET
+from .sheet_extent import SheetExtent, BKU_KODE_REKENING_COLUMNS
+
+
+# Kolom yang dibaca ekstraksi BKU: tanggal/kode (A-G), uraian (K-M), jumlah (Q-S)
+BKU_COLUMNS = tuple(range(1, 8)) + tuple(range(11, 14)) + tuple(range(17, 20))
+# Jumlah baris per blok hash checkpoint
+CHECKPOINT_BLOCK_ROWS = 256
+# extract_merged_text/number membaca sampai 2 baris di atas/bawah (merged cell),
+# jadi baris terakhir checkpoint ikut diparse ulang saat ada baris baru
+MERGE_LOOKAROUND_ROWS = 2
+
+# Checkpoint ledger BKU terakhir yang diingest:
+# sheet_title, row_count (baris terakhir yang berisi data), block_hashes (rolling
+# hash per CHECKPOINT_BLOCK_ROWS baris, blok terakhir bisa tidak penuh),
+# groups (per kode rekening: key group -> jumlah, dari baris sebelum jendela
+# lookaround) dan tail_items (per kode rekening: pasangan (key, jumlah) baris
+# di jendela lookaround, yang diparse ulang saat ada baris baru)
+BKUCheckpoint = namedtuple('BKUCheckpoint', ['sheet_title', 'row_count', 'block_hashes', 'groups', 'tail_items'])
+
+
+def _tail_start_row(row_count):
+    """Baris pertama jendela lookaround: diparse ulang saat ledger ditambah baris baru"""
+    return max(1, row_count - MERGE_LOOKAROUND_ROWS + 1)
+
+
+def _row_values(sheet, row_idx):
+    """Nilai kolom BKU_COLUMNS pada satu baris"""
+    return tuple(sheet.cell(row=row_idx, column=col_idx).value for col_idx in BKU_COLUMNS)
+
+
+def _row_block_hashes(sheet, first_row, last_row, seed=b''):
+    """
+    Rolling hash BKU_COLUMNS per blok CHECKPOINT_BLOCK_ROWS baris mulai first_row.
+    Tiap hash diawali hash blok sebelumnya (seed), jadi hash terakhir mewakili
+    seluruh baris dari baris 1
+    """
+    hashes = []
+    block = hashlib.blake2b(seed, digest_size=16)
+    count = 0
+    for row_idx in range(first_row, last_row + 1):
+        block.update(repr(_row_values(sheet, row_idx)).encode('utf-8'))
+        count += 1
+        if count == CHECKPOINT_BLOCK_ROWS:
+            hashes.append(block.digest())
+            block = hashlib.blake2b(hashes[-1], digest_size=16)
+            count = 0
+    if count:
+        hashes.append(block.digest())
+    return hashes
+
 
 class BKUDataProcessor:
     def __init__(self):
         self.excel_utils = ExcelUtils()
+        self.cancel_token = CancellationToken()
         self.reset_data()
 
     def reset_data(self):
         """Reset all BKU data to initial state"""
         self.bku_data_available = False
+        self.checkpoint = None
+        self._previous_checkpoint = None
+        self._tail_start = 1
+        self._groups = {}
+        self._tail_items = {}
+        self.sheet_extent = None
         self.bku_belanja_persediaan_data = {
             'Triwulan 1': [],
             'Triwulan 2': [],
@@ -52,33 +112,50 @@ class BKUDataProcessor:
             'Triwulan 4': []
         }
 
-    def extract_bku_data(self, file_path):
-        """Ekstrak data BKU dari file Excel"""
-        workbook = openpyxl.load_workbook(file_path)
+    def extract_bku_data(self, file_path, cancel_token=None, checkpoint=None):
+        """Ekstrak data BKU dari file Excel, bisa dibatalkan lewat cancel_token"""
+        # Hanya sheet BKU (atau sheet kedua) yang dibaca, read-only tanpa style/gambar
+        bku_sheet = load_sheet(file_path, *BKU_SHEET, cancel_token)
+        self.extract_bku_sheet(bku_sheet, cancel_token, checkpoint)
+
+    def extract_bku_sheet(self, bku_sheet, cancel_token=None, checkpoint=None):
+        """
+        Ekstrak data BKU dari sheet yang sudah dimuat (SheetValues dari
+        sheet_loader, None jika tidak ada sheet BKU).
+        Dengan checkpoint dari upload sebelumnya file yang sama, jika baris lama
+        tidak berubah (hanya ditambah baris baru di bawah) hanya baris baru yang
+        diparse lalu digabung dengan baris mentah dari checkpoint
+        """
+        self.cancel_token = cancel_token or CancellationToken()
+        self.cancel_token.check()
         
         # Reset data
         self.reset_data()
         
-        # Tentukan sheet BKU
-        try:
-            if 'BKU' in workbook.sheetnames:
-                bku_sheet = workbook['BKU']
-            elif len(workbook.worksheets) > 1:
-                bku_sheet = workbook.worksheets[1]  # Sheet kedua
-            else:
-                bku_sheet = None  # Tidak ada sheet BKU
-                
-        except Exception as e:
-            print(f"Error accessing BKU sheet: {e}")
-            bku_sheet = None
-        
         # Proses BKU jika ada
         if bku_sheet:
-            self.process_bku_data(bku_sheet)
+            start_row = self._resume_row(bku_sheet, checkpoint)
+            if start_row > 1:
+                print(f"Debug: BKU append-only, parse ulang mulai baris {start_row}")
+                self._previous_checkpoint = checkpoint
+            self._tail_start = _tail_start_row(self._extent(bku_sheet).last_row(BKU_COLUMNS))
+            self.process_bku_data(bku_sheet, start_row)
+            self.checkpoint = self._build_checkpoint(bku_sheet, self._previous_checkpoint)
+            # Checkpoint lama tidak perlu ikut tertahan di processor ini
+            self._previous_checkpoint = None
         else:
             print("Debug: BKU sheet not found")
+        
+        # Yang dipakai GUI/export hanya hasil ekstraksi, lepaskan nilai sheet
+        self.sheet_extent = None
+
+    def _extent(self, sheet):
+        """SheetExtent sheet ini, index baris berisi data dibuat sekali per sheet"""
+        if self.sheet_extent is None or self.sheet_extent.sheet is not sheet:
+            self.sheet_extent = SheetExtent(sheet)
+        return self.sheet_extent
 
-    def process_bku_data(self, sheet):
+    def process_bku_data(self, sheet, start_row=1):
         """Proses data BKU dari sheet yang ditentukan - IMPLEMENTASI LENGKAP"""
         print("Debug: Processing BKU data")
         
@@ -88,19 +165,19 @@ class BKUDataProcessor:
             self.bku_data_available = False
             return
         
-        print(f"Debug: BKU sheet found with {sheet.max_row} rows and {sheet.max_column} columns")
+        print(f"Debug: BKU sheet found with {self._extent(sheet).last_row(BKU_COLUMNS)} data rows")
         
         # Ekstrak data BKU untuk semua triwulan
-        self.extract_bku_belanja_persediaan_data(sheet)
-        self.extract_bku_belanja_pemeliharaan_data(sheet)
-        self.extract_bku_belanja_perjalanan_data(sheet)
-        self.extract_bku_peralatan_data(sheet)
-        self.extract_bku_aset_tetap_data(sheet)
-        self.extract_bku_belanja_jasa_data(sheet)
+        self.extract_bku_belanja_persediaan_data(sheet, start_row)
+        self.extract_bku_belanja_pemeliharaan_data(sheet, start_row)
+        self.extract_bku_belanja_perjalanan_data(sheet, start_row)
+        self.extract_bku_peralatan_data(sheet, start_row)
+        self.extract_bku_aset_tetap_data(sheet, start_row)
+        self.extract_bku_belanja_jasa_data(sheet, start_row)
         
         self.bku_data_available = True
 
-    def extract_bku_belanja_persediaan_data(self, sheet):
+    def extract_bku_belanja_persediaan_data(self, sheet, start_row=1):
         """Ekstrak data realisasi belanja persediaan dari BKU untuk semua triwulan"""
         target_code = '5.1.02.01'
         
@@ -114,63 +191,11 @@ class BKUDataProcessor:
         
         print(f"Debug: Mencari realisasi BKU untuk kode rekening: {target_code}")
         
-        # Collect all raw data first
-        raw_items = []
-        
-        # Iterasi semua baris untuk mencari kode rekening
-        for row_idx in range(1, sheet.max_row + 1):
-            # Ekstrak kode rekening dari kolom F-G (merged)
-            kode_rekening = self.excel_utils.extract_merged_text_strict(sheet, row_idx, range(6, 8))
-            
-            if not kode_rekening or target_code not in kode_rekening:
-                continue
-            
-            # Ekstrak tanggal dari kolom A-C (merged)
-            tanggal_str = self.excel_utils.extract_merged_text(sheet, row_idx, range(1, 4))
-            if not tanggal_str:
-                continue
-            
-            # Parse tanggal
-            try:
-                tanggal = self._parse_date_string(tanggal_str)
-                if not tanggal:
-                    continue
-            except:
-                continue
-            
-            # Ekstrak kode kegiatan dari kolom D-E (merged)
-            kode_kegiatan = self.excel_utils.extract_merged_text(sheet, row_idx, range(4, 6))
-            if not kode_kegiatan or not self.excel_utils.is_valid_kegiatan_format(kode_kegiatan):
-                continue
-            
-            # Ekstrak uraian dari kolom K-M (merged)
-            uraian = self.excel_utils.extract_merged_text(sheet, row_idx, range(11, 14))
-            if not uraian:
-                continue
-            
-            # Skip baris dengan kata "Terima" atau "Setor"
-            if "terima" in uraian.lower() or "setor" in uraian.lower():
-                print(f"Debug: Skipping row with Terima/Setor: {uraian}")
-                continue
-            
-            # Ekstrak jumlah pengeluaran dari kolom Q-S (merged)
-            jumlah = self.excel_utils.extract_merged_number(sheet, row_idx, range(17, 20))
-            if jumlah <= 0:
-                continue
-            
-            raw_items.append({
-                'tanggal': tanggal,
-                'kode_rekening': kode_rekening,
-                'kode_kegiatan': kode_kegiatan,
-                'uraian': uraian,
-                'jumlah': jumlah,
-                'row': row_idx
-            })
-            
-            print(f"Debug: Found BKU item - {tanggal} | {kode_rekening} | {kode_kegiatan} | {uraian} - Rp {jumlah:,}")
+        # Group per kode rekening (group baris sebelum start_row diambil dari checkpoint)
+        code_groups = [self._collect_bku_groups(sheet, target_code, start_row, "persediaan")]
         
         # Group and sum items by date, kode_kegiatan, kode_rekening, and uraian
-        grouped_items = self._group_and_sum_bku_items(raw_items)
+        grouped_items = self._group_and_sum_bku_items(code_groups)
         
         # Distribute items to appropriate triwulan
         for item in grouped_items:
@@ -180,25 +205,56 @@ class BKUDataProcessor:
                 if self._is_triwulan_complete(item['tanggal'], sheet):
                     self.bku_belanja_persediaan_data[triwulan].append(item)
 
-    def extract_bku_belanja_pemeliharaan_data(self, sheet):
-        """Ekstrak data realisasi belanja pemeliharaan dari BKU untuk semua triwulan"""
-        target_code = '5.1.02.03'
-        
-        # Initialize storage untuk semua triwulan
-        self.bku_belanja_pemeliharaan_data = {
-            'Triwulan 1': [],
-            'Triwulan 2': [],
-            'Triwulan 3': [],
-            'Triwulan 4': []
-        }
-        
-        print(f"Debug: Mencari realisasi BKU untuk kode rekening: {target_code}")
-        
-        # Collect all raw data first
-        raw_items = []
-        
-        # Iterasi semua baris untuk mencari kode rekening
-        for row_idx in range(1, sheet.max_row + 1):
+    def _resume_row(self, sheet, checkpoint):
+        """
+        Baris awal parse untuk sheet ini: 1 (parse penuh) tanpa checkpoint atau
+        jika baris yang sudah diingest berubah, selain itu baris setelah bagian
+        checkpoint yang tidak terpengaruh baris baru
+        """
+        if checkpoint is None or checkpoint.sheet_title != sheet.title or checkpoint.row_count == 0:
+            return 1
+        if self._extent(sheet).last_row(BKU_COLUMNS) < checkpoint.row_count:
+            return 1
+        self.cancel_token.check()
+        if _row_block_hashes(sheet, 1, checkpoint.row_count) != list(checkpoint.block_hashes):
+            print("Debug: BKU baris lama berubah, parse penuh")
+            return 1
+        return _tail_start_row(checkpoint.row_count)
+
+    def _build_checkpoint(self, sheet, previous=None):
+        """Checkpoint sheet yang baru diingest; blok penuh dari checkpoint sebelumnya dipakai ulang"""
+        row_count = self._extent(sheet).last_row(BKU_COLUMNS)
+        block_hashes = []
+        first_row = 1
+        if previous is not None:
+            full_blocks = previous.row_count // CHECKPOINT_BLOCK_ROWS
+            block_hashes = list(previous.block_hashes[:full_blocks])
+            first_row = full_blocks * CHECKPOINT_BLOCK_ROWS + 1
+        seed = block_hashes[-1] if block_hashes else b''
+        block_hashes.extend(_row_block_hashes(sheet, first_row, row_count, seed))
+        checkpoint = BKUCheckpoint(sheet.title, row_count, tuple(block_hashes), self._groups, self._tail_items)
+        self._groups = {}
+        self._tail_items = {}
+        return checkpoint
+
+    def _collect_bku_groups(self, sheet, target_code, start_row=1, kind=""):
+        """
+        Group baris BKU untuk satu kode rekening, dalam urutan kemunculan
+        pertama: key (tanggal, kode_rekening, kode_kegiatan, uraian) -> jumlah
+        (key berbagi string dengan item hasil, jadi murah disimpan di checkpoint).
+        Group baris sebelum start_row sudah ada di checkpoint sebelumnya, hanya
+        baris mulai start_row yang dibaca dari sheet. Yang disimpan untuk
+        checkpoint berikutnya hanya group baris sebelum jendela lookaround dan
+        baris mentah di jendela itu
+        """
+        previous = self._previous_checkpoint
+        groups = dict(previous.groups.get(target_code, {})) if start_row > 1 and previous else {}
+        tail_items = []
+        
+        # Iterasi baris yang berisi kode rekening saja (baris kosong dilewati sekaligus)
+        rows = self._extent(sheet).data_rows(BKU_KODE_REKENING_COLUMNS, start_row)
+        for count, row_idx in enumerate(rows, 1):
+            self.cancel_token.checkpoint(count)
             # Ekstrak kode rekening dari kolom F-G (merged)
             kode_rekening = self.excel_utils.extract_merged_text_strict(sheet, row_idx, range(6, 8))
             
@@ -238,53 +294,48 @@ class BKUDataProcessor:
             if jumlah <= 0:
                 continue
             
-            raw_items.append({
-                'tanggal': tanggal,
-                'kode_rekening': kode_rekening,
-                'kode_kegiatan': kode_kegiatan,
-                'uraian': uraian,
-                'jumlah': jumlah,
-                'row': row_idx
-            })
-            
-            print(f"Debug: Found BKU pemeliharaan item - {tanggal} | {kode_rekening} | {kode_kegiatan} | {uraian} - Rp {jumlah:,}")
-        
-    def _group_and_sum_bku_items(self, raw_items):
-        """Group dan sum items BKU berdasarkan key yang sama"""
-        from collections import defaultdict
-        
-        grouped = defaultdict(lambda: {
-            'tanggal': None,
-            'kode_rekening': '',
-            'kode_kegiatan': '',
-            'uraian': '',
-            'jumlah': 0,
-            'count': 0
-        })
-        
-        # Group berdasarkan kombinasi tanggal, kode_kegiatan, kode_rekening, dan uraian
-        for item in raw_items:
-            key = f"{item['tanggal']}_{item['kode_kegiatan']}_{item['kode_rekening']}_{item['uraian']}"
-            
-            if grouped[key]['tanggal'] is None:
-                grouped[key]['tanggal'] = item['tanggal']
-                grouped[key]['kode_rekening'] = item['kode_rekening']
-                grouped[key]['kode_kegiatan'] = item['kode_kegiatan']
-                grouped[key]['uraian'] = item['uraian']
+            key = (tanggal, kode_rekening, kode_kegiatan, uraian)
+            if row_idx < self._tail_start:
+                groups[key] = groups.get(key, 0) + jumlah
+            else:
+                tail_items.append((key, jumlah))
             
-            grouped[key]['jumlah'] += item['jumlah']
-            grouped[key]['count'] += 1
+            print(f"Debug: Found BKU {kind} item - {tanggal} | {kode_rekening} | {kode_kegiatan} | {uraian} - Rp {jumlah:,}")
+        
+        self._groups[target_code] = groups
+        self._tail_items[target_code] = tuple(tail_items)
+        
+        # Group lengkap = group checkpoint + baris di jendela lookaround
+        if tail_items:
+            groups = dict(groups)
+            for key, jumlah in tail_items:
+                groups[key] = groups.get(key, 0) + jumlah
+        return groups
+
+    def _group_and_sum_bku_items(self, code_groups):
+        """
+        Gabungkan group beberapa kode rekening (urutan kode, lalu kemunculan
+        pertama) menjadi list item BKU; sama dengan group dan sum semua baris
+        mentah berdasarkan key yang sama
+        """
+        if len(code_groups) == 1:
+            grouped = code_groups[0]
+        else:
+            grouped = {}
+            for groups in code_groups:
+                for key, jumlah in groups.items():
+                    grouped[key] = grouped.get(key, 0) + jumlah
         
         # Convert ke list
         result = []
-        for key, data in grouped.items():
-            if data['jumlah'] > 0:
+        for (tanggal, kode_rekening, kode_kegiatan, uraian), jumlah in grouped.items():
+            if jumlah > 0:
                 result.append({
-                    'tanggal': data['tanggal'],
-                    'kode_rekening': data['kode_rekening'],
-                    'kode_kegiatan': data['kode_kegiatan'],
-                    'uraian': data['uraian'],
-                    'jumlah': data['jumlah']
+                    'tanggal': tanggal,
+                    'kode_rekening': kode_rekening,
+                    'kode_kegiatan': kode_kegiatan,
+                    'uraian': uraian,
+                    'jumlah': jumlah
                 })
         
         return result
@@ -505,7 +556,7 @@ class BKUDataProcessor:
     Tambahkan ke dalam class BKUDataProcessor
     """
 
-    def extract_bku_belanja_perjalanan_data(self, sheet):
+    def extract_bku_belanja_perjalanan_data(self, sheet, start_row=1):
         """Ekstrak data realisasi belanja perjalanan dari BKU untuk semua triwulan"""
         target_code = '5.1.02.04'
         
@@ -519,63 +570,11 @@ class BKUDataProcessor:
         
         print(f"Debug: Mencari realisasi BKU untuk kode rekening: {target_code}")
         
-        # Collect all raw data first
-        raw_items = []
-        
-        # Iterasi semua baris untuk mencari kode rekening
-        for row_idx in range(1, sheet.max_row + 1):
-            # Ekstrak kode rekening dari kolom F-G (merged)
-            kode_rekening = self.excel_utils.extract_merged_text_strict(sheet, row_idx, range(6, 8))
-            
-            if not kode_rekening or target_code not in kode_rekening:
-                continue
-            
-            # Ekstrak tanggal dari kolom A-C (merged)
-            tanggal_str = self.excel_utils.extract_merged_text(sheet, row_idx, range(1, 4))
-            if not tanggal_str:
-                continue
-            
-            # Parse tanggal
-            try:
-                tanggal = self._parse_date_string(tanggal_str)
-                if not tanggal:
-                    continue
-            except:
-                continue
-            
-            # Ekstrak kode kegiatan dari kolom D-E (merged)
-            kode_kegiatan = self.excel_utils.extract_merged_text(sheet, row_idx, range(4, 6))
-            if not kode_kegiatan or not self.excel_utils.is_valid_kegiatan_format(kode_kegiatan):
-                continue
-            
-            # Ekstrak uraian dari kolom K-M (merged)
-            uraian = self.excel_utils.extract_merged_text(sheet, row_idx, range(11, 14))
-            if not uraian:
-                continue
-            
-            # Skip baris dengan kata "Terima" atau "Setor"
-            if "terima" in uraian.lower() or "setor" in uraian.lower():
-                print(f"Debug: Skipping row with Terima/Setor: {uraian}")
-                continue
-            
-            # Ekstrak jumlah pengeluaran dari kolom Q-S (merged)
-            jumlah = self.excel_utils.extract_merged_number(sheet, row_idx, range(17, 20))
-            if jumlah <= 0:
-                continue
-            
-            raw_items.append({
-                'tanggal': tanggal,
-                'kode_rekening': kode_rekening,
-                'kode_kegiatan': kode_kegiatan,
-                'uraian': uraian,
-                'jumlah': jumlah,
-                'row': row_idx
-            })
-            
-            print(f"Debug: Found BKU perjalanan item - {tanggal} | {kode_rekening} | {kode_kegiatan} | {uraian} - Rp {jumlah:,}")
+        # Group per kode rekening (group baris sebelum start_row diambil dari checkpoint)
+        code_groups = [self._collect_bku_groups(sheet, target_code, start_row, "perjalanan")]
         
         # Group and sum items by date, kode_kegiatan, kode_rekening, and uraian
-        grouped_items = self._group_and_sum_bku_items(raw_items)
+        grouped_items = self._group_and_sum_bku_items(code_groups)
         
         # Distribute items to appropriate triwulan
         for item in grouped_items:
@@ -585,7 +584,7 @@ class BKUDataProcessor:
                 if self._is_triwulan_complete(item['tanggal'], sheet):
                     self.bku_belanja_perjalanan_data[triwulan].append(item)
 
-    def extract_bku_peralatan_data(self, sheet):
+    def extract_bku_peralatan_data(self, sheet, start_row=1):
         """Ekstrak data realisasi peralatan dari BKU untuk semua triwulan"""
         # UBAH INI: dari target_code = '5.2.02' menjadi target_codes
         target_codes = ['5.2.02', '5.2.04']
@@ -600,65 +599,12 @@ class BKUDataProcessor:
         
         print(f"Debug: Mencari realisasi BKU untuk kode rekening: {target_codes}")
         
-        # Collect all raw data first
-        raw_items = []
-        
-        # UBAH INI: Loop untuk setiap target code
-        for target_code in target_codes:
-            # Iterasi semua baris untuk mencari kode rekening
-            for row_idx in range(1, sheet.max_row + 1):
-                # Ekstrak kode rekening dari kolom F-G (merged)
-                kode_rekening = self.excel_utils.extract_merged_text_strict(sheet, row_idx, range(6, 8))
-                
-                if not kode_rekening or target_code not in kode_rekening:
-                    continue
-                
-                # Ekstrak tanggal dari kolom A-C (merged)
-                tanggal_str = self.excel_utils.extract_merged_text(sheet, row_idx, range(1, 4))
-                if not tanggal_str:
-                    continue
-                
-                # Parse tanggal
-                try:
-                    tanggal = self._parse_date_string(tanggal_str)
-                    if not tanggal:
-                        continue
-                except:
-                    continue
-                
-                # Ekstrak kode kegiatan dari kolom D-E (merged)
-                kode_kegiatan = self.excel_utils.extract_merged_text(sheet, row_idx, range(4, 6))
-                if not kode_kegiatan or not self.excel_utils.is_valid_kegiatan_format(kode_kegiatan):
-                    continue
-                
-                # Ekstrak uraian dari kolom K-M (merged)
-                uraian = self.excel_utils.extract_merged_text(sheet, row_idx, range(11, 14))
-                if not uraian:
-                    continue
-                
-                # Skip baris dengan kata "Terima" atau "Setor"
-                if "terima" in uraian.lower() or "setor" in uraian.lower():
-                    print(f"Debug: Skipping row with Terima/Setor: {uraian}")
-                    continue
-                
-                # Ekstrak jumlah pengeluaran dari kolom Q-S (merged)
-                jumlah = self.excel_utils.extract_merged_number(sheet, row_idx, range(17, 20))
-                if jumlah <= 0:
-                    continue
-                
-                raw_items.append({
-                    'tanggal': tanggal,
-                    'kode_rekening': kode_rekening,
-                    'kode_kegiatan': kode_kegiatan,
-                    'uraian': uraian,
-                    'jumlah': jumlah,
-                    'row': row_idx
-                })
-                
-                print(f"Debug: Found BKU peralatan item - {tanggal} | {kode_rekening} | {kode_kegiatan} | {uraian} - Rp {jumlah:,}")
+        # Group per kode rekening (group baris sebelum start_row diambil dari checkpoint)
+        code_groups = [self._collect_bku_groups(sheet, target_code, start_row, "peralatan")
+                       for target_code in target_codes]
         
         # Group and sum items by date, kode_kegiatan, kode_rekening, and uraian
-        grouped_items = self._group_and_sum_bku_items(raw_items)
+        grouped_items = self._group_and_sum_bku_items(code_groups)
         
         # Distribute items to appropriate triwulan
         for item in grouped_items:
@@ -668,7 +614,7 @@ class BKUDataProcessor:
                 if self._is_triwulan_complete(item['tanggal'], sheet):
                     self.bku_peralatan_data[triwulan].append(item)
 
-    def extract_bku_aset_tetap_data(self, sheet):
+    def extract_bku_aset_tetap_data(self, sheet, start_row=1):
         """Ekstrak data realisasi aset tetap lainnya dari BKU untuk semua triwulan"""
         # UBAH INI: dari target_codes = ['5.2.04', '5.2.05'] menjadi hanya ['5.2.05']
         target_codes = ['5.2.05']
@@ -683,64 +629,12 @@ class BKUDataProcessor:
         
         print(f"Debug: Mencari realisasi BKU untuk kode rekening: {target_codes}")
         
-        # Collect all raw data first
-        raw_items = []
-        
-        for target_code in target_codes:
-            # Iterasi semua baris untuk mencari kode rekening
-            for row_idx in range(1, sheet.max_row + 1):
-                # Ekstrak kode rekening dari kolom F-G (merged)
-                kode_rekening = self.excel_utils.extract_merged_text_strict(sheet, row_idx, range(6, 8))
-                
-                if not kode_rekening or target_code not in kode_rekening:
-                    continue
-                
-                # Ekstrak tanggal dari kolom A-C (merged)
-                tanggal_str = self.excel_utils.extract_merged_text(sheet, row_idx, range(1, 4))
-                if not tanggal_str:
-                    continue
-                
-                # Parse tanggal
-                try:
-                    tanggal = self._parse_date_string(tanggal_str)
-                    if not tanggal:
-                        continue
-                except:
-                    continue
-                
-                # Ekstrak kode kegiatan dari kolom D-E (merged)
-                kode_kegiatan = self.excel_utils.extract_merged_text(sheet, row_idx, range(4, 6))
-                if not kode_kegiatan or not self.excel_utils.is_valid_kegiatan_format(kode_kegiatan):
-                    continue
-                
-                # Ekstrak uraian dari kolom K-M (merged)
-                uraian = self.excel_utils.extract_merged_text(sheet, row_idx, range(11, 14))
-                if not uraian:
-                    continue
-                
-                # Skip baris dengan kata "Terima" atau "Setor"
-                if "terima" in uraian.lower() or "setor" in uraian.lower():
-                    print(f"Debug: Skipping row with Terima/Setor: {uraian}")
-                    continue
-                
-                # Ekstrak jumlah pengeluaran dari kolom Q-S (merged)
-                jumlah = self.excel_utils.extract_merged_number(sheet, row_idx, range(17, 20))
-                if jumlah <= 0:
-                    continue
-                
-                raw_items.append({
-                    'tanggal': tanggal,
-                    'kode_rekening': kode_rekening,
-                    'kode_kegiatan': kode_kegiatan,
-                    'uraian': uraian,
-                    'jumlah': jumlah,
-                    'row': row_idx
-                })
-                
-                print(f"Debug: Found BKU aset tetap item - {tanggal} | {kode_rekening} | {kode_kegiatan} | {uraian} - Rp {jumlah:,}")
+        # Group per kode rekening (group baris sebelum start_row diambil dari checkpoint)
+        code_groups = [self._collect_bku_groups(sheet, target_code, start_row, "aset tetap")
+                       for target_code in target_codes]
         
         # Group and sum items by date, kode_kegiatan, kode_rekening, and uraian
-        grouped_items = self._group_and_sum_bku_items(raw_items)
+        grouped_items = self._group_and_sum_bku_items(code_groups)
         
         # Distribute items to appropriate triwulan
         for item in grouped_items:
@@ -750,7 +644,7 @@ class BKUDataProcessor:
                 if self._is_triwulan_complete(item['tanggal'], sheet):
                     self.bku_aset_tetap_data[triwulan].append(item)
 
-    def extract_bku_belanja_jasa_data(self, sheet):
+    def extract_bku_belanja_jasa_data(self, sheet, start_row=1):
         """Ekstrak data realisasi belanja jasa dari BKU untuk semua triwulan"""
         target_code = '5.1.02.02'
         
@@ -764,63 +658,11 @@ class BKUDataProcessor:
         
         print(f"Debug: Mencari realisasi BKU untuk kode rekening: {target_code}")
         
-        # Collect all raw data first
-        raw_items = []
-        
-        # Iterasi semua baris untuk mencari kode rekening
-        for row_idx in range(1, sheet.max_row + 1):
-            # Ekstrak kode rekening dari kolom F-G (merged)
-            kode_rekening = self.excel_utils.extract_merged_text_strict(sheet, row_idx, range(6, 8))
-            
-            if not kode_rekening or target_code not in kode_rekening:
-                continue
-            
-            # Ekstrak tanggal dari kolom A-C (merged)
-            tanggal_str = self.excel_utils.extract_merged_text(sheet, row_idx, range(1, 4))
-            if not tanggal_str:
-                continue
-            
-            # Parse tanggal
-            try:
-                tanggal = self._parse_date_string(tanggal_str)
-                if not tanggal:
-                    continue
-            except:
-                continue
-            
-            # Ekstrak kode kegiatan dari kolom D-E (merged)
-            kode_kegiatan = self.excel_utils.extract_merged_text(sheet, row_idx, range(4, 6))
-            if not kode_kegiatan or not self.excel_utils.is_valid_kegiatan_format(kode_kegiatan):
-                continue
-            
-            # Ekstrak uraian dari kolom K-M (merged)
-            uraian = self.excel_utils.extract_merged_text(sheet, row_idx, range(11, 14))
-            if not uraian:
-                continue
-            
-            # Skip baris dengan kata "Terima" atau "Setor"
-            if "terima" in uraian.lower() or "setor" in uraian.lower():
-                print(f"Debug: Skipping row with Terima/Setor: {uraian}")
-                continue
-            
-            # Ekstrak jumlah pengeluaran dari kolom Q-S (merged)
-            jumlah = self.excel_utils.extract_merged_number(sheet, row_idx, range(17, 20))
-            if jumlah <= 0:
-                continue
-            
-            raw_items.append({
-                'tanggal': tanggal,
-                'kode_rekening': kode_rekening,
-                'kode_kegiatan': kode_kegiatan,
-                'uraian': uraian,
-                'jumlah': jumlah,
-                'row': row_idx
-            })
-            
-            print(f"Debug: Found BKU jasa item - {tanggal} | {kode_rekening} | {kode_kegiatan} | {uraian} - Rp {jumlah:,}")
+        # Group per kode rekening (group baris sebelum start_row diambil dari checkpoint)
+        code_groups = [self._collect_bku_groups(sheet, target_code, start_row, "jasa")]
         
         # Group and sum items by date, kode_kegiatan, kode_rekening, and uraian
-        grouped_items = self._group_and_sum_bku_items(raw_items)
+        grouped_items = self._group_and_sum_bku_items(code_groups)
         
         # Distribute items to appropriate triwulan
         for item in grouped_items:
@@ -830,7 +672,7 @@ class BKUDataProcessor:
                 if self._is_triwulan_complete(item['tanggal'], sheet):
                     self.bku_belanja_jasa_data[triwulan].append(item)
 
-    def extract_bku_belanja_pemeliharaan_data(self, sheet):
+    def extract_bku_belanja_pemeliharaan_data(self, sheet, start_row=1):
         """Ekstrak data realisasi belanja pemeliharaan dari BKU untuk semua triwulan - FIXED"""
         target_code = '5.1.02.03'
         
@@ -844,63 +686,11 @@ class BKUDataProcessor:
         
         print(f"Debug: Mencari realisasi BKU untuk kode rekening: {target_code}")
         
-        # Collect all raw data first
-        raw_items = []
-        
-        # Iterasi semua baris untuk mencari kode rekening
-        for row_idx in range(1, sheet.max_row + 1):
-            # Ekstrak kode rekening dari kolom F-G (merged)
-            kode_rekening = self.excel_utils.extract_merged_text_strict(sheet, row_idx, range(6, 8))
-            
-            if not kode_rekening or target_code not in kode_rekening:
-                continue
-            
-            # Ekstrak tanggal dari kolom A-C (merged)
-            tanggal_str = self.excel_utils.extract_merged_text(sheet, row_idx, range(1, 4))
-            if not tanggal_str:
-                continue
-            
-            # Parse tanggal
-            try:
-                tanggal = self._parse_date_string(tanggal_str)
-                if not tanggal:
-                    continue
-            except:
-                continue
-            
-            # Ekstrak kode kegiatan dari kolom D-E (merged)
-            kode_kegiatan = self.excel_utils.extract_merged_text(sheet, row_idx, range(4, 6))
-            if not kode_kegiatan or not self.excel_utils.is_valid_kegiatan_format(kode_kegiatan):
-                continue
-            
-            # Ekstrak uraian dari kolom K-M (merged)
-            uraian = self.excel_utils.extract_merged_text(sheet, row_idx, range(11, 14))
-            if not uraian:
-                continue
-            
-            # Skip baris dengan kata "Terima" atau "Setor"
-            if "terima" in uraian.lower() or "setor" in uraian.lower():
-                print(f"Debug: Skipping row with Terima/Setor: {uraian}")
-                continue
-            
-            # Ekstrak jumlah pengeluaran dari kolom Q-S (merged)
-            jumlah = self.excel_utils.extract_merged_number(sheet, row_idx, range(17, 20))
-            if jumlah <= 0:
-                continue
-            
-            raw_items.append({
-                'tanggal': tanggal,
-                'kode_rekening': kode_rekening,
-                'kode_kegiatan': kode_kegiatan,
-                'uraian': uraian,
-                'jumlah': jumlah,
-                'row': row_idx
-            })
-            
-            print(f"Debug: Found BKU pemeliharaan item - {tanggal} | {kode_rekening} | {kode_kegiatan} | {uraian} - Rp {jumlah:,}")
+        # Group per kode rekening (group baris sebelum start_row diambil dari checkpoint)
+        code_groups = [self._collect_bku_groups(sheet, target_code, start_row, "pemeliharaan")]
         
         # TAMBAHKAN INI: Group and sum items by date, kode_kegiatan, kode_rekening, and uraian
-        grouped_items = self._group_and_sum_bku_items(raw_items)
+        grouped_items = self._group_and_sum_bku_items(code_groups)
         
         # TAMBAHKAN INI: Distribute items to appropriate triwulan
         for item in grouped_items:
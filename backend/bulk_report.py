@@ -0,0 +1,204 @@
+"""
+Bulk PDF report generation for SIKELAR application
+Renders the ringkasan anggaran PDF for many schools across a process pool.
+Each worker sets up the report layout once, extracts one workbook at a time
+and writes that school's PDF as soon as it is done; only the compact report
+data comes back to the parent, for the optional combined PDF. Schools that
+are already loaded are not extracted again: their report data is collected
+in the parent and sent to the workers, so the PDF matches what is on screen
+
+Usage:
+    python -m backend.bulk_report FILE_OR_FOLDER [...] -o OUTPUT_DIR [--combined FILE] [--workers N] [--details]
+"""
+
+import os
+import re
+import argparse
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from reportlab.platypus import PageBreak
+
+from .processor import BOSDataProcessor
+from .cancellation import OperationCancelled
+from .pdf_report import (collect_report_data, detail_items, detail_sections, build_story,
+                         build_appendix_story, write_pdf, get_report_layout)
+
+
+# Hasil satu sekolah; error berisi pesan jika gagal (pdf_path dan data None)
+BulkResult = namedtuple('BulkResult', ['source', 'school', 'pdf_path', 'data', 'error'])
+
+
+def _init_worker():
+    """Process pool initializer: build styles and fonts once per worker"""
+    get_report_layout()
+
+
+def _safe_filename(text):
+    """Make a school name usable as a file name"""
+    text = re.sub(r'[^\w\- ]+', '', text).strip()
+    return re.sub(r'\s+', '_', text) or 'sekolah'
+
+
+def source_path(item):
+    """Workbook path of a bulk input: a path, or anything with a file_path (snapshot, session entry)"""
+    if isinstance(item, (str, os.PathLike)):
+        return os.fspath(item)
+    return item.file_path
+
+
+def resident_processor(item):
+    """Loaded processor of a snapshot / resident session entry, None for paths and evicted entries"""
+    if isinstance(item, (str, os.PathLike)):
+        return None
+    # SessionEntry -> snapshot-nya (None jika sudah dikeluarkan dari memori)
+    snapshot = getattr(item, 'snapshot', item)
+    return getattr(snapshot, 'processor', None)
+
+
+def expand_inputs(inputs):
+    """Expand folders to the .xlsx files inside them, keep other inputs as given"""
+    items = []
+    for item in inputs:
+        path = source_path(item)
+        if resident_processor(item) is None and os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                # Lewati file lock Excel (~$...)
+                if name.lower().endswith('.xlsx') and not name.startswith('~$'):
+                    items.append(os.path.join(path, name))
+        else:
+            items.append(item)
+    return items
+
+
+def collect_workbooks(inputs):
+    """Expand folders to the .xlsx files inside them, keep file paths as given"""
+    return [source_path(item) for item in expand_inputs(inputs)]
+
+
+def render_school(file_path, output_dir, keep_data=False, include_details=False,
+                  data=None, details=None):
+    """
+    Write one school's PDF into output_dir (runs in a worker). The workbook
+    is extracted unless its ReportData (and raw detail items, when
+    include_details) were already collected in the parent; detail rows are
+    always formatted here, lazily while the PDF is written.
+    Returns a BulkResult; `data` is only filled when keep_data is set.
+    """
+    try:
+        if data is None:
+            processor = BOSDataProcessor()
+            processor.extract_excel_data(file_path)
+            data = collect_report_data(processor)
+            if include_details and processor.bku_data_available:
+                details = detail_items(processor)
+
+        base_name = os.path.splitext(os.path.basename(file_path))[0]
+        pdf_name = f"Ringkasan_{_safe_filename(data.school)}_{_safe_filename(base_name)}.pdf"
+        pdf_path = os.path.join(output_dir, pdf_name)
+        story = build_story(data)
+        if include_details and details is not None:
+            story.extend(build_appendix_story(detail_sections(details)))
+        write_pdf(pdf_path, story)
+
+        return BulkResult(file_path, data.school, pdf_path, data if keep_data else None, None)
+    except Exception as e:
+        return BulkResult(file_path, None, None, None, str(e))
+
+
+def generate_bulk_reports(inputs, output_dir, combined_path=None, max_workers=None,
+                          progress=None, cancel_token=None, include_details=False):
+    """
+    Render one PDF per school into output_dir using a process pool.
+
+    `inputs` are workbook paths, folders of workbooks or loaded snapshots /
+    session entries. Loaded schools are rendered from their processor as it
+    is (collected here, in the caller's process); paths and evicted session
+    entries are extracted in the workers. When combined_path is given
+    all schools are also written into one PDF, in input order. With
+    include_details every per-school PDF gets the BKU transaction appendix
+    (the combined PDF stays totals only).
+    `progress(done, total, result)` is called as each school finishes.
+    Raises OperationCancelled when cancel_token is cancelled; PDFs already
+    written are kept. Returns the list of BulkResult in input order.
+    """
+    items = expand_inputs(inputs)
+    os.makedirs(output_dir, exist_ok=True)
+    keep_data = combined_path is not None
+
+    results = [None] * len(items)
+    # spawn, bukan fork: pemanggil bisa berupa proses GUI dengan Tk dan thread job runner
+    executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_worker)
+    try:
+        futures = {}
+        for index, item in enumerate(items):
+            if cancel_token is not None:
+                cancel_token.check()
+            data = details = None
+            processor = resident_processor(item)
+            if processor is not None:
+                # ReportData kecil dan bisa di-pickle; processor tidak perlu dikirim.
+                # Rincian dikirim sebagai item mentah (referensi list milik snapshot),
+                # format baris dan simpleSplit dikerjakan di worker
+                data = collect_report_data(processor)
+                if include_details and processor.bku_data_available:
+                    details = detail_items(processor)
+            future = executor.submit(render_school, source_path(item), output_dir, keep_data,
+                                     include_details, data, details)
+            futures[future] = index
+        for done, future in enumerate(as_completed(futures), 1):
+            if cancel_token is not None and cancel_token.cancelled:
+                raise OperationCancelled()
+            result = future.result()
+            results[futures[future]] = result
+            if progress:
+                progress(done, len(items), result)
+    except OperationCancelled:
+        executor.shutdown(wait=True, cancel_futures=True)
+        raise
+    else:
+        executor.shutdown(wait=True)
+
+    if combined_path:
+        write_combined_pdf(combined_path, [result.data for result in results if result.data])
+
+    return results
+
+
+def write_combined_pdf(file_path, report_data):
+    """Write several schools' ReportData into one PDF, one school per section"""
+    layout = get_report_layout()
+    story = []
+    for data in report_data:
+        if story:
+            story.append(PageBreak())
+        story.extend(build_story(data, layout))
+    return write_pdf(file_path, story)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Buat PDF ringkasan untuk banyak sekolah sekaligus")
+    parser.add_argument('inputs', nargs='+', help="File Excel (.xlsx) atau folder berisi file Excel")
+    parser.add_argument('-o', '--output-dir', required=True, help="Folder tujuan PDF")
+    parser.add_argument('--combined', help="Tulis juga satu PDF gabungan ke file ini")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses (default: jumlah CPU)")
+    parser.add_argument('--details', action='store_true', help="Sertakan lampiran rincian transaksi BKU")
+    args = parser.parse_args(argv)
+
+    def report(done, total, result):
+        status = result.pdf_path if result.error is None else f"GAGAL - {result.error}"
+        print(f"[{done}/{total}] {os.path.basename(result.source)}: {status}")
+
+    results = generate_bulk_reports(args.inputs, args.output_dir, args.combined,
+                                    max_workers=args.workers, progress=report,
+                                    include_details=args.details)
+    failed = sum(1 for result in results if result.error)
+    print(f"Selesai: {len(results) - failed} berhasil, {failed} gagal")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,43 @@
+"""
+Cancellation support for SIKELAR application
+Cooperative cancellation token checked by long running extraction loops
+"""
+
+import threading
+
+
+# Jumlah baris di antara dua pengecekan pembatalan
+CHECK_INTERVAL = 200
+
+
+class OperationCancelled(Exception):
+    """Raised when a running operation notices its token was cancelled"""
+
+
+class CancellationToken:
+    """
+    Thread-safe cancellation flag.
+    The GUI calls `cancel()`, the worker calls `check()` or `checkpoint(row)`.
+    """
+
+    def __init__(self, interval=CHECK_INTERVAL):
+        self.interval = interval
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        """Request cancellation"""
+        self._event.set()
+
+    def check(self):
+        """Raise OperationCancelled if cancellation was requested"""
+        if self._event.is_set():
+            raise OperationCancelled()
+
+    def checkpoint(self, row_idx):
+        """Cheap check meant for row loops, only looks at the flag every `interval` rows"""
+        if row_idx % self.interval == 0 and self._event.is_set():
+            raise OperationCancelled()
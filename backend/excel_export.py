@@ -0,0 +1,180 @@
+"""
+Excel export for SIKELAR application
+Writes the reconciled RKAS vs BKU results of one or more schools to an xlsx
+file with openpyxl's write-only mode: rows are streamed straight from the
+extracted data into the sheets, no in-memory workbook is built
+"""
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+from .view_models import TRIWULAN_LIST, RKAS_CATEGORIES, BKU_CATEGORIES
+
+
+# Baris rekonsiliasi: (label, key ringkasan RKAS, key ringkasan BKU)
+RECONCILIATION_ROWS = (
+    ("BELANJA OPERASI", 'total_belanja_operasi', 'total_belanja_operasi_bku'),
+    ("  BELANJA HONOR", 'total_honor', 'total_honor_bku'),
+    ("  BELANJA JASA", 'jasa_sesungguhnya', 'jasa_sesungguhnya_bku'),
+    ("  BELANJA PEMELIHARAAN", 'total_pemeliharaan', 'total_pemeliharaan_bku'),
+    ("  BELANJA PERJALANAN", 'total_perjalanan', 'total_perjalanan_bku'),
+    ("  BELANJA PERSEDIAAN", 'belanja_persediaan_ringkasan', 'total_persediaan_bku'),
+    ("BELANJA MODAL", 'belanja_modal', 'belanja_modal_bku'),
+    ("  PERALATAN DAN MESIN", 'total_peralatan', 'total_peralatan_bku'),
+    ("  ASET TETAP LAINNYA", 'total_aset_tetap', 'total_aset_tetap_bku'),
+    ("TOTAL", 'total_anggaran', 'total_realisasi')
+)
+
+LAPORAN_ROWS = (
+    ("PAKAI HABIS", 'total_belanja_persediaan'),
+    ("BARANG DAN JASA", 'total_barang_dan_jasa'),
+    ("PERALATAN DAN MESIN", 'total_peralatan_mesin'),
+    ("ASET TETAP LAINNYA", 'total_aset_tetap'),
+    ("TOTAL REALISASI", 'grand_total')
+)
+
+# Nama sheet -> (header, lebar kolom)
+SHEETS = {
+    'Rekonsiliasi': (
+        ['Sekolah', 'Kategori', 'Anggaran RKAS'] + [f'Realisasi {tw}' for tw in TRIWULAN_LIST]
+        + ['Total Realisasi', 'Sisa Anggaran', 'Persentase Realisasi'],
+        [40, 28, 18, 18, 18, 18, 18, 18, 18, 12]
+    ),
+    'Laporan Keuangan': (
+        ['Sekolah', 'Kategori'] + [f's.d. {tw}' for tw in TRIWULAN_LIST],
+        [40, 24, 18, 18, 18, 18]
+    ),
+    'Rincian RKAS': (
+        ['Sekolah', 'Kategori', 'Kode Rekening', 'Kode Kegiatan', 'Uraian', 'Jumlah'],
+        [40, 20, 20, 16, 60, 16]
+    ),
+    'Rincian BKU': (
+        ['Sekolah', 'Kategori', 'Triwulan', 'Tanggal', 'Kode Rekening', 'Kode Kegiatan', 'Uraian', 'Jumlah'],
+        [40, 20, 12, 12, 20, 16, 60, 16]
+    )
+}
+
+CURRENCY_FORMAT = '#,##0'
+PERCENT_FORMAT = '0.00%'
+
+
+def _create_sheets(workbook):
+    """Create the write-only sheets with bold header, column widths and frozen header"""
+    bold = Font(bold=True)
+    sheets = {}
+    for title, (header, widths) in SHEETS.items():
+        sheet = workbook.create_sheet(title)
+        for index, width in enumerate(widths):
+            sheet.column_dimensions[openpyxl.utils.get_column_letter(index + 1)].width = width
+        sheet.freeze_panes = 'A2'
+
+        header_cells = []
+        for text in header:
+            cell = WriteOnlyCell(sheet, value=text)
+            cell.font = bold
+            header_cells.append(cell)
+        sheet.append(header_cells)
+        sheets[title] = sheet
+    return sheets
+
+
+def _formatted(sheet, value, number_format):
+    """Write-only cell with a number format"""
+    cell = WriteOnlyCell(sheet, value=value)
+    cell.number_format = number_format
+    return cell
+
+
+def _write_reconciliation(sheet, processor, school):
+    """RKAS anggaran vs BKU realisasi per triwulan for one school"""
+    rkas_summary = processor.get_summary_data()
+    if processor.bku_data_available:
+        bku_summaries = [processor.get_bku_summary_data_by_triwulan(tw) for tw in TRIWULAN_LIST]
+    else:
+        bku_summaries = [{} for _ in TRIWULAN_LIST]
+
+    pagu = processor.total_penerimaan
+    sheet.append([school, "PAGU", _formatted(sheet, pagu, CURRENCY_FORMAT)])
+
+    for label, rkas_key, bku_key in RECONCILIATION_ROWS:
+        anggaran = rkas_summary.get(rkas_key, 0)
+        realisasi = [(summary or {}).get(bku_key, 0) for summary in bku_summaries]
+        total_realisasi = sum(realisasi)
+        persentase = total_realisasi / anggaran if anggaran else 0
+        sheet.append(
+            [school, label, _formatted(sheet, anggaran, CURRENCY_FORMAT)]
+            + [_formatted(sheet, value, CURRENCY_FORMAT) for value in realisasi]
+            + [_formatted(sheet, total_realisasi, CURRENCY_FORMAT),
+               _formatted(sheet, anggaran - total_realisasi, CURRENCY_FORMAT),
+               _formatted(sheet, persentase, PERCENT_FORMAT)]
+        )
+
+
+def _write_laporan(sheet, processor, school):
+    """Cumulative laporan keuangan (TW1 sampai TWn) for one school"""
+    if not processor.bku_data_available:
+        return
+    laporan = [processor.get_laporan_keuangan_data_by_triwulan(tw) or {} for tw in TRIWULAN_LIST]
+    for label, key in LAPORAN_ROWS:
+        sheet.append([school, label] + [_formatted(sheet, data.get(key, 0), CURRENCY_FORMAT) for data in laporan])
+
+
+def _write_rkas_items(sheet, processor, school):
+    """Every RKAS item per category (nilai polos, tanpa style per sel supaya cepat)"""
+    for category, (attribute, _, _) in RKAS_CATEGORIES.items():
+        for item in getattr(processor, attribute):
+            sheet.append([school, category, item['kode_rekening'], item['kode_kegiatan'], item['uraian'],
+                          item['jumlah']])
+
+
+def _write_bku_items(sheet, processor, school):
+    """Every grouped BKU item per category and triwulan, returns the row count"""
+    if not processor.bku_data_available:
+        return 0
+    count = 0
+    for category, (getter, _) in BKU_CATEGORIES.items():
+        get_items = getattr(processor, getter)
+        for triwulan in TRIWULAN_LIST:
+            for item in get_items(triwulan) or ():
+                sheet.append([school, category, triwulan, item['tanggal'],
+                              item['kode_rekening'], item['kode_kegiatan'], item['uraian'],
+                              item['jumlah']])
+                count += 1
+    return count
+
+
+def export_reconciled_workbook(file_path, processors, total=None, progress=None, cancel_token=None):
+    """
+    Stream the reconciled data of `processors` (an iterable of loaded
+    BOSDataProcessor, may be a generator that loads schools one by one) to
+    an xlsx file. `total` is the number of processors when known, used for
+    `progress(percent, message)`. Raises OperationCancelled when cancel_token
+    is cancelled; the partial file is not written then.
+    Returns the number of schools exported.
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    sheets = _create_sheets(workbook)
+
+    exported = 0
+    for processor in processors:
+        if cancel_token is not None:
+            cancel_token.check()
+        school = processor.nama_sekolah
+        _write_reconciliation(sheets['Rekonsiliasi'], processor, school)
+        _write_laporan(sheets['Laporan Keuangan'], processor, school)
+        _write_rkas_items(sheets['Rincian RKAS'], processor, school)
+        _write_bku_items(sheets['Rincian BKU'], processor, school)
+        exported += 1
+        if progress:
+            percent = exported / total * 90 if total else 50
+            progress(percent, f"{exported} sekolah ditulis...")
+
+    if cancel_token is not None:
+        cancel_token.check()
+    if progress:
+        progress(95, "Menyimpan file Excel...")
+    workbook.save(file_path)
+    if progress:
+        progress(100, "Selesai!")
+    return exported
@@ -0,0 +1,38 @@
+"""
+Cached formatting for SIKELAR application
+Rupiah amounts and transaction dates repeat a lot (the same view models,
+PDF and summary rows are rebuilt for every triwulan and every export), so
+their display strings are memoized. Column helpers format a whole column
+of a table in one call
+"""
+
+from functools import lru_cache
+
+
+# Batas cache; jumlah nominal / tanggal unik per sekolah jauh di bawah ini
+CURRENCY_CACHE_SIZE = 1 << 16
+DATE_CACHE_SIZE = 1 << 12
+
+DATE_FORMAT = '%d-%m-%Y'
+
+
+@lru_cache(maxsize=CURRENCY_CACHE_SIZE)
+def format_currency(amount):
+    """Format number as Indonesian currency, e.g. 1500000 -> 'Rp 1.500.000'"""
+    return f"Rp {amount:,.0f}".replace(',', '.')
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def format_date(value):
+    """Format a date / datetime as dd-mm-yyyy"""
+    return value.strftime(DATE_FORMAT)
+
+
+def format_currency_column(amounts):
+    """Format a column of amounts (list, tuple, array('q'), ...) to a list of strings"""
+    return list(map(format_currency, amounts))
+
+
+def format_date_column(values):
+    """Format a column of dates to a list of strings"""
+    return list(map(format_date, values))
@@ -0,0 +1,495 @@
+"""
+PDF report for SIKELAR application
+Builds the ringkasan anggaran PDF (RKAS, realisasi BKU per triwulan and
+laporan keuangan) from a loaded BOSDataProcessor. Runs fine off the Tk
+thread; paragraph styles, table styles and static header blocks are built
+once per worker thread and reused by every export
+"""
+
+import datetime
+import threading
+from collections import namedtuple, deque
+from itertools import islice
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib.utils import simpleSplit
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Flowable
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+
+from .formatting import format_currency
+from .view_models import (TRIWULAN_LIST, PERIODE_TEXT, BKU_CATEGORIES, format_bku_row,
+                          sisa_dana_sampai_saat_ini)
+
+
+# 1 cm = 28.35 points, jadi margin 2 cm = 56.7 points
+MARGIN_2CM = 56.7
+
+# Dengan margin 2cm pada A4 (lebar 21cm), lebar tersedia 17cm ≈ 4.8 inch
+AVAILABLE_WIDTH = 4.8 * inch
+COLUMN_WIDTHS = [AVAILABLE_WIDTH * 0.7, AVAILABLE_WIDTH * 0.3]
+
+# Style dasar semua tabel ringkasan
+BASE_TABLE_COMMANDS = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+]
+
+RKAS_TABLE_COMMANDS = BASE_TABLE_COMMANDS + [
+    ('BACKGROUND', (0, 1), (-1, 1), colors.lightgrey),  # PAGU
+    ('BACKGROUND', (0, 2), (-1, 2), colors.lightgrey),  # BELANJA OPERASI
+    ('BACKGROUND', (0, 8), (-1, 8), colors.lightgrey),  # BELANJA MODAL
+    ('BACKGROUND', (0, 11), (-1, 11), colors.lightgrey),  # TOTAL ANGGARAN
+    ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 2), (-1, 2), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 8), (-1, 8), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 11), (-1, 11), 'Helvetica-Bold'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+]
+
+BKU_TABLE_COMMANDS = BASE_TABLE_COMMANDS + [
+    ('BACKGROUND', (0, 1), (-1, 1), colors.lightcoral),  # BELANJA OPERASI
+    ('BACKGROUND', (0, 7), (-1, 7), colors.lightcoral),  # BELANJA MODAL
+    ('BACKGROUND', (0, 10), (-1, 10), colors.lightcoral),  # TOTAL REALISASI
+    ('BACKGROUND', (0, 12), (-1, 12), colors.lightgreen),  # TOTAL REALISASI SAMPAI SAAT INI
+    ('BACKGROUND', (0, 13), (-1, 13), colors.lightblue),  # SISA DANA 1 TAHUN
+    ('BACKGROUND', (0, 14), (-1, 14), colors.plum),  # SISA DANA 50%
+    ('BACKGROUND', (0, 15), (-1, 15), colors.orange),  # PERSENTASE
+    ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 7), (-1, 7), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 10), (-1, 10), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 12), (-1, 15), 'Helvetica-Bold'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+]
+
+# Lampiran rincian transaksi BKU memakai lebar frame penuh (A4 - 2 x 2cm)
+DETAIL_COLUMN_WIDTHS = [55, 85, 70, 186, 85]
+DETAIL_HEADER = ['Tanggal', 'Kode Rekening', 'Kode Kegiatan', 'Uraian', 'Jumlah (Rp)']
+
+# Jumlah baris maksimum yang dibuat menjadi satu Table sekaligus
+DETAIL_CHUNK_ROWS = 80
+DETAIL_FONT_SIZE = 7
+
+DETAIL_TABLE_COMMANDS = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), DETAIL_FONT_SIZE),
+    ('LEADING', (0, 0), (-1, -1), DETAIL_FONT_SIZE + 1.5),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('ALIGN', (4, 0), (4, -1), 'RIGHT'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.black)
+]
+
+LAPORAN_TABLE_COMMANDS = BASE_TABLE_COMMANDS + [
+    ('BACKGROUND', (0, 1), (-1, 4), colors.lightblue),  # Category items
+    ('BACKGROUND', (0, 5), (-1, 5), colors.lightcoral),  # Total
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica-Bold'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+]
+
+
+# Judul statis laporan. Paragraph-nya dibuat baru di setiap build: reportlab
+# menandai flowable yang tidak muat (_postponed) dan tanda itu tidak pernah
+# dihapus, jadi instance flowable tidak boleh dipakai ulang antar build
+REPORT_TITLE = "LAPORAN RINGKASAN ANGGARAN"
+RKAS_HEADING = "RKAS (Rencana Kegiatan dan Anggaran Sekolah)"
+BKU_HEADING = "REALISASI BKU (Buku Kas Umum)"
+LAPORAN_HEADING = "LAPORAN KEUANGAN REALISASI"
+NO_BKU_TEXT = "Data BKU tidak tersedia"
+APPENDIX_HEADING = "LAMPIRAN RINCIAN TRANSAKSI BKU"
+
+
+class ReportLayout:
+    """
+    Static parts of the report that are the same for every school:
+    paragraph styles and table styles (no flowables, see REPORT_TITLE).
+    """
+
+    def __init__(self):
+        styles = getSampleStyleSheet()
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            alignment=TA_CENTER,
+            spaceAfter=25,
+            fontSize=14,
+            fontName='Helvetica-Bold'
+        )
+        self.subtitle_style = ParagraphStyle(
+            'CustomSubtitle',
+            parent=styles['Heading2'],
+            alignment=TA_CENTER,
+            spaceAfter=15,
+            fontSize=12,
+            fontName='Helvetica-Bold'
+        )
+        self.normal_style = ParagraphStyle(
+            'CustomNormal',
+            parent=styles['Normal'],
+            alignment=TA_LEFT,
+            spaceAfter=8,
+            fontSize=9
+        )
+        self.triwulan_style = ParagraphStyle(
+            'TW_Title',
+            parent=styles['Heading3'],
+            alignment=TA_LEFT,
+            fontSize=11,
+            fontName='Helvetica-Bold',
+            spaceAfter=8
+        )
+
+        self.rkas_table_style = TableStyle(RKAS_TABLE_COMMANDS)
+        self.bku_table_style = TableStyle(BKU_TABLE_COMMANDS)
+        self.laporan_table_style = TableStyle(LAPORAN_TABLE_COMMANDS)
+        self.detail_table_style = TableStyle(DETAIL_TABLE_COMMANDS)
+
+
+_local = threading.local()
+
+
+def get_report_layout():
+    """Return the ReportLayout of the current thread, built on first use"""
+    layout = getattr(_local, 'layout', None)
+    if layout is None:
+        layout = _local.layout = ReportLayout()
+    return layout
+
+
+class _ProgressDocTemplate(SimpleDocTemplate):
+    """SimpleDocTemplate that reports progress and checks cancellation per flowable"""
+
+    def __init__(self, file_path, total_flowables, progress=None, cancel_token=None, **kwargs):
+        super().__init__(file_path, **kwargs)
+        self._total_flowables = max(1, total_flowables)
+        self._done_flowables = 0
+        self._progress = progress
+        self._cancel_token = cancel_token
+
+    def afterFlowable(self, flowable):
+        self._done_flowables += 1
+        if self._cancel_token is not None:
+            self._cancel_token.check()
+        if self._progress:
+            percent = 50 + 45 * min(self._done_flowables, self._total_flowables) / self._total_flowables
+            self._progress(percent, "Menulis PDF...")
+
+
+class ChunkedTable(Flowable):
+    """
+    Long table fed from a row iterator.
+
+    Rows are pulled only when the table is laid out: each split builds a
+    Table from at most `chunk_rows` pending rows, keeps the part that fits
+    the remaining frame (header repeated on every page) and pushes the rest
+    back. Only one chunk of flowables exists at a time, so layout time grows
+    linearly and memory stays bounded whatever the number of rows.
+    """
+
+    def __init__(self, header, rows, col_widths, style, chunk_rows=DETAIL_CHUNK_ROWS):
+        super().__init__()
+        self.header = header
+        self.col_widths = col_widths
+        self.style = style
+        self.chunk_rows = chunk_rows
+        self._rows = iter(rows)
+        self._pending = deque()
+
+    def _fill(self):
+        """Top up pending rows from the iterator, returns False when nothing is left"""
+        if len(self._pending) < self.chunk_rows:
+            self._pending.extend(islice(self._rows, self.chunk_rows - len(self._pending)))
+        return bool(self._pending)
+
+    def wrap(self, availWidth, availHeight):
+        # Selalu minta di-split selama masih ada baris; kosong = selesai
+        if self._fill():
+            return availWidth, availHeight + 1
+        return 0, 0
+
+    def draw(self):
+        pass
+
+    def split(self, availWidth, availHeight):
+        if not self._fill():
+            return []
+
+        table = Table([self.header] + list(self._pending), colWidths=self.col_widths, repeatRows=1)
+        table.setStyle(self.style)
+        _, height = table.wrap(availWidth, availHeight)
+        if height <= availHeight:
+            used, part = len(self._pending), table
+        else:
+            parts = table.split(availWidth, availHeight)
+            if not parts:
+                # Tidak muat di sisa halaman, coba lagi di halaman berikutnya
+                return []
+            part = parts[0]
+            used = part._nrows - 1
+
+        for _ in range(used):
+            self._pending.popleft()
+        # Berhasil menaruh potongan, jadi tidak lagi dianggap tertunda
+        self.__dict__.pop('_postponed', None)
+        return [part, self]
+
+
+def detail_rows(items):
+    """
+    Lazily format BKU items into detail table rows. Uraian is wrapped once
+    here into plain lines, much cheaper for Table to measure than a Paragraph.
+    """
+    uraian_width = DETAIL_COLUMN_WIDTHS[3] - 12  # dikurangi padding kiri/kanan sel
+    for item in items:
+        tanggal, kode_rekening, kode_kegiatan, uraian, jumlah = format_bku_row(item)
+        lines = simpleSplit(str(uraian), 'Helvetica', DETAIL_FONT_SIZE, uraian_width)
+        yield [tanggal, kode_rekening, kode_kegiatan, '\n'.join(lines), jumlah]
+
+
+def detail_items(processor):
+    """
+    (heading, items) per BKU category and triwulan that has transactions.
+    The items are the processor's own BKU item lists (plain data, picklable),
+    nothing is formatted yet.
+    """
+    sections = []
+    for getter, title in BKU_CATEGORIES.values():
+        for triwulan in TRIWULAN_LIST:
+            items = getattr(processor, getter)(triwulan)
+            if items:
+                sections.append((f"{title} - {triwulan} ({len(items)} transaksi)", items))
+    return sections
+
+
+def detail_sections(sections):
+    """(heading, items) -> (heading, rows), rows formatted lazily by detail_rows"""
+    return ((heading, detail_rows(items)) for heading, items in sections)
+
+
+def build_appendix_story(sections, layout=None):
+    """Appendix flowables for (heading, rows) sections"""
+    layout = layout or get_report_layout()
+    story = [PageBreak(), Paragraph(APPENDIX_HEADING, layout.subtitle_style)]
+    for heading, rows in sections:
+        story.append(Paragraph(heading, layout.triwulan_style))
+        story.append(ChunkedTable(DETAIL_HEADER, rows, DETAIL_COLUMN_WIDTHS, layout.detail_table_style))
+        story.append(Spacer(1, 10))
+    return story
+
+
+def build_detail_appendix(processor, layout=None):
+    """
+    Appendix flowables listing every BKU transaction per category and
+    triwulan, empty when there is no BKU data.
+    """
+    if not processor.bku_data_available:
+        return []
+    return build_appendix_story(detail_sections(detail_items(processor)), layout)
+
+
+# Isi laporan satu sekolah dalam bentuk data biasa (string), kecil dan bisa
+# di-pickle sehingga bisa dikirim antar proses. bku_tables berisi pasangan
+# (triwulan, rows); laporan_rows None jika tidak ada realisasi
+ReportData = namedtuple('ReportData', ['school', 'printed_at', 'rkas_rows', 'bku_available',
+                                       'bku_tables', 'laporan_rows'])
+
+
+def collect_report_data(processor):
+    """Collect the formatted table rows of the report from a loaded processor"""
+    bku_tables = []
+    laporan_rows = None
+
+    if processor.bku_data_available:
+        summaries = {}
+        for triwulan in TRIWULAN_LIST:
+            try:
+                summaries[triwulan] = processor.get_bku_summary_data_by_triwulan(triwulan)
+            except Exception as e:
+                print(f"Error processing {triwulan}: {e}")
+                summaries[triwulan] = None
+
+        for triwulan in TRIWULAN_LIST:
+            bku_summary_data = summaries[triwulan]
+            if bku_summary_data and bku_summary_data.get('total_realisasi', 0) > 0:
+                bku_tables.append((triwulan, _bku_rows(processor, triwulan, summaries)))
+
+        # Laporan keuangan untuk TW4 (satu tahun penuh)
+        laporan_data = processor.get_laporan_keuangan_data_by_triwulan("Triwulan 4")
+        if laporan_data and laporan_data.get('grand_total', 0) > 0:
+            laporan_rows = _laporan_rows(laporan_data)
+
+    return ReportData(
+        school=processor.nama_sekolah,
+        printed_at=datetime.datetime.now().strftime('%d %B %Y, %H:%M:%S'),
+        rkas_rows=_rkas_rows(processor),
+        bku_available=processor.bku_data_available,
+        bku_tables=bku_tables,
+        laporan_rows=laporan_rows
+    )
+
+
+def build_story(data, layout=None):
+    """Create the list of flowables for one school's ReportData"""
+    layout = layout or get_report_layout()
+
+    # Header
+    story = [
+        Paragraph(REPORT_TITLE, layout.title_style),
+        Paragraph(f"SEKOLAH {data.school}", layout.subtitle_style),
+        Paragraph(f"Dicetak pada: {data.printed_at}", layout.normal_style),
+        Spacer(1, 15),
+        Paragraph(RKAS_HEADING, layout.subtitle_style),
+        _table(data.rkas_rows, layout.rkas_table_style),
+        Spacer(1, 20),
+        Paragraph(BKU_HEADING, layout.subtitle_style)
+    ]
+
+    if data.bku_available:
+        for triwulan, rows in data.bku_tables:
+            story.append(Paragraph(f"Realisasi {triwulan}", layout.triwulan_style))
+            story.append(_table(rows, layout.bku_table_style))
+            story.append(Spacer(1, 15))
+
+        story.append(Paragraph(LAPORAN_HEADING, layout.subtitle_style))
+        if data.laporan_rows:
+            story.append(_table(data.laporan_rows, layout.laporan_table_style))
+            story.append(Spacer(1, 15))
+    else:
+        story.append(Paragraph(NO_BKU_TEXT, layout.normal_style))
+
+    return story
+
+
+def write_pdf(file_path, story, progress=None, cancel_token=None):
+    """
+    Build a story into file_path with 2cm margins on A4.
+    `progress(percent, message)` goes from 50 to 95 while flowables are laid out.
+    """
+    doc = _ProgressDocTemplate(file_path, len(story), progress, cancel_token,
+                               pagesize=A4,
+                               rightMargin=MARGIN_2CM, leftMargin=MARGIN_2CM,
+                               topMargin=MARGIN_2CM, bottomMargin=MARGIN_2CM)
+    doc.build(story)
+    return file_path
+
+
+class RingkasanReport:
+    """Ringkasan anggaran PDF for one loaded school"""
+
+    def __init__(self, processor, layout=None, include_details=False):
+        self.processor = processor
+        self.layout = layout or get_report_layout()
+        self.include_details = include_details
+
+    def build_story(self):
+        """Create the list of flowables, plus the transaction appendix if requested"""
+        story = build_story(collect_report_data(self.processor), self.layout)
+        if self.include_details:
+            story.extend(build_detail_appendix(self.processor, self.layout))
+        return story
+
+    def build(self, file_path, progress=None, cancel_token=None):
+        """
+        Write the PDF to file_path. `progress(percent, message)` is called
+        along the way; raises OperationCancelled when cancel_token is cancelled.
+        """
+        def report(percent, message):
+            if progress:
+                progress(percent, message)
+
+        report(10, "Menyusun laporan...")
+        story = self.build_story()
+        if cancel_token is not None:
+            cancel_token.check()
+
+        report(50, "Menulis PDF...")
+        write_pdf(file_path, story, progress, cancel_token)
+        report(100, "Selesai!")
+        return file_path
+
+
+def _table(rows, style):
+    """Two column summary table"""
+    table = Table(rows, colWidths=COLUMN_WIDTHS)
+    table.setStyle(style)
+    return table
+
+
+def _rkas_rows(processor):
+    """RKAS summary table rows"""
+    summary_data = processor.get_summary_data()
+    return [
+        ['Kategori', 'Jumlah (Rp)'],
+        ['PAGU TAHUN 2025', format_currency(processor.total_penerimaan)],
+        ['BELANJA OPERASI', format_currency(summary_data['total_belanja_operasi'])],
+        ['  BELANJA HONOR', format_currency(summary_data['total_honor'])],
+        ['  BELANJA JASA', format_currency(summary_data['jasa_sesungguhnya'])],
+        ['  BELANJA PEMELIHARAAN', format_currency(summary_data['total_pemeliharaan'])],
+        ['  BELANJA PERJALANAN', format_currency(summary_data['total_perjalanan'])],
+        ['  BELANJA PERSEDIAAN', format_currency(summary_data['belanja_persediaan_ringkasan'])],
+        ['BELANJA MODAL', format_currency(summary_data['belanja_modal'])],
+        ['  PERALATAN DAN MESIN', format_currency(summary_data['total_peralatan'])],
+        ['  ASET TETAP LAINNYA', format_currency(summary_data['total_aset_tetap'])],
+        ['TOTAL ANGGARAN', format_currency(summary_data['total_anggaran'])]
+    ]
+
+
+def _bku_rows(processor, triwulan, summaries):
+    """BKU realisasi table rows for one triwulan"""
+    bku_summary_data = summaries[triwulan]
+
+    # Total realisasi dari TW1 sampai triwulan ini
+    current_index = TRIWULAN_LIST.index(triwulan)
+    total_realisasi_sampai_saat_ini = sum(
+        summaries[tw]['total_realisasi'] for tw in TRIWULAN_LIST[:current_index + 1]
+        if summaries[tw] and summaries[tw].get('total_realisasi', 0) > 0
+    )
+    total_pagu_rkas = processor.total_penerimaan
+    total_sisa_dana_1_tahun = total_pagu_rkas - total_realisasi_sampai_saat_ini
+    total_sisa_dana_sampai_saat_ini = sisa_dana_sampai_saat_ini(total_pagu_rkas, total_realisasi_sampai_saat_ini)
+    persentase_realisasi = (total_realisasi_sampai_saat_ini / total_pagu_rkas * 100) if total_pagu_rkas > 0 else 0
+
+    return [
+        ['Kategori', 'Jumlah (Rp)'],
+        ['BELANJA OPERASI', format_currency(bku_summary_data['total_belanja_operasi_bku'])],
+        ['  BELANJA HONOR', format_currency(bku_summary_data['total_honor_bku'])],
+        ['  BELANJA JASA', format_currency(bku_summary_data['jasa_sesungguhnya_bku'])],
+        ['  BELANJA PEMELIHARAAN', format_currency(bku_summary_data['total_pemeliharaan_bku'])],
+        ['  BELANJA PERJALANAN', format_currency(bku_summary_data['total_perjalanan_bku'])],
+        ['  BELANJA PERSEDIAAN', format_currency(bku_summary_data['total_persediaan_bku'])],
+        ['BELANJA MODAL', format_currency(bku_summary_data['belanja_modal_bku'])],
+        ['  PERALATAN DAN MESIN', format_currency(bku_summary_data['total_peralatan_bku'])],
+        ['  ASET TETAP LAINNYA', format_currency(bku_summary_data['total_aset_tetap_bku'])],
+        ['TOTAL REALISASI', format_currency(bku_summary_data['total_realisasi'])],
+        ['', ''],  # Separator
+        [f'TOTAL REALISASI SAMPAI SAAT INI ({PERIODE_TEXT[triwulan]})',
+         format_currency(total_realisasi_sampai_saat_ini)],
+        ['TOTAL SISA DANA BOSP REGULER (1 TAHUN)',
+         format_currency(total_sisa_dana_1_tahun)],
+        ['TOTAL SISA DANA BOSP REGULER SAMPAI SAAT INI',
+         format_currency(total_sisa_dana_sampai_saat_ini)],
+        ['PERSENTASE REALISASI DANA BOSP SAMPAI SAAT INI', f'{persentase_realisasi:.2f}%']
+    ]
+
+
+def _laporan_rows(laporan_data):
+    """Laporan keuangan realisasi table rows"""
+    return [
+        ['Kategori', 'Jumlah (Rp)'],
+        ['PAKAI HABIS', format_currency(laporan_data['total_belanja_persediaan'])],
+        ['BARANG DAN JASA', format_currency(laporan_data['total_barang_dan_jasa'])],
+        ['PERALATAN DAN MESIN', format_currency(laporan_data['total_peralatan_mesin'])],
+        ['ASET TETAP LAINNYA', format_currency(laporan_data['total_aset_tetap'])],
+        ['TOTAL REALISASI', format_currency(laporan_data['grand_total'])]
+    ]
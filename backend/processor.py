@@ -7,6 +7,8 @@ import re
 from .utils import FormatUtils
 from .rkas_processor import RKASDataProcessor  
 from .bku_processor import BKUDataProcessor
+from .cancellation import CancellationToken
+from .sheet_loader import load_sheets, RKAS_SHEET, BKU_SHEET
 
  
 class BOSDataProcessor:
@@ -36,18 +38,34 @@ class BOSDataProcessor:
         self.rkas_processor.reset_data()
         self.bku_processor.reset_data()
 
-    def extract_excel_data(self, file_path):
-        """Ekstrak data dari file Excel dengan struktur spesifik RKAS dan BKU"""
+    def extract_excel_data(self, file_path, cancel_token=None, bku_checkpoint=None):
+        """
+        Ekstrak data dari file Excel dengan struktur spesifik RKAS dan BKU.
+        Ekstraksi dilakukan ke processor baru dan baru dipasang jika berhasil,
+        jadi pembatalan (OperationCancelled) atau error tidak merusak data sebelumnya.
+        bku_checkpoint (dari upload sebelumnya file yang sama) membuat BKU
+        hanya memparse baris yang baru ditambahkan.
+        """
         print("Debug: Starting data extraction...")
+        cancel_token = cancel_token or CancellationToken()
+        
+        rkas_processor = RKASDataProcessor()
+        bku_processor = BKUDataProcessor()
         
-        # Reset semua data
-        self.reset_data()
+        # Workbook dibuka sekali (read-only): index, sharedStrings dan stylesheet
+        # hanya diparse satu kali untuk kedua sheet
+        rkas_sheet, bku_sheet = load_sheets(file_path, (RKAS_SHEET, BKU_SHEET), cancel_token)
         
         # Ekstrak data RKAS
-        self.rkas_processor.extract_rkas_data(file_path)
+        rkas_processor.extract_rkas_sheet(rkas_sheet, cancel_token)
         
         # Ekstrak data BKU  
-        self.bku_processor.extract_bku_data(file_path)
+        bku_processor.extract_bku_sheet(bku_sheet, cancel_token, checkpoint=bku_checkpoint)
+        cancel_token.check()
+        
+        # Semua berhasil, pasang hasil ekstraksi sekaligus
+        self.rkas_processor = rkas_processor
+        self.bku_processor = bku_processor
         
         # Print summary
         print(f"Debug: RKAS - Total Penerimaan: Rp {self.rkas_processor.total_penerimaan:,}")
@@ -114,9 +132,9 @@ class BOSDataProcessor:
 
     # Properties untuk kompatibilitas dengan kode existing
     @property
-    def excel_data(self):
-        """Compatibility property untuk check apakah data sudah dimuat"""
-        return self.rkas_processor.excel_data if hasattr(self.rkas_processor, 'excel_data') else None
+    def is_loaded(self):
+        """Check apakah data Excel sudah dimuat (workbook sendiri tidak disimpan)"""
+        return self.rkas_processor.is_loaded
     
     @property
     def total_penerimaan(self):
@@ -157,6 +175,10 @@ class BOSDataProcessor:
     @property
     def bku_data_available(self):
         return self.bku_processor.bku_data_available
+    
+    @property
+    def bku_checkpoint(self):
+        return self.bku_processor.checkpoint
 
     # RKAS Methods - delegate to RKAS processor
     def filter_budget_by_codes(self, codes):
@@ -3,13 +3,17 @@ RKAS Data processor for SIKELAR application
 Handles Excel RKAS data extraction and processing
 """
 
-import openpyxl
 from typing import Dict, List
 from .utils import ExcelUtils
+from .rupiah import to_rupiah
+from .sheet_loader import load_sheet, RKAS_SHEET
+from .sheet_extent import SheetExtent, RKAS_KODE_REKENING_COLUMNS, RKAS_KODE_KEGIATAN_COLUMNS
+from .cancellation import CancellationToken
 
 class RKASDataProcessor:
     def __init__(self):
         self.excel_utils = ExcelUtils()
+        self.cancel_token = CancellationToken()
         self.reset_data()
         
         # Kategori kode yang lebih spesifik berdasarkan gambar
@@ -25,7 +29,8 @@ class RKASDataProcessor:
 
     def reset_data(self):
         """Reset all RKAS data to initial state"""
-        self.excel_data = None
+        # Workbook tidak disimpan, cukup tandai apakah data sudah dimuat
+        self.is_loaded = False
         self.total_penerimaan = 0
         self.budget_items = []
         self.belanja_persediaan_items = []
@@ -35,28 +40,34 @@ class RKASDataProcessor:
         self.peralatan_items = []
         self.aset_tetap_items = []
         self.nama_sekolah = ""
+        self.sheet_extent = None
 
-    def extract_rkas_data(self, file_path):
-        """Ekstrak data RKAS dari file Excel"""
-        workbook = openpyxl.load_workbook(file_path)
+    def _extent(self, sheet):
+        """SheetExtent sheet ini, index baris berisi data dibuat sekali per sheet"""
+        if self.sheet_extent is None or self.sheet_extent.sheet is not sheet:
+            self.sheet_extent = SheetExtent(sheet)
+        return self.sheet_extent
+
+    def extract_rkas_data(self, file_path, cancel_token=None):
+        """Ekstrak data RKAS dari file Excel, bisa dibatalkan lewat cancel_token"""
+        # Hanya sheet RKAS (atau sheet pertama) yang dibaca, read-only tanpa style/gambar
+        rkas_sheet = load_sheet(file_path, *RKAS_SHEET, cancel_token)
+        self.extract_rkas_sheet(rkas_sheet, cancel_token)
+
+    def extract_rkas_sheet(self, rkas_sheet, cancel_token=None):
+        """Ekstrak data RKAS dari sheet yang sudah dimuat (SheetValues dari sheet_loader)"""
+        self.cancel_token = cancel_token or CancellationToken()
+        self.cancel_token.check()
         
         # Reset data
         self.reset_data()
-        self.excel_data = workbook
-        
-        # Tentukan sheet RKAS
-        try:
-            if 'RKAS' in workbook.sheetnames:
-                rkas_sheet = workbook['RKAS']
-            else:
-                rkas_sheet = workbook.worksheets[0]  # Sheet pertama
-                
-        except Exception as e:
-            print(f"Error accessing RKAS sheet: {e}")
-            rkas_sheet = workbook.active
         
         # Proses RKAS
         self.process_rkas_data(rkas_sheet)
+        self.is_loaded = True
+        
+        # Yang dipakai GUI/export hanya hasil ekstraksi, lepaskan nilai sheet
+        self.sheet_extent = None
         
         print(f"Debug: Total Penerimaan: Rp {self.total_penerimaan:,}")
         print(f"Debug: Found {len(self.belanja_persediaan_items)} belanja persediaan items")
@@ -118,7 +129,7 @@ class RKASDataProcessor:
             for col_idx in range(9, 15):  # I=9, J=10, K=11, L=12, M=13, N=14
                 cell_value = sheet.cell(row=30, column=col_idx).value
                 if isinstance(cell_value, (int, float)) and cell_value > 0:
-                    self.total_penerimaan = int(cell_value)
+                    self.total_penerimaan = to_rupiah(cell_value)
                     print(f"Debug: Total Penerimaan ditemukan di baris 30, kolom {chr(64+col_idx)}: Rp {self.total_penerimaan:,}")
                     return
             
@@ -127,7 +138,7 @@ class RKASDataProcessor:
                 for col_idx in range(9, 15):  # Kolom I-N
                     cell_value = sheet.cell(row=row_idx, column=col_idx).value
                     if isinstance(cell_value, (int, float)) and cell_value > 0:
-                        self.total_penerimaan = int(cell_value)
+                        self.total_penerimaan = to_rupiah(cell_value)
                         print(f"Debug: Total Penerimaan ditemukan di baris {row_idx}, kolom {chr(64+col_idx)}: Rp {self.total_penerimaan:,}")
                         return
         except Exception as e:
@@ -144,8 +155,10 @@ class RKASDataProcessor:
         
         print(f"Debug: Mencari kode: {all_target_codes}")
         
-        # Iterasi semua baris untuk mencari kode kegiatan
-        for row_idx in range(1, sheet.max_row + 1):
+        # Iterasi baris yang berisi kode kegiatan saja (baris kosong dilewati sekaligus)
+        rows = self._extent(sheet).data_rows(RKAS_KODE_KEGIATAN_COLUMNS)
+        for count, row_idx in enumerate(rows, 1):
+            self.cancel_token.checkpoint(count)
             # Baca kode kegiatan dari kolom G (index 7)
             kode_cell = sheet.cell(row=row_idx, column=7)  # Kolom G
             kode_value = str(kode_cell.value) if kode_cell.value else ""
@@ -249,8 +262,10 @@ class RKASDataProcessor:
         
         print(f"Debug: Mencari kode rekening yang mengandung: {target_code}")
         
-        # Iterasi semua baris untuk mencari kode rekening
-        for row_idx in range(1, sheet.max_row + 1):
+        # Iterasi baris yang berisi kode rekening saja (baris kosong dilewati sekaligus)
+        rows = self._extent(sheet).data_rows(RKAS_KODE_REKENING_COLUMNS)
+        for count, row_idx in enumerate(rows, 1):
+            self.cancel_token.checkpoint(count)
             # STRICT: Hanya baca kode rekening dari baris yang tepat, tanpa fallback ke baris lain
             kode_rekening = self.excel_utils.extract_merged_text_strict(sheet, row_idx, range(4, 7))
             
@@ -0,0 +1,65 @@
+"""
+Rupiah number normalization for SIKELAR application
+Every amount is held as whole rupiah in a Python int (int64 range), so
+totals and differences are exact. Indonesian text ('Rp 1.500.000,50')
+and Excel numerics (1500000, or 1499999.9999998 from a formula) follow
+the same rules: thousands separators are dropped and a fraction is
+rounded half up
+"""
+
+import math
+from array import array
+
+
+# Satu tabel translate (bytes, dieksekusi di C): hapus 'Rp', spasi dan titik ribuan sekaligus
+_DELETE_BYTES = b'Rp .\xa0\t'
+
+
+def parse_rupiah(text):
+    """Indonesian formatted amount -> int rupiah, 0 when it is not a number"""
+    if not text:
+        return 0
+    if not isinstance(text, str):
+        text = str(text)
+    try:
+        cleaned = text.encode('latin-1').translate(None, _DELETE_BYTES)
+        # Jalur cepat: rupiah bulat tanpa koma desimal
+        return int(cleaned)
+    except UnicodeEncodeError:
+        return 0
+    except ValueError:
+        return _parse_decimal(cleaned)
+
+
+def _parse_decimal(cleaned):
+    """'1500000,50' (bytes, already cleaned) -> 1500001, 0 when invalid"""
+    integer, _, fraction = cleaned.partition(b',')
+    # Bagian setelah koma kedua diabaikan (sama dengan clean_number lama)
+    fraction = fraction.partition(b',')[0]
+    try:
+        value = int(integer) if integer else 0
+    except ValueError:
+        return 0
+    if fraction:
+        if not fraction.isdigit():
+            return 0
+        if fraction[0] >= ord('5'):
+            value += -1 if integer.startswith(b'-') else 1
+    return value
+
+
+def to_rupiah(value):
+    """Excel cell value (int, float or text) -> int rupiah"""
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return 0
+        # Bulatkan, bukan truncate: hasil rumus Excel bisa 1499999.9999998
+        return int(value + 0.5) if value >= 0 else -int(-value + 0.5)
+    return parse_rupiah(value)
+
+
+def to_rupiah_column(values):
+    """Normalize a column of Excel values / amounts to array('q')"""
+    return array('q', map(to_rupiah, values))
@@ -0,0 +1,195 @@
+"""
+Workbook session for SIKELAR application
+Keeps several loaded schools resident so switching between them is instant.
+Resident snapshots are bounded by a memory budget; the least recently viewed
+school is evicted back to its on-disk form (the source workbook) and is
+reloaded from there when it is selected again
+"""
+
+import os
+import sys
+import itertools
+from types import ModuleType, FunctionType, MethodType
+
+
+# Budget default untuk snapshot yang disimpan di memori (MB)
+DEFAULT_MEMORY_BUDGET_MB = 512
+MEMORY_BUDGET_ENV = 'SIKELAR_MEMORY_BUDGET_MB'
+# Path database SQLite opsional (backend.store); dibaca di sini supaya GUI
+# tidak perlu memuat sqlite3 saat store tidak diaktifkan
+STORE_PATH_ENV = 'SIKELAR_STORE_PATH'
+
+
+def memory_budget_from_env(default=DEFAULT_MEMORY_BUDGET_MB):
+    """Read the memory budget (MB) from SIKELAR_MEMORY_BUDGET_MB, fallback to default"""
+    try:
+        return max(0, int(os.environ.get(MEMORY_BUDGET_ENV, default)))
+    except ValueError:
+        return default
+
+
+def store_path_from_env():
+    """Store path from SIKELAR_STORE_PATH, None when the store is not enabled"""
+    return os.environ.get(STORE_PATH_ENV) or None
+
+
+def estimate_size(obj):
+    """
+    Rough deep size in bytes of an object graph (containers, instance
+    attributes and slots). Meant for budgeting, not exact accounting.
+    """
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, (type, ModuleType, FunctionType, MethodType)):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, (str, bytes, int, float, bool)) or current is None:
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+            continue
+        if isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+            continue
+        # MappingProxyType dan mapping lain yang read-only
+        if hasattr(current, 'values') and hasattr(current, 'keys'):
+            try:
+                stack.extend(current.keys())
+                stack.extend(current.values())
+            except TypeError:
+                pass
+
+        attributes = getattr(current, '__dict__', None)
+        if attributes is not None:
+            stack.append(attributes)
+        for cls in type(current).__mro__:
+            for slot in getattr(cls, '__slots__', ()):
+                value = getattr(current, slot, None)
+                if value is not None:
+                    stack.append(value)
+    return total
+
+
+def session_key(snapshot):
+    """Key of a snapshot in the session: (school name, normalized file path)"""
+    return (snapshot.processor.nama_sekolah or "", os.path.normcase(os.path.abspath(snapshot.file_path)))
+
+
+class SessionEntry:
+    """One school in the session. `snapshot` is None while evicted"""
+
+    def __init__(self, key, file_path):
+        self.key = key
+        self.school_name = key[0]
+        self.file_path = file_path
+        self.snapshot = None
+        self.size = 0
+        self.last_viewed = 0
+
+    @property
+    def resident(self):
+        return self.snapshot is not None
+
+    @property
+    def label(self):
+        name = self.school_name or "Sekolah"
+        return f"{name} ({os.path.basename(self.file_path)})"
+
+
+class WorkbookSession:
+    """
+    Loaded schools keyed by (school name, file).
+
+    Entries keep their insertion order for display. Residency follows LRU by
+    view: whenever the resident total exceeds `memory_budget` bytes, the least
+    recently viewed entries are evicted (never the one being viewed). An
+    evicted entry keeps its file path so it can be reloaded.
+    """
+
+    def __init__(self, memory_budget_mb=DEFAULT_MEMORY_BUDGET_MB):
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.entries = {}
+        self.current_key = None
+        self._clock = itertools.count(1)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries.values())
+
+    @property
+    def resident_size(self):
+        return sum(entry.size for entry in self.entries.values() if entry.resident)
+
+    def put(self, snapshot, size=None):
+        """
+        Add or refresh a loaded snapshot and mark it as viewed.
+        `size` may be precomputed off the Tk thread with estimate_size.
+        Returns the entry.
+        """
+        key = session_key(snapshot)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = SessionEntry(key, snapshot.file_path)
+            self.entries[key] = entry
+        entry.snapshot = snapshot
+        entry.size = estimate_size(snapshot) if size is None else size
+        self.touch(key)
+        return entry
+
+    def get(self, key):
+        """Return the entry for key or None"""
+        return self.entries.get(key)
+
+    def resident_snapshot_for(self, file_path):
+        """Most recently viewed resident snapshot loaded from file_path, or None"""
+        path = os.path.normcase(os.path.abspath(file_path))
+        entries = [entry for entry in self.entries.values() if entry.resident and entry.key[1] == path]
+        if not entries:
+            return None
+        return max(entries, key=lambda entry: entry.last_viewed).snapshot
+
+    def touch(self, key):
+        """Mark key as the viewed school and enforce the memory budget"""
+        entry = self.entries[key]
+        entry.last_viewed = next(self._clock)
+        self.current_key = key
+        self._enforce_budget()
+
+    def evict(self, key):
+        """Drop the in-memory snapshot of key, the entry stays listed"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry.snapshot = None
+            entry.size = 0
+
+    def remove(self, key):
+        """Remove key from the session"""
+        self.entries.pop(key, None)
+        if self.current_key == key:
+            self.current_key = None
+
+    def clear(self):
+        """Forget every school"""
+        self.entries.clear()
+        self.current_key = None
+
+    def _enforce_budget(self):
+        """Evict least recently viewed entries until within budget"""
+        candidates = sorted(
+            (entry for entry in self.entries.values() if entry.resident and entry.key != self.current_key),
+            key=lambda entry: entry.last_viewed
+        )
+        total = self.resident_size
+        for entry in candidates:
+            if total <= self.memory_budget:
+                break
+            total -= entry.size
+            self.evict(entry.key)
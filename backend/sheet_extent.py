@@ -0,0 +1,77 @@
+"""
+Sheet extent detection for SIKELAR application
+ARKAS exports often carry formatting far below the data (sometimes down to
+row 1.048.576), and `sheet.max_row` counts those styled empty cells. A
+SheetExtent indexes once which rows hold a value per column, so extractors
+can stop at the real last row and skip runs of empty rows in bulk instead
+of probing every row with sheet.cell() (which also creates cells)
+"""
+
+from bisect import bisect_left
+
+from .sheet_loader import SheetValues
+
+
+# Kolom kunci (1-based) per sheet
+RKAS_KODE_REKENING_COLUMNS = (4, 5, 6)     # D-F
+RKAS_KODE_KEGIATAN_COLUMNS = (7,)          # G
+RKAS_JUMLAH_COLUMNS = (14, 15)             # N-O
+BKU_KODE_REKENING_COLUMNS = (6, 7)         # F-G
+BKU_JUMLAH_COLUMNS = (17, 18, 19)          # Q-S
+
+
+class SheetExtent:
+    """
+    Rows with data per column of one worksheet, built in a single pass over
+    the cells the sheet already holds (SheetValues, a loaded Worksheet) or
+    over iter_rows for read-only sheets.
+    """
+
+    def __init__(self, sheet):
+        self.sheet = sheet
+        self._column_rows = None    # kolom -> set baris yang berisi nilai
+        self._rows = {}             # tuple kolom -> list baris terurut
+
+    def _index(self):
+        if self._column_rows is None:
+            column_rows = {}
+            cells = getattr(self.sheet, '_cells', None)
+            if isinstance(self.sheet, SheetValues):
+                # Hasil load_sheet: hanya berisi nilai non-None
+                for row_idx, col_idx in self.sheet.cells:
+                    column_rows.setdefault(col_idx, set()).add(row_idx)
+            elif cells is not None:
+                # Worksheet biasa: cell kosong berformat ada di _cells dengan value None
+                for (row_idx, col_idx), cell in cells.items():
+                    if cell._value is not None:
+                        column_rows.setdefault(col_idx, set()).add(row_idx)
+            else:
+                # Read-only worksheet: hanya baris yang ada di XML yang di-yield
+                for row_idx, row in enumerate(self.sheet.iter_rows(values_only=True), 1):
+                    for col_idx, value in enumerate(row, 1):
+                        if value is not None:
+                            column_rows.setdefault(col_idx, set()).add(row_idx)
+            self._column_rows = column_rows
+        return self._column_rows
+
+    def rows(self, columns):
+        """Sorted rows that have a value in any of the columns"""
+        key = tuple(columns)
+        rows = self._rows.get(key)
+        if rows is None:
+            column_rows = self._index()
+            found = set()
+            for col_idx in key:
+                found.update(column_rows.get(col_idx, ()))
+            rows = self._rows[key] = sorted(found)
+        return rows
+
+    def data_rows(self, columns, first_row=1):
+        """Rows from first_row on that have a value in any of the columns"""
+        rows = self.rows(columns)
+        return rows[bisect_left(rows, first_row):] if first_row > 1 else rows
+
+    def last_row(self, columns):
+        """Last row with a value in any of the columns, 0 for an empty sheet"""
+        rows = self.rows(columns)
+        return rows[-1] if rows else 0
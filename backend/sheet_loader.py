@@ -0,0 +1,105 @@
+"""
+Selective sheet loading for SIKELAR application
+Extraction only needs the RKAS and BKU sheets. Instead of a full
+load_workbook (every sheet, cell styles, drawings and images), the
+workbook is opened read-only: openpyxl then reads the workbook index,
+shared strings and number formats, and only the worksheet part that is
+asked for is parsed. Its non-empty values are kept in a SheetValues, which
+offers the small part of the Worksheet API the extractors use. An upload
+opens the workbook once and reads the RKAS and BKU sheets from it
+"""
+
+
+# (nama sheet, index worksheet cadangan jika nama tidak ada)
+RKAS_SHEET = ('RKAS', 0)
+BKU_SHEET = ('BKU', 1)
+
+
+class CellValue:
+    """Minimal stand-in for an openpyxl cell: only `.value`"""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+# Dipakai untuk semua koordinat kosong; tidak pernah diubah
+EMPTY_CELL = CellValue(None)
+
+
+class SheetValues:
+    """
+    Non-empty cell values of one worksheet. `cell(row, column)` never
+    creates cells, empty coordinates share EMPTY_CELL.
+    """
+
+    def __init__(self, title, cells):
+        self.title = title
+        self.cells = cells          # (row, column) -> CellValue, hanya nilai non-None
+
+    def cell(self, row, column):
+        return self.cells.get((row, column), EMPTY_CELL)
+
+    @property
+    def max_row(self):
+        return max((row for row, _ in self.cells), default=0)
+
+    @property
+    def max_column(self):
+        return max((column for _, column in self.cells), default=0)
+
+
+def read_sheet_values(worksheet, cancel_token=None):
+    """
+    Copy the non-empty values of a (read-only) worksheet into a SheetValues.
+    Parsing the sheet XML is the slow part of an upload, so cancel_token is
+    checked per row here.
+    """
+    # Dimensi di XML bisa salah atau mencakup baris kosong berformat; baca sampai baris terakhir yang ada
+    if hasattr(worksheet, 'reset_dimensions'):
+        worksheet.reset_dimensions()
+    cells = {}
+    for row_idx, row in enumerate(worksheet.iter_rows(values_only=True), 1):
+        if cancel_token is not None:
+            cancel_token.checkpoint(row_idx)
+        for col_idx, value in enumerate(row, 1):
+            if value is not None:
+                cells[(row_idx, col_idx)] = CellValue(value)
+    return SheetValues(worksheet.title, cells)
+
+
+def load_sheets(file_path, targets, cancel_token=None):
+    """
+    Open file_path once and load the worksheets in targets, a sequence of
+    (name, fallback_index): the sheet called name, else the worksheet at
+    fallback_index. Returns one SheetValues per target, None when the
+    workbook has no such sheet; a sheet named by two targets is read once.
+    """
+    import openpyxl  # baru dimuat saat upload pertama, bukan saat startup
+
+    workbook = openpyxl.load_workbook(file_path, read_only=True, keep_links=False)
+    try:
+        loaded = {}
+        sheets = []
+        for name, fallback_index in targets:
+            if cancel_token is not None:
+                cancel_token.check()
+            if name in workbook.sheetnames:
+                worksheet = workbook[name]
+            elif len(workbook.worksheets) > fallback_index:
+                worksheet = workbook.worksheets[fallback_index]
+            else:
+                sheets.append(None)
+                continue
+            if worksheet.title not in loaded:
+                loaded[worksheet.title] = read_sheet_values(worksheet, cancel_token)
+            sheets.append(loaded[worksheet.title])
+        return sheets
+    finally:
+        # Read-only workbook memegang file zip sampai ditutup
+        workbook.close()
+
+
+def load_sheet(file_path, name, fallback_index, cancel_token=None):
+    """Load one worksheet of file_path, see load_sheets"""
+    return load_sheets(file_path, [(name, fallback_index)], cancel_token)[0]
@@ -0,0 +1,56 @@
+"""
+Data snapshot for SIKELAR application
+An immutable result of one Excel load. A new snapshot is built completely
+off the Tk thread and then swapped in as a whole, so readers never see a
+half-loaded or half-cleared processor
+"""
+
+from collections import namedtuple
+
+from .processor import BOSDataProcessor
+from .view_models import ViewModelBuilder
+
+
+# processor di dalam snapshot tidak pernah diubah lagi setelah snapshot dibuat;
+# load berikutnya selalu memakai processor baru
+DataSnapshot = namedtuple('DataSnapshot', ['file_path', 'processor', 'view_models'])
+
+
+def empty_snapshot():
+    """Snapshot without any loaded file"""
+    return DataSnapshot(None, BOSDataProcessor(), None)
+
+
+def load_snapshot(file_path, cancel_token=None, progress=None, previous=None):
+    """
+    Extract an Excel file and precompute its view models into a new snapshot.
+    `previous` is an earlier snapshot of the same file: its BKU checkpoint
+    lets an append-only ledger be re-ingested from the new rows only (the
+    previous processor itself is not modified).
+    `progress(percent, message)` is called along the way when given.
+    Raises OperationCancelled when cancel_token is cancelled.
+    """
+    def report(percent, message):
+        if progress:
+            progress(percent, message)
+
+    processor = BOSDataProcessor()
+
+    report(10, "Membaca file Excel...")
+    report(30, "Mengekstrak data RKAS...")
+    bku_checkpoint = previous.processor.bku_checkpoint if previous is not None else None
+    processor.extract_excel_data(file_path, cancel_token=cancel_token, bku_checkpoint=bku_checkpoint)
+
+    if processor.bku_data_available:
+        report(80, "Memproses data BKU...")
+    else:
+        report(80, "Menyelesaikan pemrosesan...")
+
+    # Format semua tabel sekarang, bukan saat tab diklik
+    report(95, "Mempersiapkan tampilan...")
+    view_models = ViewModelBuilder(processor).build()
+    if cancel_token is not None:
+        cancel_token.check()
+
+    report(100, "Selesai!")
+    return DataSnapshot(file_path, processor, view_models)
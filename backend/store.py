@@ -0,0 +1,341 @@
+"""
+Transaction store for SIKELAR application
+Optional SQLite database that keeps the extracted RKAS budget items and
+grouped BKU transactions of many schools and years in normalized, indexed
+tables. A stored school can be turned back into a BOSDataProcessor so all
+existing getters work on it, and district wide totals are answered with a
+single indexed query instead of re-parsing workbooks
+
+Usage:
+    python -m backend.store DB import FILE_OR_FOLDER [...] [--year YEAR]
+    python -m backend.store DB total KODE_REKENING [--triwulan N] [--year YEAR] [--per-school]
+"""
+
+import os
+import sqlite3
+import datetime
+import argparse
+from collections import Counter
+from contextlib import closing
+
+from .processor import BOSDataProcessor
+from .view_models import TRIWULAN_LIST, RKAS_CATEGORIES
+
+
+# Atribut list item RKAS per kategori, disimpan di kolom kategori
+RKAS_ITEM_ATTRIBUTES = tuple(attribute for attribute, _, _ in RKAS_CATEGORIES.values())
+
+# Atribut dict BKU per triwulan di BKUDataProcessor
+BKU_DATA_ATTRIBUTES = (
+    'bku_belanja_persediaan_data',
+    'bku_belanja_pemeliharaan_data',
+    'bku_belanja_perjalanan_data',
+    'bku_peralatan_data',
+    'bku_aset_tetap_data',
+    'bku_belanja_jasa_data'
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS schools (
+    id INTEGER PRIMARY KEY,
+    nama TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS loads (
+    id INTEGER PRIMARY KEY,
+    school_id INTEGER NOT NULL REFERENCES schools(id),
+    year INTEGER NOT NULL,
+    source_path TEXT,
+    total_penerimaan INTEGER NOT NULL,
+    bku_available INTEGER NOT NULL,
+    loaded_at TEXT NOT NULL,
+    UNIQUE (school_id, year)
+);
+CREATE TABLE IF NOT EXISTS budget_items (
+    load_id INTEGER NOT NULL REFERENCES loads(id) ON DELETE CASCADE,
+    kode TEXT NOT NULL,
+    uraian TEXT,
+    jumlah INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rkas_items (
+    load_id INTEGER NOT NULL REFERENCES loads(id) ON DELETE CASCADE,
+    kategori TEXT NOT NULL,
+    kode_rekening TEXT NOT NULL,
+    kode_kegiatan TEXT,
+    uraian TEXT,
+    jumlah INTEGER NOT NULL,
+    row_idx INTEGER
+);
+CREATE TABLE IF NOT EXISTS bku_items (
+    load_id INTEGER NOT NULL REFERENCES loads(id) ON DELETE CASCADE,
+    kategori TEXT NOT NULL,
+    triwulan INTEGER NOT NULL,
+    tanggal TEXT,
+    kode_rekening TEXT NOT NULL,
+    kode_kegiatan TEXT,
+    uraian TEXT,
+    jumlah INTEGER NOT NULL,
+    row_idx INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_loads_year ON loads (year);
+CREATE INDEX IF NOT EXISTS idx_budget_load ON budget_items (load_id);
+CREATE INDEX IF NOT EXISTS idx_rkas_load_kategori ON rkas_items (load_id, kategori);
+CREATE INDEX IF NOT EXISTS idx_rkas_kode_rekening ON rkas_items (kode_rekening);
+CREATE INDEX IF NOT EXISTS idx_rkas_kode_kegiatan ON rkas_items (kode_kegiatan);
+CREATE INDEX IF NOT EXISTS idx_bku_load_kategori ON bku_items (load_id, kategori, triwulan);
+CREATE INDEX IF NOT EXISTS idx_bku_kode_rekening ON bku_items (kode_rekening, triwulan, load_id, jumlah);
+CREATE INDEX IF NOT EXISTS idx_bku_kode_kegiatan ON bku_items (kode_kegiatan);
+CREATE INDEX IF NOT EXISTS idx_bku_tanggal ON bku_items (tanggal);
+"""
+
+
+def _triwulan_number(triwulan):
+    """'Triwulan 2' -> 2"""
+    return TRIWULAN_LIST.index(triwulan) + 1
+
+
+class UnknownYearError(ValueError):
+    """Raised when a load has no explicit year and none can be read from the BKU"""
+
+
+# Error yang berarti data tidak tersimpan, data hasil ekstraksi sendiri tetap valid
+STORE_ERRORS = (sqlite3.Error, OSError, UnknownYearError)
+
+
+def guess_year(processor):
+    """Most common year of the BKU transactions, None when there are none (e.g. RKAS only)"""
+    years = Counter()
+    for attribute in BKU_DATA_ATTRIBUTES:
+        for items in getattr(processor.bku_processor, attribute).values():
+            years.update(item['tanggal'].year for item in items if item.get('tanggal'))
+    if years:
+        return years.most_common(1)[0][0]
+    return None
+
+
+class TransactionStore:
+    """
+    SQLite store of extracted schools, one load per (school, year).
+
+    A new connection is opened per call so the store can be used from any
+    thread (background jobs, worker processes).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def save_processor(self, processor, year=None, source_path=None, analyze=True):
+        """
+        Store a loaded processor, replacing an earlier load of the same
+        school and year. All rows go in with executemany in one transaction.
+        Pass analyze=False when importing many schools and call analyze()
+        once at the end. Returns the load id.
+        Raises UnknownYearError when year is not given and cannot be guessed,
+        a load filed under a wrong year would replace another load.
+        """
+        year = year or guess_year(processor)
+        if year is None:
+            raise UnknownYearError(
+                f"Tahun anggaran {processor.nama_sekolah} tidak diketahui (tidak ada tanggal BKU), "
+                "tahun harus ditentukan secara eksplisit")
+        rkas = processor.rkas_processor
+        bku = processor.bku_processor
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR IGNORE INTO schools (nama) VALUES (?)", (processor.nama_sekolah,))
+            school_id = conn.execute("SELECT id FROM schools WHERE nama = ?",
+                                     (processor.nama_sekolah,)).fetchone()[0]
+            conn.execute("DELETE FROM loads WHERE school_id = ? AND year = ?", (school_id, year))
+            load_id = conn.execute(
+                "INSERT INTO loads (school_id, year, source_path, total_penerimaan, bku_available, loaded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (school_id, year, source_path, rkas.total_penerimaan, int(bku.bku_data_available),
+                 datetime.datetime.now().isoformat(timespec='seconds'))
+            ).lastrowid
+
+            conn.executemany(
+                "INSERT INTO budget_items (load_id, kode, uraian, jumlah) VALUES (?, ?, ?, ?)",
+                ((load_id, item['kode'], item['uraian'], item['jumlah']) for item in rkas.budget_items)
+            )
+            conn.executemany(
+                "INSERT INTO rkas_items (load_id, kategori, kode_rekening, kode_kegiatan, uraian, jumlah, row_idx) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((load_id, attribute, item['kode_rekening'], item['kode_kegiatan'], item['uraian'],
+                  item['jumlah'], item.get('row'))
+                 for attribute in RKAS_ITEM_ATTRIBUTES for item in getattr(rkas, attribute))
+            )
+            conn.executemany(
+                "INSERT INTO bku_items (load_id, kategori, triwulan, tanggal, kode_rekening, kode_kegiatan, "
+                "uraian, jumlah, row_idx) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((load_id, attribute, _triwulan_number(triwulan),
+                  item['tanggal'].isoformat() if item.get('tanggal') else None,
+                  item['kode_rekening'], item['kode_kegiatan'], item['uraian'], item['jumlah'], item.get('row'))
+                 for attribute in BKU_DATA_ATTRIBUTES
+                 for triwulan, items in getattr(bku, attribute).items()
+                 for item in items)
+            )
+        if analyze:
+            self.analyze()
+        return load_id
+
+    def analyze(self):
+        """Refresh planner statistics so kode rekening queries use the covering index"""
+        with closing(self._connect()) as conn:
+            conn.execute("ANALYZE")
+
+    def schools(self, year=None):
+        """List of (school name, year) stored, optionally for one year"""
+        query = "SELECT s.nama, l.year FROM loads l JOIN schools s ON s.id = l.school_id"
+        params = ()
+        if year is not None:
+            query += " WHERE l.year = ?"
+            params = (year,)
+        with closing(self._connect()) as conn:
+            return conn.execute(query + " ORDER BY s.nama, l.year", params).fetchall()
+
+    def load_processor(self, school, year):
+        """
+        Rebuild a BOSDataProcessor for (school, year) from the store so the
+        existing RKAS and BKU getters answer from it. None when not stored.
+        """
+        with closing(self._connect()) as conn:
+            load = conn.execute(
+                "SELECT l.id, l.total_penerimaan, l.bku_available FROM loads l "
+                "JOIN schools s ON s.id = l.school_id WHERE s.nama = ? AND l.year = ?",
+                (school, year)
+            ).fetchone()
+            if load is None:
+                return None
+            load_id, total_penerimaan, bku_available = load
+
+            processor = BOSDataProcessor()
+            rkas = processor.rkas_processor
+            bku = processor.bku_processor
+
+            rkas.nama_sekolah = school
+            rkas.total_penerimaan = total_penerimaan
+            rkas.budget_items = [
+                {'kode': kode, 'uraian': uraian, 'jumlah': jumlah}
+                for kode, uraian, jumlah in conn.execute(
+                    "SELECT kode, uraian, jumlah FROM budget_items WHERE load_id = ? ORDER BY rowid", (load_id,))
+            ]
+            for kategori, kode_rekening, kode_kegiatan, uraian, jumlah, row_idx in conn.execute(
+                    "SELECT kategori, kode_rekening, kode_kegiatan, uraian, jumlah, row_idx "
+                    "FROM rkas_items WHERE load_id = ? ORDER BY rowid", (load_id,)):
+                getattr(rkas, kategori).append({
+                    'kode_rekening': kode_rekening,
+                    'kode_kegiatan': kode_kegiatan,
+                    'uraian': uraian,
+                    'jumlah': jumlah,
+                    'row': row_idx
+                })
+            rkas.is_loaded = True
+
+            for kategori, triwulan, tanggal, kode_rekening, kode_kegiatan, uraian, jumlah, row_idx in conn.execute(
+                    "SELECT kategori, triwulan, tanggal, kode_rekening, kode_kegiatan, uraian, jumlah, row_idx "
+                    "FROM bku_items WHERE load_id = ? ORDER BY rowid", (load_id,)):
+                getattr(bku, kategori)[TRIWULAN_LIST[triwulan - 1]].append({
+                    'tanggal': datetime.date.fromisoformat(tanggal) if tanggal else None,
+                    'kode_rekening': kode_rekening,
+                    'kode_kegiatan': kode_kegiatan,
+                    'uraian': uraian,
+                    'jumlah': jumlah,
+                    'row': row_idx
+                })
+            bku.bku_data_available = bool(bku_available)
+        return processor
+
+    def _realisasi_filter(self, kode_rekening, triwulan, year, school):
+        """WHERE clause and params for realisasi queries"""
+        # GLOB prefix bisa memakai index kode_rekening (LIKE tidak, karena case-insensitive)
+        clauses = ["b.kode_rekening GLOB ?"]
+        params = [kode_rekening.replace('[', '[[]') + '*']
+        if triwulan is not None:
+            clauses.append("b.triwulan = ?")
+            params.append(triwulan if isinstance(triwulan, int) else _triwulan_number(triwulan))
+        if year is not None:
+            clauses.append("l.year = ?")
+            params.append(year)
+        if school is not None:
+            clauses.append("s.nama = ?")
+            params.append(school)
+        return " AND ".join(clauses), params
+
+    def total_realisasi(self, kode_rekening, triwulan=None, year=None, school=None):
+        """
+        Total BKU realisasi of kode rekening starting with `kode_rekening`
+        (e.g. '5.1.02.03'), optionally for one triwulan (1-4 or 'Triwulan 2'),
+        year and school.
+        """
+        where, params = self._realisasi_filter(kode_rekening, triwulan, year, school)
+        with closing(self._connect()) as conn:
+            total = conn.execute(
+                "SELECT SUM(b.jumlah) FROM bku_items b JOIN loads l ON l.id = b.load_id "
+                "JOIN schools s ON s.id = l.school_id WHERE " + where, params
+            ).fetchone()[0]
+        return total or 0
+
+    def realisasi_by_school(self, kode_rekening, triwulan=None, year=None):
+        """Same as total_realisasi but per (school, year), largest first"""
+        where, params = self._realisasi_filter(kode_rekening, triwulan, year, None)
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT s.nama, l.year, SUM(b.jumlah) AS total FROM bku_items b "
+                "JOIN loads l ON l.id = b.load_id JOIN schools s ON s.id = l.school_id "
+                "WHERE " + where + " GROUP BY l.id ORDER BY total DESC", params
+            ).fetchall()
+
+
+def main(argv=None):
+    """Command line entry point"""
+    from .bulk_report import collect_workbooks
+    from .utils import FormatUtils
+
+    parser = argparse.ArgumentParser(description="Simpan dan kueri data RKAS/BKU banyak sekolah")
+    parser.add_argument('db', help="File database SQLite")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help="Ekstrak file Excel dan simpan ke database")
+    import_parser.add_argument('inputs', nargs='+', help="File Excel (.xlsx) atau folder berisi file Excel")
+    import_parser.add_argument('--year', type=int, help="Tahun anggaran (default: dari tanggal BKU)")
+
+    total_parser = commands.add_parser('total', help="Total realisasi BKU per kode rekening")
+    total_parser.add_argument('kode_rekening', help="Awalan kode rekening, mis. 5.1.02.03")
+    total_parser.add_argument('--triwulan', type=int, choices=range(1, 5))
+    total_parser.add_argument('--year', type=int)
+    total_parser.add_argument('--per-school', action='store_true', help="Tampilkan per sekolah")
+
+    args = parser.parse_args(argv)
+    store = TransactionStore(args.db)
+
+    if args.command == 'import':
+        for path in collect_workbooks(args.inputs):
+            try:
+                processor = BOSDataProcessor()
+                processor.extract_excel_data(path)
+                store.save_processor(processor, year=args.year, source_path=os.path.abspath(path),
+                                     analyze=False)
+                print(f"Disimpan: {processor.nama_sekolah} ({os.path.basename(path)})")
+            except Exception as e:
+                print(f"GAGAL - {os.path.basename(path)}: {e}")
+        store.analyze()
+        return 0
+
+    if args.per_school:
+        for nama, year, total in store.realisasi_by_school(args.kode_rekening, args.triwulan, args.year):
+            print(f"{nama} ({year}): {FormatUtils.format_currency(total)}")
+    total = store.total_realisasi(args.kode_rekening, args.triwulan, args.year)
+    print(f"Total realisasi {args.kode_rekening}: {FormatUtils.format_currency(total)}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
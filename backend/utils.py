@@ -8,6 +8,9 @@ import os
 import colorsys
 from datetime import datetime
 
+from .formatting import format_currency as _cached_format_currency
+from .rupiah import parse_rupiah, to_rupiah
+
 
 class ExcelUtils:
     """Utility class for Excel data extraction operations"""
@@ -71,7 +74,7 @@ class ExcelUtils:
         for col_idx in col_range:
             cell_value = sheet.cell(row=row_idx, column=col_idx).value
             if isinstance(cell_value, (int, float)) and cell_value > 0:
-                return int(cell_value)
+                return to_rupiah(cell_value)
         
         # Jika tidak ditemukan di baris yang sama, coba baris sebelum/sesudah
         for offset in [-1, 1, -2, 2]:
@@ -79,7 +82,7 @@ class ExcelUtils:
                 for col_idx in col_range:
                     cell_value = sheet.cell(row=row_idx + offset, column=col_idx).value
                     if isinstance(cell_value, (int, float)) and cell_value > 0:
-                        return int(cell_value)
+                        return to_rupiah(cell_value)
         
         return 0
 
@@ -120,7 +123,7 @@ class ExcelUtils:
         for col_idx in col_range:
             cell_value = sheet.cell(row=row_idx, column=col_idx).value
             if isinstance(cell_value, (int, float)) and cell_value > 0:
-                return int(cell_value)
+                return to_rupiah(cell_value)
         
         # Jika tidak ditemukan, coba baris sekitar (untuk merged cells)
         for offset in [-1, 1, -2, 2, -3, 3]:
@@ -129,7 +132,7 @@ class ExcelUtils:
                     try:
                         cell_value = sheet.cell(row=row_idx + offset, column=col_idx).value
                         if isinstance(cell_value, (int, float)) and cell_value > 0:
-                            return int(cell_value)
+                            return to_rupiah(cell_value)
                     except:
                         continue
         
@@ -202,30 +205,13 @@ class FormatUtils:
     
     @staticmethod
     def clean_number(num_str):
-        """Membersihkan format angka dari string"""
-        if not num_str:
-            return 0
-        
-        cleaned = str(num_str).replace('Rp', '').replace(' ', '').strip()
-        
-        if ',' in cleaned:
-            parts = cleaned.split(',')
-            integer_part = parts[0]
-            decimal_part = parts[1] if len(parts) > 1 else '0'
-            integer_part = integer_part.replace('.', '')
-            cleaned = integer_part + '.' + decimal_part
-        else:
-            cleaned = cleaned.replace('.', '')
-        
-        try:
-            return float(cleaned)
-        except ValueError:
-            return 0
+        """Membersihkan format angka dari string, hasil rupiah bulat (int, lihat rupiah.py)"""
+        return parse_rupiah(num_str)
     
     @staticmethod
     def format_currency(amount):
-        """Format number as Indonesian currency"""
-        return f"Rp {amount:,.0f}".replace(',', '.')
+        """Format number as Indonesian currency (memoized, see formatting.py)"""
+        return _cached_format_currency(amount)
     
     @staticmethod
     def darken_color(hex_color, factor=0.65):
@@ -470,7 +456,7 @@ if __name__ == "__main__":
     print(FormatUtils.format_currency(1500000))  # Rp 1.500.000
     
     # Test clean number
-    print(FormatUtils.clean_number("Rp 1.500.000"))  # 1500000.0
+    print(FormatUtils.clean_number("Rp 1.500.000"))  # 1500000
     
     # Test validate kode format
     print(ValidationUtils.validate_kode_format("05.02.01"))  # True
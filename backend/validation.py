@@ -0,0 +1,192 @@
+"""
+Validation engine for SIKELAR application
+Evaluates the juknis percentage rules (BUKU, SARANA & PRASARANA, HONOR)
+for a whole batch of parsed schools using column-wise operations
+"""
+
+from array import array
+from collections import namedtuple
+
+from .rupiah import to_rupiah, to_rupiah_column
+
+
+# Kode anggaran per kategori pengesahan
+BUKU_CODES = ('05.02.01', '05.02.02', '05.02.03', '05.02.04', '05.02.05')
+SARANA_CODES = ('05.08.01', '05.08.08', '05.08.12')
+HONOR_CODES = ('07.12',)
+
+# Aturan juknis: 'min' berarti persentase minimal, 'max' berarti persentase maksimal.
+# Batas honor bergantung pada jenis sekolah (negeri / swasta).
+VALIDATION_RULES = {
+    'buku': {
+        'name': 'BUKU',
+        'codes': BUKU_CODES,
+        'kind': 'min',
+        'limit': 10.0
+    },
+    'sarana': {
+        'name': 'SARANA & PRASARANA',
+        'codes': SARANA_CODES,
+        'kind': 'max',
+        'limit': 20.0
+    },
+    'honor': {
+        'name': 'HONOR',
+        'codes': HONOR_CODES,
+        'kind': 'max',
+        'limit_by_school_type': {'negeri': 20.0, 'swasta': 40.0}
+    }
+}
+
+SCHOOL_TYPE_NAMES = {
+    'negeri': 'Sekolah Negeri',
+    'swasta': 'Sekolah Swasta'
+}
+
+# Satu baris tabel pelanggaran
+Violation = namedtuple('Violation', ['school_index', 'school_name', 'category', 'percentage', 'limit'])
+
+
+class PengesahanValidator:
+    """
+    Evaluate every pengesahan rule for many schools at once.
+
+    Each school is a dict shaped like the result of BOSDataProcessor.process_data
+    ('processed_data', 'total_budget', 'school_name'), optionally with a
+    'school_type' key ('negeri' / 'swasta') for the honor cap.
+    """
+
+    def __init__(self, rules=None):
+        self.rules = rules or VALIDATION_RULES
+        self.categories = tuple(self.rules.keys())
+
+        # Lookup kode -> kategori supaya setiap sekolah cukup dipindai sekali
+        self.code_category = {}
+        for category, rule in self.rules.items():
+            for kode in rule['codes']:
+                self.code_category[kode] = category
+
+    @staticmethod
+    def school_record(processor, school_type=None):
+        """Build a school record from a processor that already ran process_data"""
+        return {
+            'school_name': processor.school_name,
+            'processed_data': processor.processed_data,
+            'total_budget': processor.total_budget,
+            'school_type': school_type
+        }
+
+    def get_limit(self, category, school_type=None):
+        """Get percentage limit for a category, None if it cannot be determined"""
+        rule = self.rules.get(category)
+        if not rule:
+            return None
+        if 'limit_by_school_type' in rule:
+            return rule['limit_by_school_type'].get(school_type)
+        return rule['limit']
+
+    def get_category_name(self, category, school_type=None):
+        """Get display name for a category (honor includes the school type)"""
+        rule = self.rules.get(category)
+        if not rule:
+            return ""
+        if 'limit_by_school_type' in rule and school_type in SCHOOL_TYPE_NAMES:
+            return f"{rule['name']} ({SCHOOL_TYPE_NAMES[school_type]})"
+        return rule['name']
+
+    def is_compliant(self, category, percentage, school_type=None):
+        """Check a single percentage against its rule"""
+        limit = self.get_limit(category, school_type)
+        if limit is None:
+            return True
+        if self.rules[category]['kind'] == 'min':
+            return percentage >= limit
+        return percentage <= limit
+
+    def build_columns(self, schools):
+        """Collect per-category totals and budgets into parallel columns"""
+        columns = {
+            'school_name': [],
+            'school_type': [],
+            'total_budget': []
+        }
+        totals = {category: array('q') for category in self.categories}
+
+        for school in schools:
+            # Rupiah bulat, jadi total per kategori eksak
+            sums = dict.fromkeys(self.categories, 0)
+            for kode, data in school.get('processed_data', {}).items():
+                category = self.code_category.get(kode)
+                if category:
+                    sums[category] += to_rupiah(data['jumlah'])
+
+            columns['school_name'].append(school.get('school_name', ''))
+            columns['school_type'].append(school.get('school_type'))
+            columns['total_budget'].append(school.get('total_budget') or 0)
+            for category in self.categories:
+                totals[category].append(sums[category])
+
+        columns['total_budget'] = to_rupiah_column(columns['total_budget'])
+        columns['totals'] = totals
+        return columns
+
+    def compute_percentages(self, columns):
+        """Compute the percentage column of every category"""
+        budgets = columns['total_budget']
+        percentages = {}
+        for category, totals in columns['totals'].items():
+            percentages[category] = array('d', [
+                (total / budget) * 100 if budget > 0 else 0.0
+                for total, budget in zip(totals, budgets)
+            ])
+        return percentages
+
+    def compute_limits(self, columns):
+        """Compute the limit column of every category (NaN when not applicable)"""
+        school_types = columns['school_type']
+        limits = {}
+        for category, rule in self.rules.items():
+            if 'limit_by_school_type' in rule:
+                by_type = rule['limit_by_school_type']
+                limits[category] = array('d', [by_type.get(school_type, float('nan'))
+                                               for school_type in school_types])
+            else:
+                limits[category] = array('d', [rule['limit']]) * len(school_types)
+        return limits
+
+    def validate(self, schools):
+        """
+        Evaluate all rules for all schools.
+        Returns (percentages, violations) where percentages maps category to a
+        column of percentages and violations is a compact list of Violation rows.
+        """
+        columns = self.build_columns(schools)
+        percentages = self.compute_percentages(columns)
+        limits = self.compute_limits(columns)
+        names = columns['school_name']
+
+        violations = []
+        for category in self.categories:
+            kind = self.rules[category]['kind']
+            category_percentages = percentages[category]
+            category_limits = limits[category]
+
+            # NaN limit (jenis sekolah belum dipilih) tidak pernah melanggar
+            if kind == 'min':
+                failed = [i for i, (pct, limit) in enumerate(zip(category_percentages, category_limits))
+                          if pct < limit]
+            else:
+                failed = [i for i, (pct, limit) in enumerate(zip(category_percentages, category_limits))
+                          if pct > limit]
+
+            for i in failed:
+                violations.append(Violation(i, names[i], category,
+                                            category_percentages[i], category_limits[i]))
+
+        violations.sort(key=lambda row: (row.school_index, self.categories.index(row.category)))
+        return percentages, violations
+
+    def validate_school(self, school):
+        """Evaluate all rules for a single school, returns {category: percentage}"""
+        percentages, _ = self.validate([school])
+        return {category: column[0] for category, column in percentages.items()}
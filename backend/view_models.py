@@ -0,0 +1,285 @@
+"""
+View model builder for SIKELAR application
+Precomputes the formatted rows, totals and labels of every RKAS / BKU panel
+so the GUI only has to bind them
+"""
+
+from collections import namedtuple
+from types import MappingProxyType
+
+from .formatting import format_currency, format_date, format_currency_column, format_date_column
+
+
+TRIWULAN_LIST = ('Triwulan 1', 'Triwulan 2', 'Triwulan 3', 'Triwulan 4')
+
+PERIODE_TEXT = {
+    'Triwulan 1': 'Jan-Mar',
+    'Triwulan 2': 'Jan-Jun',
+    'Triwulan 3': 'Jan-Sep',
+    'Triwulan 4': 'Jan-Des'
+}
+
+def sisa_dana_sampai_saat_ini(total_pagu_rkas, total_realisasi):
+    """
+    Sisa dana terhadap 50% pagu. Setengah pagu dihitung persis (tanpa
+    pembulatan, pagu ganjil menjadi x.5); pembulatan hanya saat ditampilkan
+    """
+    return total_pagu_rkas / 2 - total_realisasi
+
+
+# Kategori tab -> (atribut item RKAS, judul tabel, label total)
+RKAS_CATEGORIES = {
+    'Belanja Persediaan': ('belanja_persediaan_items', "Rincian Belanja Persediaan (5.1.02.01)", "Total Belanja Persediaan"),
+    'Belanja Jasa': ('belanja_jasa_items', "Rincian Belanja Jasa (5.1.02.02)", "Total Belanja Jasa (RKAS)"),
+    'Pemeliharaan': ('belanja_pemeliharaan_items', "Rincian Belanja Pemeliharaan (5.1.02.03)", "Total Belanja Pemeliharaan"),
+    'Perjalanan Dinas': ('belanja_perjalanan_items', "Rincian Perjalanan Dinas (5.1.02.04)", "Total Belanja Perjalanan Dinas"),
+    'Peralatan': ('peralatan_items', "Rincian Peralatan dan Mesin (5.2.02 & 5.2.04)", "Total Peralatan"),
+    'Aset Tetap': ('aset_tetap_items', "Rincian Aset Tetap Lainnya (5.2.05)", "Total Aset Tetap Lainnya")
+}
+
+# Kategori tab -> (getter BKU per triwulan, judul tabel)
+BKU_CATEGORIES = {
+    'Belanja Persediaan': ('get_bku_belanja_persediaan_by_triwulan', "Realisasi Belanja Persediaan (5.1.02.01)"),
+    'Belanja Jasa': ('get_bku_belanja_jasa_by_triwulan', "Realisasi Belanja Jasa (5.1.02.02)"),
+    'Pemeliharaan': ('get_bku_belanja_pemeliharaan_by_triwulan', "Realisasi Belanja Pemeliharaan (5.1.02.03)"),
+    'Perjalanan Dinas': ('get_bku_belanja_perjalanan_by_triwulan', "Realisasi Belanja Perjalanan Dinas (5.1.02.04)"),
+    'Peralatan': ('get_bku_peralatan_by_triwulan', "Realisasi Peralatan dan Mesin (5.2.02 & 5.2.04)"),
+    'Aset Tetap': ('get_bku_aset_tetap_by_triwulan', "Realisasi Aset Tetap Lainnya (5.2.05)")
+}
+
+# Tag baris berdasarkan style baris ringkasan
+BKU_SUMMARY_ROW_TAGS = {
+    True: ('highlight',),
+    'green': ('green_highlight',),
+    'blue': ('blue_highlight',),
+    'purple': ('purple_highlight',),
+    'orange': ('orange_highlight',)
+}
+LAPORAN_ROW_TAGS = {
+    True: ('category',),
+    'total': ('total_highlight',)
+}
+
+TOTAL_COLOR = '#27ae60'
+
+# Satu panel tabel siap tampil: rows berisi tuple nilai terformat, tags sejajar
+# dengan rows (atau None), totals berisi pasangan (teks, warna)
+TableViewModel = namedtuple('TableViewModel', ['title', 'rows', 'tags', 'totals', 'school'])
+
+# Seluruh view model hasil satu upload
+ViewModels = namedtuple('ViewModels', ['rkas', 'rkas_ringkasan', 'bku', 'bku_ringkasan', 'laporan_keuangan'])
+
+
+def format_rkas_row(item):
+    """Format one RKAS item into table values"""
+    return (
+        item['kode_rekening'],
+        item['kode_kegiatan'],
+        item['uraian'],
+        format_currency(item['jumlah'])
+    )
+
+
+def format_bku_row(item):
+    """Format one BKU item into table values"""
+    return (
+        format_date(item['tanggal']),
+        item['kode_rekening'],
+        item['kode_kegiatan'],
+        item['uraian'],
+        format_currency(item['jumlah'])
+    )
+
+
+def format_rkas_rows(items):
+    """Format RKAS items into table values, amounts formatted per column"""
+    jumlah = format_currency_column([item['jumlah'] for item in items])
+    return tuple((item['kode_rekening'], item['kode_kegiatan'], item['uraian'], text)
+                 for item, text in zip(items, jumlah))
+
+
+def format_bku_rows(items):
+    """Format BKU items into table values, dates and amounts formatted per column"""
+    tanggal = format_date_column([item['tanggal'] for item in items])
+    jumlah = format_currency_column([item['jumlah'] for item in items])
+    return tuple((date_text, item['kode_rekening'], item['kode_kegiatan'], item['uraian'], amount_text)
+                 for item, date_text, amount_text in zip(items, tanggal, jumlah))
+
+
+def format_summary_row(row):
+    """Format one (kategori, jumlah, style) summary row into table values"""
+    kategori, jumlah = row[0], row[1]
+    # Separator kosong dan persentase sudah berupa string
+    if isinstance(jumlah, str):
+        return (kategori, jumlah)
+    return (kategori, format_currency(jumlah))
+
+
+class ViewModelBuilder:
+    """
+    Build immutable view models for every (category, triwulan) pair plus the
+    ringkasan and laporan keuangan panels from a loaded BOSDataProcessor.
+    Meant to run off the Tk thread right after an upload.
+    """
+
+    def __init__(self, processor):
+        self.processor = processor
+        self.school = f"SEKOLAH {processor.nama_sekolah}"
+
+    def build(self):
+        """Build all view models"""
+        rkas = {category: self.build_rkas_category(category) for category in RKAS_CATEGORIES}
+
+        bku = {}
+        bku_ringkasan = {}
+        laporan_keuangan = {}
+        if self.processor.bku_data_available:
+            summaries = {triwulan: self.processor.get_bku_summary_data_by_triwulan(triwulan)
+                         for triwulan in TRIWULAN_LIST}
+            for category in BKU_CATEGORIES:
+                for triwulan in TRIWULAN_LIST:
+                    bku[(category, triwulan)] = self.build_bku_category(category, triwulan)
+            for triwulan in TRIWULAN_LIST:
+                bku_ringkasan[triwulan] = self.build_bku_ringkasan(triwulan, summaries)
+                laporan_keuangan[triwulan] = self.build_laporan_keuangan(triwulan)
+
+        return ViewModels(
+            rkas=MappingProxyType(rkas),
+            rkas_ringkasan=self.build_rkas_ringkasan(),
+            bku=MappingProxyType(bku),
+            bku_ringkasan=MappingProxyType(bku_ringkasan),
+            laporan_keuangan=MappingProxyType(laporan_keuangan)
+        )
+
+    def build_rkas_category(self, category):
+        """RKAS detail panel for a category, None if the category has no items"""
+        attribute, title, total_label = RKAS_CATEGORIES[category]
+        items = getattr(self.processor, attribute)
+        if not items:
+            return None
+
+        rows = format_rkas_rows(items)
+        total = sum(item['jumlah'] for item in items)
+
+        if category == 'Belanja Jasa':
+            # Extended summary dengan breakdown honor - HANYA UNTUK JASA
+            honor_items = self.processor.filter_budget_by_codes(self.processor.kategori_kode['honor'])
+            total_honor = sum(item['jumlah'] for item in honor_items)
+            totals = (
+                (f"{total_label}: {format_currency(total)}", None),
+                (f"Pembayaran Honor (RKAS): {format_currency(total_honor)}", None),
+                (f"Jasa Sesungguhnya (RKAS): {format_currency(total - total_honor)}", TOTAL_COLOR)
+            )
+        else:
+            totals = ((f"{total_label}: {format_currency(total)}", TOTAL_COLOR),)
+
+        return TableViewModel(title, rows, None, totals, self.school)
+
+    def build_rkas_ringkasan(self):
+        """RKAS ringkasan anggaran panel"""
+        summary_data = self.processor.get_summary_data()
+        ringkasan_data = (
+            ("PAGU TAHUN 2025", self.processor.total_penerimaan, True),
+            ("BELANJA OPERASI", summary_data['total_belanja_operasi'], True),
+            ("  BELANJA HONOR", summary_data['total_honor'], False),
+            ("  BELANJA JASA", summary_data['jasa_sesungguhnya'], False),
+            ("  BELANJA PEMELIHARAAN", summary_data['total_pemeliharaan'], False),
+            ("  BELANJA PERJALANAN", summary_data['total_perjalanan'], False),
+            ("  BELANJA PERSEDIAAN", summary_data['belanja_persediaan_ringkasan'], False),
+            ("BELANJA MODAL", summary_data['belanja_modal'], True),
+            ("  PERALATAN DAN MESIN", summary_data['total_peralatan'], False),
+            ("  ASET TETAP LAINNYA", summary_data['total_aset_tetap'], False),
+            ("TOTAL ANGGARAN", summary_data['total_anggaran'], True)
+        )
+        return TableViewModel(
+            "Ringkasan Anggaran",
+            tuple(format_summary_row(row) for row in ringkasan_data),
+            tuple(('highlight',) if row[2] else () for row in ringkasan_data),
+            (),
+            self.school
+        )
+
+    def build_bku_category(self, category, triwulan):
+        """BKU realisasi panel for a category and triwulan, None if there is no data"""
+        getter, title = BKU_CATEGORIES[category]
+        items = getattr(self.processor, getter)(triwulan)
+        if not items:
+            return None
+
+        rows = format_bku_rows(items)
+        total_realisasi = sum(item['jumlah'] for item in items)
+
+        if category == 'Belanja Jasa':
+            # Honor berdasarkan kode kegiatan yang dimulai dengan 07.12 - KHUSUS JASA
+            total_honor = sum(item['jumlah'] for item in items if item['kode_kegiatan'].startswith('07.12'))
+            totals = (
+                (f"Total Realisasi {triwulan}: {format_currency(total_realisasi)}", None),
+                (f"Pembayaran Honor (Realisasi): {format_currency(total_honor)}", None),
+                (f"Jasa Sesungguhnya (Realisasi): {format_currency(total_realisasi - total_honor)}", TOTAL_COLOR)
+            )
+        else:
+            totals = ((f"Total Realisasi {triwulan}: {format_currency(total_realisasi)}", TOTAL_COLOR),)
+
+        return TableViewModel(f"{title} - {triwulan}", rows, None, totals, self.school)
+
+    def build_bku_ringkasan(self, triwulan, summaries):
+        """BKU ringkasan realisasi panel for a triwulan, None if there is no realisasi"""
+        summary_data = summaries[triwulan]
+        if not summary_data or summary_data.get('total_realisasi', 0) == 0:
+            return None
+
+        # Total realisasi dari TW1 sampai triwulan ini
+        current_index = TRIWULAN_LIST.index(triwulan)
+        total_realisasi_sampai_saat_ini = sum(summaries[tw]['total_realisasi']
+                                              for tw in TRIWULAN_LIST[:current_index + 1])
+        total_pagu_rkas = self.processor.total_penerimaan
+        total_sisa_dana_1_tahun = total_pagu_rkas - total_realisasi_sampai_saat_ini
+        total_sisa_dana_sampai_saat_ini = sisa_dana_sampai_saat_ini(total_pagu_rkas, total_realisasi_sampai_saat_ini)
+        persentase_realisasi = (total_realisasi_sampai_saat_ini / total_pagu_rkas * 100) if total_pagu_rkas > 0 else 0
+
+        ringkasan_data = (
+            ("BELANJA OPERASI", summary_data['total_belanja_operasi_bku'], True),
+            ("  BELANJA HONOR", summary_data['total_honor_bku'], False),
+            ("  BELANJA JASA", summary_data['jasa_sesungguhnya_bku'], False),
+            ("  BELANJA PEMELIHARAAN", summary_data['total_pemeliharaan_bku'], False),
+            ("  BELANJA PERJALANAN", summary_data['total_perjalanan_bku'], False),
+            ("  BELANJA PERSEDIAAN", summary_data['total_persediaan_bku'], False),
+            ("BELANJA MODAL", summary_data['belanja_modal_bku'], True),
+            ("  PERALATAN DAN MESIN", summary_data['total_peralatan_bku'], False),
+            ("  ASET TETAP LAINNYA", summary_data['total_aset_tetap_bku'], False),
+            ("TOTAL REALISASI", summary_data['total_realisasi'], True),
+            ("", "", False),  # Empty row as separator
+            (f"TOTAL REALISASI SAMPAI SAAT INI ({PERIODE_TEXT[triwulan]})", total_realisasi_sampai_saat_ini, "green"),
+            ("TOTAL SISA DANA BOSP REGULER (1 TAHUN)", total_sisa_dana_1_tahun, "blue"),
+            ("TOTAL SISA DANA BOSP REGULER SAMPAI SAAT INI (50%)", total_sisa_dana_sampai_saat_ini, "purple"),
+            ("PERSENTASE REALISASI DANA BOSP SAMPAI SAAT INI", f"{persentase_realisasi:.2f}%", "orange")
+        )
+        return TableViewModel(
+            f"Ringkasan Realisasi BKU - {triwulan}",
+            tuple(format_summary_row(row) for row in ringkasan_data),
+            tuple(BKU_SUMMARY_ROW_TAGS.get(row[2], ()) for row in ringkasan_data),
+            (),
+            self.school
+        )
+
+    def build_laporan_keuangan(self, triwulan):
+        """Laporan keuangan panel sampai triwulan, None if there is no realisasi"""
+        laporan_data = self.processor.get_laporan_keuangan_data_by_triwulan(triwulan)
+        if not laporan_data or laporan_data.get('grand_total', 0) == 0:
+            return None
+
+        laporan_items = (
+            ("PAKAI HABIS", laporan_data['total_belanja_persediaan'], True),
+            ("BARANG DAN JASA", laporan_data['total_barang_dan_jasa'], True),
+            ("PERALATAN DAN MESIN", laporan_data['total_peralatan_mesin'], True),
+            ("ASET TETAP LAINNYA", laporan_data['total_aset_tetap'], True),
+            ("", "", False),  # Separator
+            ("TOTAL REALISASI", laporan_data['grand_total'], "total")
+        )
+        return TableViewModel(
+            "Laporan Keuangan Realisasi",
+            tuple(format_summary_row(row) for row in laporan_items),
+            tuple(LAPORAN_ROW_TAGS.get(row[2], ()) for row in laporan_items),
+            (),
+            self.school
+        )
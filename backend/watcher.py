@@ -0,0 +1,299 @@
+"""
+Watched-folder auto-ingest for SIKELAR application
+Headless mode for the district office: polls a shared folder for new or
+changed school workbooks, extracts each one in a bounded process pool and
+saves the result to the SQLite transaction store. Files are deduplicated
+by content hash and a JSON status file records what happened to every
+file, so a restart does not re-process unchanged workbooks
+
+Usage:
+    python -m backend.watcher FOLDER --db DB [--status FILE] [--workers N] [--interval SEC] [--year YEAR] [--once]
+"""
+
+import os
+import json
+import time
+import hashlib
+import argparse
+import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from .processor import BOSDataProcessor
+from .store import TransactionStore, guess_year
+
+
+# Detik antar scan folder
+DEFAULT_POLL_INTERVAL = 5.0
+# File yang baru diubah kurang dari ini (detik) dianggap masih disalin
+DEFAULT_SETTLE_SECONDS = 2.0
+HASH_CHUNK_SIZE = 1024 * 1024
+
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+STATUS_DUPLICATE = 'duplicate'
+STATUS_QUEUED = 'queued'
+STATUS_SKIPPED = 'skipped'
+
+SKIP_UNKNOWN_YEAR = "Tahun anggaran tidak diketahui (tidak ada tanggal BKU), jalankan dengan --year"
+
+# Store dan tahun default per proses worker, dibuat sekali oleh _init_worker
+_worker_store = None
+_worker_default_year = None
+
+
+def _init_worker(store_path, default_year=None):
+    """Process pool initializer: open the store (and create its schema) once per worker"""
+    global _worker_store, _worker_default_year
+    _worker_store = TransactionStore(store_path)
+    _worker_default_year = default_year
+
+
+def ingest_workbook(file_path):
+    """
+    Extract one workbook and save it to the worker's store (runs in a worker).
+    The year comes from the BKU dates, else the watcher's default year; a
+    workbook without either is not stored and comes back with 'skipped'.
+    """
+    processor = BOSDataProcessor()
+    processor.extract_excel_data(file_path)
+    year = guess_year(processor) or _worker_default_year
+    result = {'school': processor.nama_sekolah, 'year': year,
+              'bku_available': processor.bku_data_available, 'skipped': None}
+    if year is None:
+        result['skipped'] = SKIP_UNKNOWN_YEAR
+        return result
+    _worker_store.save_processor(processor, year=year, source_path=file_path, analyze=False)
+    return result
+
+
+def content_hash(file_path):
+    """SHA-256 of the file content"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _now():
+    return datetime.datetime.now().isoformat(timespec='seconds')
+
+
+class FolderWatcher:
+    """
+    Poll `folder` for .xlsx files and ingest them into the store at `store_path`.
+
+    A file is looked at again only when its size or mtime changed; it is then
+    hashed and skipped when the same content was already ingested (under any
+    name). At most `max_workers` files are extracted at the same time, the
+    rest wait in a queue. `status` (path -> dict) is written to status_path
+    after every poll that changed something. `default_year` is used for
+    workbooks whose year cannot be read from the BKU (e.g. RKAS only);
+    without it those files are skipped.
+    """
+
+    def __init__(self, folder, store_path, status_path, max_workers=None,
+                 poll_interval=DEFAULT_POLL_INTERVAL, settle_seconds=DEFAULT_SETTLE_SECONDS,
+                 default_year=None):
+        self.folder = os.path.abspath(folder)
+        self.store_path = store_path
+        self.default_year = default_year
+        self.status_path = status_path
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+
+        self.status = self._read_status()
+        self.queue = deque()
+        self.running = {}
+        self._dirty = False
+        self._ingested_since_analyze = 0
+
+        # Status 'queued' dari run sebelumnya yang terhenti diproses ulang, begitu
+        # juga file yang dilewati karena tahunnya tidak diketahui jika kini ada --year
+        for entry in self.status.values():
+            if entry['status'] == STATUS_QUEUED or (entry['status'] == STATUS_SKIPPED and default_year):
+                entry['mtime_ns'] = None
+
+    def _read_status(self):
+        try:
+            with open(self.status_path, encoding='utf-8') as f:
+                return json.load(f).get('files', {})
+        except FileNotFoundError:
+            return {}
+
+    def _write_status(self):
+        """Write the status file atomically (tmp file + replace)"""
+        counts = {}
+        for entry in self.status.values():
+            counts[entry['status']] = counts.get(entry['status'], 0) + 1
+        tmp_path = self.status_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'folder': self.folder, 'updated_at': _now(), 'counts': counts, 'files': self.status},
+                      f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.status_path)
+        self._dirty = False
+
+    def _ingested_hashes(self):
+        """Content hash -> path for everything already done, queued or running"""
+        return {entry['hash']: path for path, entry in self.status.items()
+                if entry['status'] in (STATUS_DONE, STATUS_QUEUED)}
+
+    def scan(self):
+        """Queue new or changed workbooks in the folder, returns how many were queued"""
+        # File yang dihapus dari folder tidak dilacak lagi
+        for path in [path for path in self.status if not os.path.exists(path)]:
+            if path not in self.running.values() and path not in self.queue:
+                del self.status[path]
+                self._dirty = True
+
+        known_hashes = self._ingested_hashes()
+        queued = 0
+        now = time.time()
+        for name in sorted(os.listdir(self.folder)):
+            # Lewati file lock Excel (~$...) dan file lain
+            if not name.lower().endswith('.xlsx') or name.startswith('~$'):
+                continue
+            path = os.path.join(self.folder, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            # Masih diproses; perubahan terbaru diambil pada scan setelah selesai
+            if path in self.queue or path in self.running.values():
+                continue
+            entry = self.status.get(path)
+            if entry is not None and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                continue
+            # Masih disalin ke folder, tunggu scan berikutnya
+            if now - stat.st_mtime < self.settle_seconds:
+                continue
+
+            try:
+                digest = content_hash(path)
+            except OSError:
+                continue
+            unchanged = (entry is not None and entry['hash'] == digest
+                         and entry['status'] not in (STATUS_QUEUED, STATUS_SKIPPED))
+            entry = {'hash': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                     'status': entry['status'] if unchanged else STATUS_QUEUED,
+                     'school': entry.get('school') if unchanged else None,
+                     'year': entry.get('year') if unchanged else None,
+                     'error': entry.get('error') if unchanged else None,
+                     'reason': entry.get('reason') if unchanged else None,
+                     'duplicate_of': entry.get('duplicate_of') if unchanged else None,
+                     'updated_at': _now()}
+            self.status[path] = entry
+            self._dirty = True
+            if unchanged:
+                continue
+
+            original = known_hashes.get(digest)
+            if original is not None and original != path:
+                entry['status'] = STATUS_DUPLICATE
+                entry['duplicate_of'] = original
+                continue
+
+            known_hashes[digest] = path
+            self.queue.append(path)
+            queued += 1
+        return queued
+
+    def _submit(self, executor):
+        """Keep at most max_workers files in the pool"""
+        while self.queue and len(self.running) < self.max_workers:
+            path = self.queue.popleft()
+            self.running[executor.submit(ingest_workbook, path)] = path
+
+    def _collect(self, futures):
+        """Record finished ingests in the status"""
+        for future in futures:
+            path = self.running.pop(future)
+            entry = self.status.get(path)
+            if entry is None:
+                continue
+            try:
+                result = future.result()
+            except Exception as e:
+                entry.update(status=STATUS_FAILED, error=str(e))
+                print(f"GAGAL - {os.path.basename(path)}: {e}")
+            else:
+                reason = result.pop('skipped')
+                if reason:
+                    # Bukan kegagalan: file valid, hanya tidak bisa disimpan tanpa tahun
+                    entry.update(status=STATUS_SKIPPED, error=None, reason=reason, **result)
+                    print(f"Dilewati - {os.path.basename(path)}: {reason}")
+                else:
+                    entry.update(status=STATUS_DONE, error=None, reason=None, **result)
+                    self._ingested_since_analyze += 1
+                    print(f"Disimpan: {result['school']} {result['year']} ({os.path.basename(path)})")
+            entry['updated_at'] = _now()
+            self._dirty = True
+
+    def run(self, once=False):
+        """
+        Poll until interrupted. With once=True the folder is scanned once and
+        the call returns when every queued file is done.
+        """
+        store = TransactionStore(self.store_path)
+        executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                       initargs=(self.store_path, self.default_year))
+        try:
+            next_scan = 0
+            while True:
+                if time.monotonic() >= next_scan and not (once and next_scan):
+                    self.scan()
+                    next_scan = time.monotonic() + self.poll_interval
+                self._submit(executor)
+
+                if self.running:
+                    timeout = None if once else max(0, next_scan - time.monotonic())
+                    done, _ = wait(self.running, timeout=timeout, return_when=FIRST_COMPLETED)
+                    self._collect(done)
+                    self._submit(executor)
+                elif once:
+                    break
+                else:
+                    time.sleep(max(0, next_scan - time.monotonic()))
+
+                # Statistik query diperbarui setelah satu gelombang file selesai
+                if not self.running and not self.queue and self._ingested_since_analyze:
+                    store.analyze()
+                    self._ingested_since_analyze = 0
+                if self._dirty:
+                    self._write_status()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            if self._dirty:
+                self._write_status()
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Pantau folder dan simpan otomatis file Excel sekolah ke database")
+    parser.add_argument('folder', help="Folder yang dipantau")
+    parser.add_argument('--db', required=True, help="File database SQLite tujuan")
+    parser.add_argument('--status', help="File status JSON (default: <db>_status.json)")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses (default: jumlah CPU)")
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL, help="Jeda antar scan (detik)")
+    parser.add_argument('--year', type=int, default=None,
+                        help="Tahun anggaran untuk file tanpa tanggal BKU (default: file tersebut dilewati)")
+    parser.add_argument('--once', action='store_true', help="Scan sekali, proses semua file lalu keluar")
+    args = parser.parse_args(argv)
+
+    status_path = args.status or os.path.splitext(args.db)[0] + '_status.json'
+    watcher = FolderWatcher(args.folder, args.db, status_path, max_workers=args.workers,
+                            poll_interval=args.interval, settle_seconds=0 if args.once else DEFAULT_SETTLE_SECONDS,
+                            default_year=args.year)
+    try:
+        watcher.run(once=args.once)
+    except KeyboardInterrupt:
+        print("Dihentikan")
+    failed = sum(1 for entry in watcher.status.values() if entry['status'] == STATUS_FAILED)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
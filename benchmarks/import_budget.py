@@ -0,0 +1,92 @@
+"""
+Import-time budget for SIKELAR startup
+Imports the modules needed for the home page in a fresh interpreter with
+`python -X importtime` and checks that
+- heavy modules (openpyxl, reportlab, the other pages) are not imported yet
+- the cumulative import time stays within the budget (median of several runs)
+
+Usage:
+    python benchmarks/import_budget.py [--budget-ms 120] [--runs 5] [--top 10]
+Exit code 1 when the budget is exceeded or a deferred module was imported.
+"""
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Yang diimport main.py sebelum HomePage tampil
+STARTUP_MODULE = 'gui.main_app'
+DEFAULT_BUDGET_MS = 120
+
+# Modul yang harus menunggu upload / export / navigasi pertama
+DEFERRED_MODULES = (
+    'openpyxl',
+    'reportlab',
+    'gui.pages.rkas_page',
+    'gui.pages.pengesahan_page',
+    'backend.pdf_report',
+    'backend.bulk_report',
+    'backend.excel_export',
+    'backend.store',
+    'sqlite3',
+)
+
+
+def measure_imports(module=STARTUP_MODULE):
+    """
+    Import `module` in a fresh interpreter with -X importtime.
+    Returns {module name: (self us, cumulative us)} in import order.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return parse_importtime(result.stderr)
+
+
+def parse_importtime(text):
+    """Parse -X importtime output to {module name: (self us, cumulative us)}"""
+    times = {}
+    for line in text.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Cek budget waktu import saat startup")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help="Tampilkan N modul paling lambat")
+    args = parser.parse_args(argv)
+
+    runs = [measure_imports() for _ in range(max(1, args.runs))]
+    total_ms = statistics.median(times[STARTUP_MODULE][1] for times in runs) / 1000
+    last = runs[-1]
+
+    print(f"Import {STARTUP_MODULE}: {total_ms:.1f} ms (median {len(runs)} run, budget {args.budget_ms:.0f} ms)")
+    print("Modul paling lambat (self, ms):")
+    for name, (self_us, _) in sorted(last.items(), key=lambda item: item[1][0], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:7.2f}  {name}")
+
+    failed = False
+    imported = [name for name in DEFERRED_MODULES if name in last]
+    if imported:
+        print(f"GAGAL - modul yang seharusnya ditunda ikut diimport: {', '.join(imported)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"GAGAL - melebihi budget {args.budget_ms:.0f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,190 @@
+"""
+Startup benchmark for SIKELAR
+Launches the app (source main.py or a frozen build) several times in the
+startup measurement mode of gui/startup_probe.py and records, as medians:
+- marks: spawn, imports, tk_root, app_created, first_frame, interactive (ms)
+- durations of HomePage.build_page and HomePage.create_tool_cards (ms)
+- per-module cumulative import times (source build, via -X importtime)
+
+On Linux without a DISPLAY the app runs under a virtual framebuffer (Xvfb).
+Results are written as JSON together with the git commit, so two runs can
+be compared; with --compare the run fails on a regression.
+
+Usage:
+    python benchmarks/startup.py [--runs 5] [--frozen PATH] [--output FILE] [--compare FILE] [--threshold 0.15]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import datetime
+import platform
+import statistics
+import subprocess
+import tempfile
+
+from import_budget import ROOT, parse_importtime
+
+sys.path.insert(0, ROOT)
+from gui.startup_probe import STARTUP_BENCHMARK_ENV, STARTUP_SPAWNED_ENV
+
+
+RUN_TIMEOUT = 60
+
+# Perbedaan dianggap regresi jika lebih lambat dari threshold relatif
+# dan juga lebih dari MIN_REGRESSION_MS (menghindari noise pada angka kecil)
+DEFAULT_THRESHOLD = 0.15
+MIN_REGRESSION_MS = 5.0
+COMPARED_MARKS = ('imports', 'first_frame', 'interactive')
+
+
+def start_virtual_display():
+    """Start Xvfb on a free display number, returns (process, display) or (None, None)"""
+    if not sys.platform.startswith('linux') or os.environ.get('DISPLAY'):
+        return None, None
+    if shutil.which('Xvfb') is None:
+        raise SystemExit("Xvfb tidak ditemukan; install xvfb atau jalankan dengan DISPLAY")
+
+    for number in range(99, 120):
+        if os.path.exists(f'/tmp/.X11-unix/X{number}') or os.path.exists(f'/tmp/.X{number}-lock'):
+            continue
+        display = f':{number}'
+        process = subprocess.Popen(['Xvfb', display, '-screen', '0', '1280x1024x24', '-nolisten', 'tcp'],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if os.path.exists(f'/tmp/.X11-unix/X{number}'):
+                return process, display
+            if process.poll() is not None:
+                break
+            time.sleep(0.05)
+        process.kill()
+    raise SystemExit("Xvfb gagal dijalankan")
+
+
+def run_once(command, env):
+    """Launch the app once in measurement mode, returns (probe result, import times)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, 'startup.json')
+        env = dict(env, **{STARTUP_BENCHMARK_ENV: output_path, STARTUP_SPAWNED_ENV: repr(time.time())})
+        result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True,
+                                timeout=RUN_TIMEOUT)
+        if not os.path.exists(output_path):
+            raise RuntimeError(f"Aplikasi tidak menulis hasil (exit {result.returncode}):\n{result.stderr[-2000:]}")
+        with open(output_path, encoding='utf-8') as f:
+            probe = json.load(f)
+    if probe.get('error'):
+        raise RuntimeError(probe['error'])
+    return probe, parse_importtime(result.stderr)
+
+
+def _median_of(dicts):
+    """Median per key over a list of {name: number}, keys in first-seen order"""
+    keys = dict.fromkeys(key for values in dicts for key in values)
+    return {key: round(statistics.median(values[key] for values in dicts if key in values), 2)
+            for key in keys}
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark(runs=5, frozen=None, top=25):
+    """Run the app `runs` times, returns the result dict"""
+    if frozen:
+        command = [os.path.abspath(frozen)]
+    else:
+        command = [sys.executable, '-X', 'importtime', os.path.join(ROOT, 'main.py')]
+
+    env = dict(os.environ)
+    xvfb, display = start_virtual_display()
+    if display:
+        env['DISPLAY'] = display
+    try:
+        # Run pertama hanya pemanasan (cache disk / .pyc)
+        run_once(command, env)
+        samples = [run_once(command, env) for _ in range(runs)]
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+    imports = _median_of([{name: cumulative / 1000 for name, (_, cumulative) in times.items()}
+                          for _, times in samples if times])
+    top_imports = dict(sorted(imports.items(), key=lambda item: item[1], reverse=True)[:top])
+    return {
+        'commit': git_commit(),
+        'build': 'frozen' if frozen else 'source',
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'runs': runs,
+        'marks_ms': _median_of([probe['marks_ms'] for probe, _ in samples]),
+        'durations_ms': _median_of([probe['durations_ms'] for probe, _ in samples]),
+        'imports_ms': top_imports
+    }
+
+
+def compare(old, new, threshold=DEFAULT_THRESHOLD):
+    """Print the difference per mark, returns the regressed mark names"""
+    regressions = []
+    for group in ('marks_ms', 'durations_ms'):
+        for name, value in new.get(group, {}).items():
+            before = old.get(group, {}).get(name)
+            if before is None:
+                continue
+            delta = value - before
+            regressed = (group == 'durations_ms' or name in COMPARED_MARKS) and \
+                delta > MIN_REGRESSION_MS and delta > before * threshold
+            flag = "  <-- REGRESI" if regressed else ""
+            print(f"  {name:32} {before:9.1f} -> {value:9.1f} ms ({delta:+.1f}){flag}")
+            if regressed:
+                regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Ukur waktu startup SIKELAR")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--frozen', help="Path ke build PyInstaller (default: main.py dari source)")
+    parser.add_argument('--output', help="Simpan hasil JSON ke file ini")
+    parser.add_argument('--compare', help="Bandingkan dengan hasil JSON sebelumnya")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Batas regresi relatif (default 0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    result = benchmark(runs=max(1, args.runs), frozen=args.frozen)
+
+    print(f"Startup {result['build']} @ {result['commit']} (median {result['runs']} run)")
+    for name, value in result['marks_ms'].items():
+        print(f"  {name:32} {value:9.1f} ms")
+    for name, value in result['durations_ms'].items():
+        print(f"  {name:32} {value:9.1f} ms")
+    if result['imports_ms']:
+        print("Import paling lambat (kumulatif):")
+        for name, value in list(result['imports_ms'].items())[:10]:
+            print(f"  {name:32} {value:9.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=1)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            old = json.load(f)
+        print(f"Dibandingkan dengan {old.get('build')} @ {old.get('commit')}:")
+        if compare(old, result, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
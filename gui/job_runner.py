@@ -0,0 +1,186 @@
+"""
+Background job runner for SIKELAR application
+Runs work in a thread pool and delivers progress and results back on the
+Tk thread through a thread-safe queue, so worker code never touches widgets
+"""
+
+import itertools
+import queue
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.cancellation import CancellationToken, OperationCancelled
+
+
+class Job:
+    """
+    Handle for one submitted job.
+
+    The job function receives this object as its first argument and may call
+    `report_progress` and `check_cancelled` from the worker thread. `token`
+    can be handed to backend code that supports cooperative cancellation.
+    """
+
+    def __init__(self, runner, job_id, name, callbacks):
+        self.runner = runner
+        self.id = job_id
+        self.name = name
+        self.callbacks = callbacks
+        self.future = None
+        self.finished = False
+        self.token = CancellationToken()
+
+    @property
+    def cancelled(self):
+        return self.token.cancelled
+
+    def cancel(self):
+        """Request cancellation; a job that has not started yet never runs"""
+        self.token.cancel()
+        if self.future is not None and self.future.cancel():
+            # Belum sempat jalan, laporkan sebagai dibatalkan
+            self.runner._post(self, 'cancelled', None)
+
+    def check_cancelled(self):
+        """Raise OperationCancelled if cancellation was requested (worker thread)"""
+        self.token.check()
+
+    def report_progress(self, progress, message=""):
+        """Post a progress update (worker thread)"""
+        self.runner._post(self, 'progress', (progress, message))
+
+
+class JobRunner:
+    """
+    Shared job scheduler for all pages.
+
+    Jobs run in a worker pool; their progress, results and errors are put on
+    a queue, and the thread that posts an event wakes the Tk loop to drain
+    it (no polling while jobs only run). Results are drained at once,
+    progress after `poll_interval` ms so bursts of updates coalesce into
+    one dispatch. Callbacks always run on the Tk thread:
+    on_progress(progress, message), on_done(result), on_error(exception)
+    and on_cancel().
+    """
+
+    def __init__(self, root, max_workers=4, poll_interval=15):
+        self.root = root
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sikelar-job')
+        self.events = queue.Queue()
+        self.active_jobs = {}
+        self._ids = itertools.count(1)
+        self._drain_lock = threading.Lock()
+        self._drain_scheduled = False
+
+    def submit(self, func, *args, name=None, on_progress=None, on_done=None,
+               on_error=None, on_cancel=None, **kwargs):
+        """Run func(job, *args, **kwargs) in the pool and return its Job"""
+        job_id = next(self._ids)
+        callbacks = {
+            'progress': on_progress,
+            'done': on_done,
+            'error': on_error,
+            'cancelled': on_cancel
+        }
+        job = Job(self, job_id, name or getattr(func, '__name__', f'job-{job_id}'), callbacks)
+        self.active_jobs[job_id] = job
+        job.future = self.executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def cancel(self, job):
+        """Cancel a job"""
+        job.cancel()
+
+    def cancel_all(self):
+        """Cancel every active job"""
+        for job in list(self.active_jobs.values()):
+            job.cancel()
+
+    def shutdown(self):
+        """Cancel active jobs and stop the pool without waiting for workers"""
+        self.cancel_all()
+        self.executor.shutdown(wait=False)
+
+    def _run(self, job, func, args, kwargs):
+        """Worker side wrapper that turns the outcome into a queue event"""
+        try:
+            job.check_cancelled()
+            result = func(job, *args, **kwargs)
+            if job.cancelled:
+                self._post(job, 'cancelled', None)
+            else:
+                self._post(job, 'done', result)
+        except OperationCancelled:
+            self._post(job, 'cancelled', None)
+        except Exception as e:
+            self._post(job, 'error', e)
+
+    def _post(self, job, kind, payload):
+        """Thread-safe: enqueue an event for the Tk thread and wake the Tk loop"""
+        self.events.put((job, kind, payload))
+        self._schedule_drain(self.poll_interval if kind == 'progress' else 0)
+
+    def _schedule_drain(self, delay):
+        """Thread-safe: schedule one drain on the Tk loop if none is pending"""
+        with self._drain_lock:
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+        # after() dari thread worker diteruskan ke thread Tk; jangan dipanggil
+        # sambil memegang lock, _drain di thread Tk juga mengambilnya
+        try:
+            self.root.after(delay, self._drain)
+        except (RuntimeError, tk.TclError):
+            # Main loop sudah berhenti / root sudah dihancurkan
+            pass
+
+    def _drain(self):
+        """Dispatch queued events on the Tk thread"""
+        # Reset sebelum membaca queue: event yang masuk setelah ini menjadwalkan drain baru
+        with self._drain_lock:
+            self._drain_scheduled = False
+
+        pending = []
+        while True:
+            try:
+                pending.append(self.events.get_nowait())
+            except queue.Empty:
+                break
+
+        # Progress yang menumpuk cukup dikirim yang terakhir per job
+        last_progress = {}
+        for index, (job, kind, payload) in enumerate(pending):
+            if kind == 'progress':
+                last_progress[job.id] = index
+
+        for index, (job, kind, payload) in enumerate(pending):
+            if job.finished:
+                continue
+            if kind == 'progress':
+                if last_progress[job.id] != index or job.cancelled:
+                    continue
+                self._dispatch(job, kind, *payload)
+            else:
+                job.finished = True
+                self.active_jobs.pop(job.id, None)
+                if kind == 'cancelled':
+                    self._dispatch(job, kind)
+                else:
+                    self._dispatch(job, kind, payload)
+
+        if not self.events.empty():
+            self._schedule_drain(0)
+
+    def _dispatch(self, job, kind, *payload):
+        """Call a job callback, keeping the drain loop alive on callback errors"""
+        callback = job.callbacks.get(kind)
+        if callback is None:
+            if kind == 'error':
+                print(f"Error in background job '{job.name}': {payload[0]}")
+            return
+        try:
+            callback(*payload)
+        except Exception as e:
+            print(f"Error in '{kind}' callback of job '{job.name}': {e}")
@@ -0,0 +1,75 @@
+"""
+Layout scheduler for SIKELAR application
+Coalesces scroll-region and canvas-window width updates of all pages into
+one flush per idle cycle. <Configure> handlers only mark a canvas as dirty,
+so a window resize or a table fill that fires many events recomputes each
+canvas bbox once instead of once per event, and no code path has to force
+a synchronous layout pass with update_idletasks()
+"""
+
+import tkinter as tk
+
+
+class LayoutScheduler:
+    """
+    Pending layout work per canvas, applied on the next idle.
+
+    - `fit_width(canvas, window)`: resize canvas window item `window` to the
+      canvas width (or height for orient='x') in the flush
+    - `update_scrollregion(canvas, moveto=None)`: set scrollregion to the
+      bbox of all items, then optionally yview_moveto(moveto)
+
+    The flush itself is scheduled with after_idle, so Tk has already done its
+    own pending geometry work when the bbox is read.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._pending = {}        # path canvas -> [canvas, {window: orient}, moveto]
+        self._scheduled = False
+
+    def _entry(self, canvas):
+        key = str(canvas)
+        entry = self._pending.get(key)
+        if entry is None:
+            entry = self._pending[key] = [canvas, {}, None]
+        if not self._scheduled:
+            self._scheduled = True
+            self.root.after_idle(self.flush)
+        return entry
+
+    def update_scrollregion(self, canvas, moveto=None):
+        """Recompute the scrollregion of canvas on the next idle"""
+        entry = self._entry(canvas)
+        if moveto is not None:
+            entry[2] = moveto
+
+    def fit_width(self, canvas, window, orient='y'):
+        """
+        Size window item `window` to the canvas on the next idle: its width
+        for a vertical scroller, its height for a horizontal one (orient='x').
+        The scrollregion is updated too.
+        """
+        self._entry(canvas)[1][window] = orient
+
+    def flush(self):
+        """Apply all pending layout work now (normally called from after_idle)"""
+        self._scheduled = False
+        pending, self._pending = self._pending, {}
+        for canvas, windows, moveto in pending.values():
+            try:
+                if not canvas.winfo_exists():
+                    continue
+                for window, orient in windows.items():
+                    if orient == 'y':
+                        width = canvas.winfo_width()
+                        if width > 1:  # Canvas belum punya ukuran
+                            canvas.itemconfig(window, width=width)
+                    else:
+                        canvas.itemconfig(window, height=canvas.winfo_height())
+                canvas.configure(scrollregion=canvas.bbox("all"))
+                if moveto is not None:
+                    canvas.yview_moveto(moveto)
+            except tk.TclError:
+                # Canvas dihancurkan di antara jadwal dan flush
+                continue
@@ -6,9 +6,13 @@ Handles navigation between pages and common functionality
 import tkinter as tk
 import tkinter.font as tkFont
 from .pages.home_page import HomePage
-from .pages.pengesahan_page import PengesahanPage  
-from .pages.rkas_page import RKASPage
+from .job_runner import JobRunner
+from .layout_scheduler import LayoutScheduler
+from .ui_scheduler import UITaskScheduler
+from .widgets.wheel_router import MouseWheelRouter
 from backend.processor import BOSDataProcessor  # PERBAIKAN: Import yang benar
+from backend.snapshot import empty_snapshot
+from backend.session import WorkbookSession, memory_budget_from_env, store_path_from_env
 
 class SikelarMainApp:
     def __init__(self, root):
@@ -20,6 +24,34 @@ class SikelarMainApp:
         # Initialize data processor (shared across pages)
         self.data_processor = BOSDataProcessor()  # PERBAIKAN: Gunakan BOSDataProcessor
         
+        # Snapshot data Excel (RKAS/BKU) yang sedang ditampilkan. Hanya diganti
+        # utuh lewat swap_snapshot di Tk thread, tidak pernah diubah di tempat
+        self.snapshot = empty_snapshot()
+        
+        # Sekolah yang sudah dimuat, dibatasi budget memori (SIKELAR_MEMORY_BUDGET_MB)
+        self.session = WorkbookSession(memory_budget_from_env())
+        
+        # Penyimpanan SQLite opsional untuk data banyak sekolah (SIKELAR_STORE_PATH)
+        # (sqlite3 dan backend.store hanya dimuat jika diaktifkan)
+        store_path = store_path_from_env()
+        self.store = None
+        if store_path:
+            from backend.store import TransactionStore
+            self.store = TransactionStore(store_path)
+        
+        # Background job runner (shared across pages)
+        self.job_runner = JobRunner(self.root)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Satu binding mouse wheel untuk seluruh aplikasi, halaman mendaftarkan target scroll
+        self.wheel_router = MouseWheelRouter(self.root)
+        
+        # Update scrollregion / lebar canvas semua halaman digabung, sekali per idle
+        self.layout = LayoutScheduler(self.root)
+        
+        # Pekerjaan UI panjang dicicil per frame di Tk loop (lihat ui_scheduler)
+        self.ui_tasks = UITaskScheduler(self.root)
+        
         # Configure common styles
         self.setup_styles()
         
@@ -36,6 +68,17 @@ class SikelarMainApp:
         # Show home page immediately after widget creation
         self.root.after(1, self.show_home_page)
         
+    def swap_snapshot(self, snapshot):
+        """Atomically replace the current data snapshot, returns the previous one"""
+        previous, self.snapshot = self.snapshot, snapshot
+        return previous
+        
+    def on_close(self):
+        """Stop background jobs and close the application"""
+        self.job_runner.shutdown()
+        self.ui_tasks.cancel_all()
+        self.root.destroy()
+        
     def setup_styles(self):
         """Setup common styles for the application"""
         self.title_font = tkFont.Font(family="Segoe UI", size=24, weight="bold")
@@ -50,8 +93,11 @@ class SikelarMainApp:
             if page_name == 'home':
                 self.pages['home'] = HomePage(self.main_container, self)
             elif page_name == 'pengesahan':
+                # Modul halaman lain baru diimport saat pertama kali dibuka
+                from .pages.pengesahan_page import PengesahanPage
                 self.pages['pengesahan'] = PengesahanPage(self.main_container, self)
             elif page_name == 'rkas':
+                from .pages.rkas_page import RKASPage
                 self.pages['rkas'] = RKASPage(self.main_container, self)
         
         return self.pages[page_name]
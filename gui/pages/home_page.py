@@ -12,7 +12,6 @@ class HomePage(BasePage):
     def __init__(self, parent, main_app):
         super().__init__(parent, main_app)
         self.canvas = None
-        self.mousewheel_bound = False
         
     def build_page(self):
         """Build the home page content with modern design"""
@@ -28,7 +27,7 @@ class HomePage(BasePage):
         # Configure scrolling AFTER packing
         self.scrollable_frame.bind(
             "<Configure>",
-            lambda e: self.update_scroll_region()
+            lambda e: self.main_app.layout.update_scrollregion(self.canvas)
         )
         
         # Create window in canvas
@@ -38,6 +37,9 @@ class HomePage(BasePage):
         # Bind canvas resize
         self.canvas.bind('<Configure>', self.on_canvas_configure)
         
+        # Mouse wheel diarahkan ke canvas ini oleh router aplikasi (sekali, bukan tiap show)
+        self.main_app.wheel_router.register_canvas(self.canvas)
+        
         # Header section with blue background
         header_frame = tk.Frame(self.scrollable_frame, bg='#4a69bd', height=180)
         header_frame.pack(fill='x')
@@ -245,7 +247,6 @@ class HomePage(BasePage):
         
         # PERBAIKAN: Pastikan footer memiliki tinggi minimum yang cukup
         footer_frame.configure(height=120)
-        footer_frame.update_idletasks()
         
     def add_link_hover_effect(self, widget, normal_color, hover_color):
         """Add hover effect to footer links"""
@@ -260,37 +261,18 @@ class HomePage(BasePage):
         
     def on_show(self):
         """Called when home page is shown"""
-        # Bind mousewheel to canvas
-        self.bind_mousewheel()
-        
-        # Force update of canvas size and scroll region after everything is created
-        self.main_app.root.after(10, self.force_update_canvas)
+        # Canvas size and scroll region are updated once the page is laid out
+        self.force_update_canvas()
     
-    def on_hide(self):
-        """Called when home page is hidden"""
-        # Unbind mousewheel before hiding page
-        self.unbind_mousewheel()
-        
     def force_update_canvas(self):
-        """Force update canvas size and scroll region"""
-        if self.canvas and self.canvas.winfo_exists():
-            # Update canvas
-            self.canvas.update_idletasks()
-            self.scrollable_frame.update_idletasks()
-            
-            # Set proper canvas window width
-            canvas_width = self.canvas.winfo_width()
-            if canvas_width > 1:  # Make sure canvas has been sized
-                self.canvas.itemconfig(self.canvas_window, width=canvas_width)
-            
-            # Update scroll region
-            self.update_scroll_region()
+        """Schedule an update of canvas window width and scroll region"""
+        if self.canvas:
+            self.main_app.layout.fit_width(self.canvas, self.canvas_window)
     
     def update_scroll_region(self):
-        """Update the scroll region of the canvas"""
-        if self.canvas and self.canvas.winfo_exists():
-            self.canvas.update_idletasks()
-            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        """Schedule an update of the scroll region of the canvas"""
+        if self.canvas:
+            self.main_app.layout.update_scrollregion(self.canvas)
     
     def create_tool_cards(self, parent):
         """Create the grid of tool cards with modern design"""
@@ -460,82 +442,5 @@ class HomePage(BasePage):
     
     def on_canvas_configure(self, event):
         """Handle canvas resize events"""
-        if self.canvas and self.canvas.winfo_exists():
-            canvas_width = event.width
-            if canvas_width > 1:  # Make sure we have a valid width
-                self.canvas.itemconfig(self.canvas_window, width=canvas_width)
-                # Update scroll region when canvas is resized
-                self.main_app.root.after_idle(self.update_scroll_region)
-    
-    def bind_mousewheel(self):
-        """Bind mousewheel events for scrolling"""
-        if self.mousewheel_bound or not self.canvas:
-            return
-            
-        def on_mousewheel(event):
-            if self.canvas and self.canvas.winfo_exists():
-                # Check if canvas is visible and has scrollable content
-                try:
-                    bbox = self.canvas.bbox("all")
-                    if bbox:
-                        canvas_height = self.canvas.winfo_height()
-                        content_height = bbox[3] - bbox[1]
-                        
-                        # Only scroll if content is larger than canvas
-                        if content_height > canvas_height:
-                            self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-                except tk.TclError:
-                    # Canvas might be destroyed, ignore
-                    pass
-        
-        # Bind mousewheel to canvas and its children
-        if self.canvas and self.canvas.winfo_exists():
-            self.canvas.bind("<MouseWheel>", on_mousewheel)
-            
-            # Also bind to the scrollable_frame to catch events when mouse is over content
-            if hasattr(self, 'scrollable_frame') and self.scrollable_frame.winfo_exists():
-                self.scrollable_frame.bind("<MouseWheel>", on_mousewheel)
-                
-                # Bind to all child widgets recursively
-                self.bind_mousewheel_recursive(self.scrollable_frame, on_mousewheel)
-            
-            self.mousewheel_bound = True
-    
-    def bind_mousewheel_recursive(self, widget, callback):
-        """Recursively bind mousewheel to all child widgets"""
-        try:
-            widget.bind("<MouseWheel>", callback, add='+')
-            for child in widget.winfo_children():
-                self.bind_mousewheel_recursive(child, callback)
-        except tk.TclError:
-            # Widget might be destroyed, ignore
-            pass
-    
-    def unbind_mousewheel(self):
-        """Unbind mousewheel events"""
-        if not self.mousewheel_bound:
-            return
-            
-        try:
-            if self.canvas and self.canvas.winfo_exists():
-                self.canvas.unbind("<MouseWheel>")
-                
-            if hasattr(self, 'scrollable_frame') and self.scrollable_frame.winfo_exists():
-                self.scrollable_frame.unbind("<MouseWheel>")
-                self.unbind_mousewheel_recursive(self.scrollable_frame)
-                
-        except tk.TclError:
-            # Widgets might be destroyed, ignore
-            pass
-        finally:
-            self.mousewheel_bound = False
-    
-    def unbind_mousewheel_recursive(self, widget):
-        """Recursively unbind mousewheel from all child widgets"""
-        try:
-            widget.unbind("<MouseWheel>")
-            for child in widget.winfo_children():
-                self.unbind_mousewheel_recursive(child)
-        except tk.TclError:
-            # Widget might be destroyed, ignore
-            pass
\ No newline at end of file
+        # Satu kali per idle, bukan per event selama window di-resize
+        self.force_update_canvas()
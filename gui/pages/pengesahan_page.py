@@ -9,6 +9,11 @@ from tkinter import scrolledtext, messagebox
 import tkinter.font as tkFont
 from .base_page import BasePage
 from backend.utils import FormatUtils
+from backend.validation import PengesahanValidator
+
+# Channel UI scheduler untuk penulisan output_text, dan jumlah baris per langkah
+OUTPUT_CHANNEL = 'pengesahan-output'
+OUTPUT_CHUNK_LINES = 100
 
 class PengesahanPage(BasePage):
     def __init__(self, parent, main_app):
@@ -20,6 +25,10 @@ class PengesahanPage(BasePage):
         self.honor_school_type = None  # 'negeri' atau 'swasta'
         self.honor_choice_made = False  # Flag untuk tracking apakah pilihan sudah dibuat
         self.honor_dialog_window = None  # Reference ke dialog window
+
+        # Engine validasi juknis, persentase dihitung sekali per proses data
+        self.validator = PengesahanValidator()
+        self.current_percentages = {}
         
     def build_page(self):
         """Build the pengesahan page content with enhanced modern UI and improved symmetrical layout"""
@@ -34,7 +43,7 @@ class PengesahanPage(BasePage):
         # Configure scrollable frame
         self.scrollable_frame.bind(
             "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+            lambda e: self.main_app.layout.update_scrollregion(self.canvas)
         )
         
         # Create window in canvas
@@ -47,8 +56,9 @@ class PengesahanPage(BasePage):
         self.canvas.pack(side="left", fill="both", expand=True)
         self.scrollbar.pack(side="right", fill="y")
         
-        # Bind mouse wheel to canvas for full area scrolling
-        self.bind_mousewheel()
+        # Mouse wheel diarahkan ke canvas ini oleh router aplikasi; ScrolledText
+        # di dalamnya didaftarkan sebagai passthrough saat dibuat
+        self.main_app.wheel_router.register_canvas(self.canvas)
         
         # Configure canvas window to resize with canvas
         self.canvas.bind('<Configure>', self.on_canvas_configure)
@@ -139,6 +149,7 @@ class PengesahanPage(BasePage):
                                                    selectforeground='white',
                                                    insertbackground='#2c3e50')
         self.input_text.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+        self.main_app.wheel_router.passthrough(self.input_text.frame)
         
         # Button area (right side) with improved spacing and symmetry
         button_frame = tk.Frame(input_button_frame, bg='white')
@@ -287,6 +298,7 @@ class PengesahanPage(BasePage):
                                                     selectforeground='white',
                                                     insertbackground='#2c3e50')
         self.output_text.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
+        self.main_app.wheel_router.passthrough(self.output_text.frame)
 
         # ENHANCED: Percentage Validation Section for both BUKU and SARANA
         self.create_validation_section(main_container)
@@ -348,62 +360,30 @@ class PengesahanPage(BasePage):
     
     def update_validation_display(self, category, percentage):
         """Update validation display based on category and percentage"""
-        # Determine the limit based on category
-        if category == 'buku':
-            limit = 10.0
-            category_name = "BUKU"
-        elif category == 'sarana':
-            limit = 20.0
-            category_name = "SARANA & PRASARANA"
-        elif category == 'honor':
-            # BARU: Tentukan limit berdasarkan jenis sekolah
-            if self.honor_school_type == 'negeri':
-                limit = 20.0
-                category_name = "HONOR (Sekolah Negeri)"
-            elif self.honor_school_type == 'swasta':
-                limit = 40.0
-                category_name = "HONOR (Sekolah Swasta)"
-            else:
-                return  # Jika belum ada pilihan jenis sekolah
-        else:
-            return  # No validation for other categories
-        
-        # Special logic for 'buku' category (reversed validation)
-        if category == 'buku':
-            if percentage >= limit:
-                # Show green checkmark and success message for buku when >= limit
-                self.status_indicator.config(text="✅", fg='#28a745')
-                self.status_message.config(text=f"Persentase {category_name} mencukupi ({percentage:.2f}%)")
-                self.status_message.pack(side=tk.LEFT, padx=10)
-                self.action_button.pack_forget()
-            else:
-                # Show red warning and action button for buku when < limit
-                self.status_indicator.config(text="⚠️", fg='#dc3545')
-                self.action_button.config(text=f"Lihat Ketentuan {category_name}")
-                self.action_button.pack(side=tk.LEFT, padx=10)
-                self.status_message.pack_forget()
-                
-                # Add hover effects to action button
-                self.action_button.bind("<Enter>", lambda e: self.on_hover(e, '#c82333'))
-                self.action_button.bind("<Leave>", lambda e: self.on_leave(e, '#dc3545'))
+        # Limit dan nama kategori diambil dari aturan di validation engine
+        school_type = self.honor_school_type if category == 'honor' else None
+        limit = self.validator.get_limit(category, school_type)
+        if limit is None:
+            return  # Kategori tidak divalidasi atau jenis sekolah belum dipilih
+        category_name = self.validator.get_category_name(category, school_type)
+        
+        # BUKU memakai batas minimal, kategori lain memakai batas maksimal
+        if self.validator.is_compliant(category, percentage, school_type):
+            # Show green checkmark and success message
+            self.status_indicator.config(text="✅", fg='#28a745')
+            self.status_message.config(text=f"Persentase {category_name} mencukupi ({percentage:.2f}%)")
+            self.status_message.pack(side=tk.LEFT, padx=10)
+            self.action_button.pack_forget()
         else:
-            # Standard logic for other categories (sarana, honor)
-            if percentage <= limit:
-                # Show green checkmark and success message
-                self.status_indicator.config(text="✅", fg='#28a745')
-                self.status_message.config(text=f"Persentase {category_name} mencukupi ({percentage:.2f}%)")
-                self.status_message.pack(side=tk.LEFT, padx=10)
-                self.action_button.pack_forget()
-            else:
-                # Show red warning and action button
-                self.status_indicator.config(text="⚠️", fg='#dc3545')
-                self.action_button.config(text=f"Lihat Ketentuan {category_name}")
-                self.action_button.pack(side=tk.LEFT, padx=10)
-                self.status_message.pack_forget()
-                
-                # Add hover effects to action button
-                self.action_button.bind("<Enter>", lambda e: self.on_hover(e, '#c82333'))
-                self.action_button.bind("<Leave>", lambda e: self.on_leave(e, '#dc3545'))
+            # Show red warning and action button
+            self.status_indicator.config(text="⚠️", fg='#dc3545')
+            self.action_button.config(text=f"Lihat Ketentuan {category_name}")
+            self.action_button.pack(side=tk.LEFT, padx=10)
+            self.status_message.pack_forget()
+            
+            # Add hover effects to action button
+            self.action_button.bind("<Enter>", lambda e: self.on_hover(e, '#c82333'))
+            self.action_button.bind("<Leave>", lambda e: self.on_leave(e, '#dc3545'))
         
         # Store current validation info for popup
         self.current_validation = {
@@ -540,37 +520,11 @@ Wajib menganggarkan honor maksimal {limit}% dari total anggaran sekolah untuk {s
     
     def get_current_buku_percentage(self):
         """Get current percentage for BUKU category"""
-        try:
-            found_codes = self.main_app.data_processor.get_buku_data()
-            if not found_codes:
-                return 0.0
-            
-            total_buku = sum(self.main_app.data_processor.processed_data[kode]['jumlah'] 
-                           for kode in found_codes)
-            total_budget = self.main_app.data_processor.total_budget
-            
-            if total_budget > 0:
-                return (total_buku / total_budget) * 100
-            return 0.0
-        except:
-            return 0.0
+        return self.current_percentages.get('buku', 0.0)
     
     def get_current_sarana_percentage(self):
         """Get current percentage for SARANA & PRASARANA category"""
-        try:
-            found_codes = self.main_app.data_processor.get_sarana_data()
-            if not found_codes:
-                return 0.0
-            
-            total_sarana = sum(self.main_app.data_processor.processed_data[kode]['jumlah'] 
-                             for kode in found_codes)
-            total_budget = self.main_app.data_processor.total_budget
-            
-            if total_budget > 0:
-                return (total_sarana / total_budget) * 100
-            return 0.0
-        except:
-            return 0.0
+        return self.current_percentages.get('sarana', 0.0)
     
     def create_footer(self):
         """Create footer section with modern design matching the theme - FIXED VERSION"""
@@ -694,7 +648,6 @@ Wajib menganggarkan honor maksimal {limit}% dari total anggaran sekolah untuk {s
         
         # PERBAIKAN: Pastikan footer memiliki tinggi minimum yang cukup
         footer_frame.configure(height=120)
-        footer_frame.update_idletasks()
     
     def add_link_hover_effect(self, widget, normal_color, hover_color):
         """Add hover effect to footer links"""
@@ -708,86 +661,10 @@ Wajib menganggarkan honor maksimal {limit}% dari total anggaran sekolah untuk {s
         widget.bind('<Leave>', on_leave)
     
     
-    def bind_mousewheel(self):
-        """Bind mouse wheel events to the entire page for full scrolling support"""
-        def _on_mousewheel(event):
-            # Check if the mouse is over the main canvas area (not over ScrolledText widgets)
-            widget_under_mouse = self.page_frame.winfo_containing(event.x_root, event.y_root)
-            
-            # Don't interfere with ScrolledText internal scrolling
-            if (widget_under_mouse != self.input_text and 
-                widget_under_mouse != self.output_text and
-                not self._is_child_of_scrolledtext(widget_under_mouse)):
-                
-                # Tambahkan batasan scroll ini:
-                current_view = self.canvas.canvasy(0)
-                if event.delta > 0 and current_view <= 0:
-                    # Jika scroll ke atas dan sudah di posisi paling atas, jangan scroll lagi
-                    return
-                
-                self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        def _bind_to_mousewheel(event):
-            # Bind to the entire page frame and all its children
-            self._bind_mousewheel_recursive(self.page_frame, _on_mousewheel)
-        
-        def _unbind_from_mousewheel(event):
-            # Unbind from all widgets
-            self._unbind_mousewheel_recursive(self.page_frame)
-        
-        # Bind events to page frame
-        self.page_frame.bind('<Enter>', _bind_to_mousewheel)
-        self.page_frame.bind('<Leave>', _unbind_from_mousewheel)
-        
-        # Also bind directly to main widgets for better coverage
-        self.canvas.bind("<MouseWheel>", _on_mousewheel)
-        self.scrollable_frame.bind("<MouseWheel>", _on_mousewheel)
-        
-        # Initial binding
-        self._bind_mousewheel_recursive(self.page_frame, _on_mousewheel)
-    
-    def _is_child_of_scrolledtext(self, widget):
-        """Check if widget is a child of any ScrolledText widget"""
-        if widget is None:
-            return False
-        
-        # Check if it's one of our ScrolledText widgets or their children
-        try:
-            parent = widget
-            while parent:
-                if parent == self.input_text or parent == self.output_text:
-                    return True
-                parent = parent.master
-        except:
-            pass
-        return False
-    
-    def _bind_mousewheel_recursive(self, widget, callback):
-        """Recursively bind mousewheel to widget and all its children"""
-        try:
-            widget.bind("<MouseWheel>", callback, add='+')
-            for child in widget.winfo_children():
-                self._bind_mousewheel_recursive(child, callback)
-        except:
-            pass
-    
-    def _unbind_mousewheel_recursive(self, widget):
-        """Recursively unbind mousewheel from widget and all its children"""
-        try:
-            widget.unbind("<MouseWheel>")
-            for child in widget.winfo_children():
-                self._unbind_mousewheel_recursive(child)
-        except:
-            pass
-    
     def on_canvas_configure(self, event):
         """Handle canvas resize to update scrollable frame width"""
-        # Update the scroll region
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        
-        # Update the width of the scrollable frame to match canvas width
-        canvas_width = event.width
-        self.canvas.itemconfig(self.canvas_window, width=canvas_width)
+        # Lebar frame dan scroll region diperbarui sekali per idle, bukan per event
+        self.main_app.layout.fit_width(self.canvas, self.canvas_window)
     
     def scroll_to_top(self):
         """Scroll to top of the content"""
@@ -898,9 +775,11 @@ Wajib menganggarkan honor maksimal {limit}% dari total anggaran sekolah untuk {s
     def clear_data(self):
         """Membersihkan semua data input dan output dengan enhanced feedback"""
         self.input_text.delete("1.0", tk.END)
+        self.main_app.ui_tasks.cancel(OUTPUT_CHANNEL)
         self.output_text.delete("1.0", tk.END)
         
         self.main_app.data_processor.clear_data()
+        self.current_percentages = {}
         self.active_button = None
         
         # Reset button states dengan warna yang sudah diperbaiki
@@ -943,6 +822,10 @@ Wajib menganggarkan honor maksimal {limit}% dari total anggaran sekolah untuk {s
             
             result = self.main_app.data_processor.process_data(raw_input)
             
+            # Hitung semua persentase validasi sekaligus
+            school = self.validator.school_record(self.main_app.data_processor)
+            self.current_percentages = self.validator.validate_school(school)
+            
             # Enable semua button dengan warna yang sudah diperbaiki
             button_colors = {
                 'buku': '#239bc0',
@@ -962,8 +845,8 @@ Wajib menganggarkan honor maksimal {limit}% dari total anggaran sekolah untuk {s
             self.hide_validation_display()
             
             # Scroll to results section after processing
-            self.canvas.update_idletasks()  # Ensure canvas is updated
-            self.canvas.yview_moveto(0.6)  # Scroll to show results
+            # Scroll to show results once the canvas is laid out
+            self.main_app.layout.update_scrollregion(self.canvas, moveto=0.6)
             
             messagebox.showinfo("✅ Berhasil", 
                               f"Data berhasil diproses!\n\n"
@@ -974,6 +857,20 @@ Wajib menganggarkan honor maksimal {limit}% dari total anggaran sekolah untuk {s
         except Exception as e:
             messagebox.showerror("❌ Error", f"Terjadi kesalahan saat memproses data:\n{str(e)}")
             
+    def show_output(self, output):
+        """Replace the output text, inserted in blocks of lines by the UI scheduler"""
+        # Klik kategori baru membatalkan penulisan output yang masih berjalan
+        self.main_app.ui_tasks.cancel(OUTPUT_CHANNEL)
+        self.output_text.delete("1.0", tk.END)
+        self.main_app.ui_tasks.submit(self._insert_output, output.splitlines(keepends=True),
+                                      channel=OUTPUT_CHANNEL)
+    
+    def _insert_output(self, lines):
+        """Generator task: insert OUTPUT_CHUNK_LINES lines per step"""
+        for start in range(0, len(lines), OUTPUT_CHUNK_LINES):
+            self.output_text.insert(tk.END, ''.join(lines[start:start + OUTPUT_CHUNK_LINES]))
+            yield
+    
     def show_summary(self):
         """Menampilkan ringkasan data dengan enhanced formatting"""
         self.active_button = None
@@ -1003,8 +900,7 @@ Wajib menganggarkan honor maksimal {limit}% dari total anggaran sekolah untuk {s
         output += "💡 PETUNJUK: Silakan pilih kategori yang ingin ditampilkan menggunakan tombol di atas.\n"
         output += "═" * 120
         
-        self.output_text.delete("1.0", tk.END)
-        self.output_text.insert("1.0", output)
+        self.show_output(output)
     
     def show_alokasi_buku(self):
         """Menampilkan alokasi buku dengan enhanced display dan validasi 10%"""
@@ -1018,8 +914,7 @@ Wajib menganggarkan honor maksimal {limit}% dari total anggaran sekolah untuk {s
                                          self.main_app.data_processor.total_budget,
                                          self.main_app.data_processor.school_name)
         
-        self.output_text.delete("1.0", tk.END)
-        self.output_text.insert("1.0", output)
+        self.show_output(output)
         
         # Update validation display for BUKU category (10% limit)
         if found_codes: 
@@ -1029,8 +924,7 @@ Wajib menganggarkan honor maksimal {limit}% dari total anggaran sekolah untuk {s
             self.hide_validation_display()
         
         # Auto-scroll to show the results
-        self.canvas.update_idletasks()
-        self.canvas.yview_moveto(0.8)
+        self.main_app.layout.update_scrollregion(self.canvas, moveto=0.8)
     
     def show_alokasi_sarana(self):
         """Menampilkan alokasi sarana & prasarana dengan enhanced display dan validasi 20%"""
@@ -1044,8 +938,7 @@ Wajib menganggarkan honor maksimal {limit}% dari total anggaran sekolah untuk {s
                                          self.main_app.data_processor.total_budget,
                                          self.main_app.data_processor.school_name)
         
-        self.output_text.delete("1.0", tk.END)
-        self.output_text.insert("1.0", output)
+        self.show_output(output)
         
         # Update validation display for SARANA category (20% limit)
         if found_codes:
@@ -1055,8 +948,7 @@ Wajib menganggarkan honor maksimal {limit}% dari total anggaran sekolah untuk {s
             self.hide_validation_display()
         
         # Auto-scroll to show the results
-        self.canvas.update_idletasks()
-        self.canvas.yview_moveto(0.8)
+        self.main_app.layout.update_scrollregion(self.canvas, moveto=0.8)
     
     # Modifikasi method show_alokasi_honor
     def show_alokasi_honor(self):
@@ -1073,20 +965,7 @@ Wajib menganggarkan honor maksimal {limit}% dari total anggaran sekolah untuk {s
 
     def get_current_honor_percentage(self):
         """Get current percentage for HONOR category"""
-        try:
-            found_codes = self.main_app.data_processor.get_honor_data()
-            if not found_codes:
-                return 0.0
-            
-            total_honor = sum(self.main_app.data_processor.processed_data[kode]['jumlah'] 
-                            for kode in found_codes)
-            total_budget = self.main_app.data_processor.total_budget
-            
-            if total_budget > 0:
-                return (total_honor / total_budget) * 100
-            return 0.0
-        except:
-            return 0.0
+        return self.current_percentages.get('honor', 0.0)
     
     def show_school_type_dialog(self):
         """Show school type selection dialog for HONOR validation"""
@@ -1196,8 +1075,7 @@ Wajib menganggarkan honor maksimal {limit}% dari total anggaran sekolah untuk {s
                                         self.main_app.data_processor.total_budget,
                                         self.main_app.data_processor.school_name)
         
-        self.output_text.delete("1.0", tk.END)
-        self.output_text.insert("1.0", output)
+        self.show_output(output)
         
         # Update validation display for HONOR category
         if found_codes:
@@ -1207,8 +1085,7 @@ Wajib menganggarkan honor maksimal {limit}% dari total anggaran sekolah untuk {s
             self.hide_validation_display()
         
         # Auto-scroll to show the results
-        self.canvas.update_idletasks()
-        self.canvas.yview_moveto(0.8)
+        self.main_app.layout.update_scrollregion(self.canvas, moveto=0.8)
 
 # BARU: Method untuk menangani penutupan dialog tanpa pilihan
     def on_school_type_dialog_close(self):
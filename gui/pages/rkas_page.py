@@ -10,39 +10,41 @@ Added RKAS placeholder functionality
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from typing import Dict, List
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.pdfgen import canvas
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-import datetime
 import sys
 import os
-import threading
-import time
 import tkinter.font as tkFont
 
 
 # Add parent directory to path to import backend modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.processor import BOSDataProcessor
 from backend.utils import FormatUtils
+from backend.processor import BOSDataProcessor
+from backend.view_models import BKU_CATEGORIES
+from backend.snapshot import empty_snapshot, load_snapshot
+from backend.session import estimate_size
 from .base_page import BasePage  # Import BasePage
+from ..widgets.table_panel import TablePanel, MessagePanel, PanelStack
+
+# Channel UI scheduler untuk render panel BKU (klik terbaru membatalkan yang lama)
+BKU_DISPLAY_CHANNEL = 'rkas-bku-display'
 
 class RKASPage(BasePage):  # Inherit dari BasePage
     def __init__(self, parent, main_app):
         super().__init__(parent, main_app)  # Call parent constructor
         
-        # Initialize data processor
-        self.processor = BOSDataProcessor()
+        # Upload dan export PDF yang sedang berjalan di background
+        self.upload_job = None
+        self.export_job = None
         
         # For supporting active button highlight
         self.tab_buttons = {}
+        self.tab_commands = {}
         self.active_tab = None
         
+        # Urutan key sekolah sesuai isi combobox sekolah
+        self._school_keys = []
+        
         # Triwulan selection variable
         self.selected_triwulan = tk.StringVar(value="Triwulan 1")
         
@@ -51,6 +53,16 @@ class RKASPage(BasePage):  # Inherit dari BasePage
         self.scrollbar = None
         self.scrollable_frame = None
 
+    # Data dibaca dari snapshot milik main app; snapshot tidak pernah diubah
+    # di tempat, jadi tampilan tetap konsisten selama file baru dimuat
+    @property
+    def processor(self):
+        return self.main_app.snapshot.processor
+
+    @property
+    def view_models(self):
+        return self.main_app.snapshot.view_models
+
     def build_page(self):
         """Build the RKAS page content - implemented from BasePage"""
         self.page_frame.configure(bg='#f8f9fa')
@@ -67,7 +79,7 @@ class RKASPage(BasePage):  # Inherit dari BasePage
         # Configure scrolling
         self.scrollable_frame.bind(
             "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+            lambda e: self.main_app.layout.update_scrollregion(self.canvas)
         )
         
         # Create window in canvas
@@ -77,8 +89,8 @@ class RKASPage(BasePage):  # Inherit dari BasePage
         # Configure canvas window to resize with canvas
         self.canvas.bind('<Configure>', self.on_canvas_configure)
         
-        # Bind mouse wheel for scrolling
-        self.bind_mousewheel()
+        # Mouse wheel diarahkan ke canvas ini oleh router aplikasi (sekali, bukan tiap show)
+        self.main_app.wheel_router.register_canvas(self.canvas)
         
         # Build the actual page content
         self.setup_ui()
@@ -208,7 +220,6 @@ class RKASPage(BasePage):  # Inherit dari BasePage
         
         # PERBAIKAN: Pastikan footer memiliki tinggi minimum yang cukup
         footer_frame.configure(height=120)
-        footer_frame.update_idletasks()
         
 
     def add_link_hover_effect(self, widget, normal_color, hover_color):
@@ -224,75 +235,21 @@ class RKASPage(BasePage):  # Inherit dari BasePage
 
     def on_show(self):
         """Called when RKAS page is shown"""
-        # Bind mousewheel events
-        self.bind_mousewheel()
-        
-        # Force update canvas after showing
-        if self.canvas:
-            self.main_app.root.after(10, self.force_update_canvas)
-
-    def on_hide(self):
-        """Called when RKAS page is hidden"""
-        # Unbind mousewheel events
-        self.unbind_mousewheel()
+        # Update canvas after showing (also the inner RKAS/BKU canvases)
+        self.force_update_canvas()
 
     def force_update_canvas(self):
-        """Force update canvas size and scroll region"""
-        if self.canvas and self.canvas.winfo_exists():
-            self.canvas.update_idletasks()
-            self.scrollable_frame.update_idletasks()
-            
-            canvas_width = self.canvas.winfo_width()
-            if canvas_width > 1:
-                self.canvas.itemconfig(self.canvas_window, width=canvas_width)
-            
-            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-
-    def bind_mousewheel(self):
-        """Bind mouse wheel events for scrolling"""
-        def on_mousewheel(event):
-            if self.canvas and self.canvas.winfo_exists():
-                self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
+        """Schedule an update of canvas sizes and scroll regions"""
         if self.canvas:
-            self.canvas.bind("<MouseWheel>", on_mousewheel)
-            self.bind_mousewheel_recursive(self.scrollable_frame, on_mousewheel)
-
-    def bind_mousewheel_recursive(self, widget, callback):
-        """Recursively bind mousewheel to all child widgets"""
-        try:
-            widget.bind("<MouseWheel>", callback, add='+')
-            for child in widget.winfo_children():
-                self.bind_mousewheel_recursive(child, callback)
-        except tk.TclError:
-            pass
-
-    def unbind_mousewheel(self):
-        """Unbind mouse wheel events"""
-        try:
-            if self.canvas and self.canvas.winfo_exists():
-                self.canvas.unbind("<MouseWheel>")
-            if self.scrollable_frame and self.scrollable_frame.winfo_exists():
-                self.unbind_mousewheel_recursive(self.scrollable_frame)
-        except tk.TclError:
-            pass
-
-    def unbind_mousewheel_recursive(self, widget):
-        """Recursively unbind mousewheel from all child widgets"""
-        try:
-            widget.unbind("<MouseWheel>")
-            for child in widget.winfo_children():
-                self.unbind_mousewheel_recursive(child)
-        except tk.TclError:
-            pass
+            layout = self.main_app.layout
+            layout.fit_width(self.canvas, self.canvas_window)
+            layout.fit_width(self.rkas_canvas, self.rkas_canvas_window)
+            layout.fit_width(self.bku_canvas, self.bku_canvas_window)
 
     def on_canvas_configure(self, event):
         """Handle canvas resize events"""
-        if self.canvas and self.canvas.winfo_exists():
-            canvas_width = event.width
-            if canvas_width > 1:
-                self.canvas.itemconfig(self.canvas_window, width=canvas_width)
-                self.main_app.root.after_idle(self.force_update_canvas)
+        # Satu kali per idle, bukan per event selama window di-resize
+        self.main_app.layout.fit_width(self.canvas, self.canvas_window)
 
     def setup_ui(self):
         """Setup the main user interface - diubah untuk menggunakan scrollable_frame"""
@@ -303,7 +260,11 @@ class RKASPage(BasePage):  # Inherit dari BasePage
 
     def export_ringkasan_to_pdf(self):
         """Export ringkasan data to PDF with RKAS above and BKU realisasi below"""
-        if not self.processor.excel_data and self.processor.total_penerimaan == 0:
+        # Satu dialog progress untuk satu job background
+        if self.export_job is not None or self.upload_job is not None:
+            return
+        
+        if not self.processor.is_loaded and self.processor.total_penerimaan == 0:
             messagebox.showwarning("Peringatan", "Tidak ada data untuk diekspor!")
             return
         
@@ -317,224 +278,171 @@ class RKASPage(BasePage):  # Inherit dari BasePage
         if not file_path:
             return
         
-        try:
-            # Create PDF document with 2cm margins (approximately 56.7 points)
-            # 1 cm = 28.35 points, so 2 cm = 56.7 points
-            margin_2cm = 56.7
-            doc = SimpleDocTemplate(file_path, pagesize=A4, 
-                                rightMargin=margin_2cm, leftMargin=margin_2cm, 
-                                topMargin=margin_2cm, bottomMargin=margin_2cm)
-            
-            # Container for PDF elements
-            story = []
-            
-            # Get styles
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                alignment=TA_CENTER,
-                spaceAfter=25,
-                fontSize=14,
-                fontName='Helvetica-Bold'
-            )
-            
-            subtitle_style = ParagraphStyle(
-                'CustomSubtitle',
-                parent=styles['Heading2'],
-                alignment=TA_CENTER,
-                spaceAfter=15,
-                fontSize=12,
-                fontName='Helvetica-Bold'
-            )
-            
-            normal_style = ParagraphStyle(
-                'CustomNormal',
-                parent=styles['Normal'],
-                alignment=TA_LEFT,
-                spaceAfter=8,
-                fontSize=9
-            )
-            
-            # Header
-            story.append(Paragraph("LAPORAN RINGKASAN ANGGARAN", title_style))
-            story.append(Paragraph(f"SEKOLAH {self.processor.nama_sekolah}", subtitle_style))
-            story.append(Paragraph(f"Dicetak pada: {datetime.datetime.now().strftime('%d %B %Y, %H:%M:%S')}", normal_style))
-            story.append(Spacer(1, 15))
-            
-            # RKAS Section
-            story.append(Paragraph("RKAS (Rencana Kegiatan dan Anggaran Sekolah)", subtitle_style))
-            
-            # Get RKAS summary data
-            summary_data = self.processor.get_summary_data()
-            
-            # RKAS table data
-            rkas_data = [
-                ['Kategori', 'Jumlah (Rp)'],
-                ['PAGU TAHUN 2025', FormatUtils.format_currency(self.processor.total_penerimaan)],
-                ['BELANJA OPERASI', FormatUtils.format_currency(summary_data['total_belanja_operasi'])],
-                ['  BELANJA HONOR', FormatUtils.format_currency(summary_data['total_honor'])],
-                ['  BELANJA JASA', FormatUtils.format_currency(summary_data['jasa_sesungguhnya'])],
-                ['  BELANJA PEMELIHARAAN', FormatUtils.format_currency(summary_data['total_pemeliharaan'])],
-                ['  BELANJA PERJALANAN', FormatUtils.format_currency(summary_data['total_perjalanan'])],
-                ['  BELANJA PERSEDIAAN', FormatUtils.format_currency(summary_data['belanja_persediaan_ringkasan'])],
-                ['BELANJA MODAL', FormatUtils.format_currency(summary_data['belanja_modal'])],
-                ['  PERALATAN DAN MESIN', FormatUtils.format_currency(summary_data['total_peralatan'])],
-                ['  ASET TETAP LAINNYA', FormatUtils.format_currency(summary_data['total_aset_tetap'])],
-                ['TOTAL ANGGARAN', FormatUtils.format_currency(summary_data['total_anggaran'])]
-            ]
-            
-            # Create RKAS table with adjusted width for 2cm margins
-            # With 2cm margins on A4 (21cm width), available width is 17cm ≈ 4.8 inches
-            available_width = 4.8 * inch
-            rkas_table = Table(rkas_data, colWidths=[available_width * 0.7, available_width * 0.3])
-            rkas_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, 1), colors.lightgrey),  # PAGU
-                ('BACKGROUND', (0, 2), (-1, 2), colors.lightgrey),  # BELANJA OPERASI
-                ('BACKGROUND', (0, 8), (-1, 8), colors.lightgrey),  # BELANJA MODAL
-                ('BACKGROUND', (0, 11), (-1, 11), colors.lightgrey),  # TOTAL ANGGARAN
-                ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 2), (-1, 2), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 8), (-1, 8), 'Helvetica-Bold'),
-                ('FONTNAME', (0, 11), (-1, 11), 'Helvetica-Bold'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            
-            story.append(rkas_table)
-            story.append(Spacer(1, 20))
-            
-            # BKU Realisasi Section - All Triwulans
-            story.append(Paragraph("REALISASI BKU (Buku Kas Umum)", subtitle_style))
-            
-            if hasattr(self.processor, 'bku_data_available') and self.processor.bku_data_available:
-                for triwulan in ["Triwulan 1", "Triwulan 2", "Triwulan 3", "Triwulan 4"]:
-                    try:
-                        bku_summary_data = self.processor.get_bku_summary_data_by_triwulan(triwulan)
-                        if bku_summary_data and bku_summary_data.get('total_realisasi', 0) > 0:
-                            # Add triwulan subtitle
-                            story.append(Paragraph(f"Realisasi {triwulan}", 
-                                                ParagraphStyle('TW_Title', parent=styles['Heading3'], 
-                                                            alignment=TA_LEFT, fontSize=11, 
-                                                            fontName='Helvetica-Bold', spaceAfter=8)))
-                            
-                            # Calculate additional data
-                            total_realisasi_sampai_saat_ini = self._calculate_total_realisasi_sampai_saat_ini(triwulan)
-                            total_pagu_rkas = self.processor.total_penerimaan
-                            total_sisa_dana_1_tahun = total_pagu_rkas - total_realisasi_sampai_saat_ini
-                            total_sisa_dana_sampai_saat_ini = (total_pagu_rkas * 0.5) - total_realisasi_sampai_saat_ini
-                            persentase_realisasi = (total_realisasi_sampai_saat_ini / total_pagu_rkas * 100) if total_pagu_rkas > 0 else 0
-                            
-                            # BKU table data
-                            bku_data = [
-                                ['Kategori', 'Jumlah (Rp)'],
-                                ['BELANJA OPERASI', FormatUtils.format_currency(bku_summary_data['total_belanja_operasi_bku'])],
-                                ['  BELANJA HONOR', FormatUtils.format_currency(bku_summary_data['total_honor_bku'])],
-                                ['  BELANJA JASA', FormatUtils.format_currency(bku_summary_data['jasa_sesungguhnya_bku'])],
-                                ['  BELANJA PEMELIHARAAN', FormatUtils.format_currency(bku_summary_data['total_pemeliharaan_bku'])],
-                                ['  BELANJA PERJALANAN', FormatUtils.format_currency(bku_summary_data['total_perjalanan_bku'])],
-                                ['  BELANJA PERSEDIAAN', FormatUtils.format_currency(bku_summary_data['total_persediaan_bku'])],
-                                ['BELANJA MODAL', FormatUtils.format_currency(bku_summary_data['belanja_modal_bku'])],
-                                ['  PERALATAN DAN MESIN', FormatUtils.format_currency(bku_summary_data['total_peralatan_bku'])],
-                                ['  ASET TETAP LAINNYA', FormatUtils.format_currency(bku_summary_data['total_aset_tetap_bku'])],
-                                ['TOTAL REALISASI', FormatUtils.format_currency(bku_summary_data['total_realisasi'])],
-                                ['', ''],  # Separator
-                                [f'TOTAL REALISASI SAMPAI SAAT INI ({self._get_periode_text(triwulan)})', 
-                                FormatUtils.format_currency(total_realisasi_sampai_saat_ini)],
-                                ['TOTAL SISA DANA BOSP REGULER (1 TAHUN)', 
-                                FormatUtils.format_currency(total_sisa_dana_1_tahun)],
-                                ['TOTAL SISA DANA BOSP REGULER SAMPAI SAAT INI', 
-                                FormatUtils.format_currency(total_sisa_dana_sampai_saat_ini)],
-                                ['PERSENTASE REALISASI DANA BOSP SAMPAI SAAT INI', f'{persentase_realisasi:.2f}%']
-                            ]
-                            
-                            # Create BKU table with adjusted width for 2cm margins
-                            bku_table = Table(bku_data, colWidths=[available_width * 0.7, available_width * 0.3])
-                            bku_table.setStyle(TableStyle([
-                                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                                ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                                ('BACKGROUND', (0, 1), (-1, 1), colors.lightcoral),  # BELANJA OPERASI
-                                ('BACKGROUND', (0, 7), (-1, 7), colors.lightcoral),  # BELANJA MODAL
-                                ('BACKGROUND', (0, 10), (-1, 10), colors.lightcoral),  # TOTAL REALISASI
-                                ('BACKGROUND', (0, 12), (-1, 12), colors.lightgreen),  # TOTAL REALISASI SAMPAI SAAT INI
-                                ('BACKGROUND', (0, 13), (-1, 13), colors.lightblue),  # SISA DANA 1 TAHUN
-                                ('BACKGROUND', (0, 14), (-1, 14), colors.plum),  # SISA DANA 50%
-                                ('BACKGROUND', (0, 15), (-1, 15), colors.orange),  # PERSENTASE
-                                ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
-                                ('FONTNAME', (0, 7), (-1, 7), 'Helvetica-Bold'),
-                                ('FONTNAME', (0, 10), (-1, 10), 'Helvetica-Bold'),
-                                ('FONTNAME', (0, 12), (-1, 15), 'Helvetica-Bold'),
-                                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                            ]))
-                            
-                            story.append(bku_table)
-                            story.append(Spacer(1, 15))
-                            
-                    except Exception as e:
-                        print(f"Error processing {triwulan}: {e}")
-                        continue
-
-                # Laporan Keuangan Section
-                story.append(Paragraph("LAPORAN KEUANGAN REALISASI", subtitle_style))
-                
-                # Get laporan keuangan data for TW4 (full year)
-                laporan_data = self.processor.get_laporan_keuangan_data_by_triwulan("Triwulan 4")
-                
-                if laporan_data and laporan_data.get('grand_total', 0) > 0:
-                    # Laporan keuangan table data
-                    laporan_table_data = [
-                        ['Kategori', 'Jumlah (Rp)'],
-                        ['PAKAI HABIS', FormatUtils.format_currency(laporan_data['total_belanja_persediaan'])],
-                        ['BARANG DAN JASA', FormatUtils.format_currency(laporan_data['total_barang_dan_jasa'])],
-                        ['PERALATAN DAN MESIN', FormatUtils.format_currency(laporan_data['total_peralatan_mesin'])],
-                        ['ASET TETAP LAINNYA', FormatUtils.format_currency(laporan_data['total_aset_tetap'])],
-                        ['TOTAL REALISASI', FormatUtils.format_currency(laporan_data['grand_total'])]
-                    ]
-                    
-                    # Create laporan table
-                    laporan_table = Table(laporan_table_data, colWidths=[available_width * 0.7, available_width * 0.3])
-                    laporan_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, 0), 10),
-                        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                        ('FONTSIZE', (0, 1), (-1, -1), 8),
-                        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                        ('BACKGROUND', (0, 1), (-1, 4), colors.lightblue),  # Category items
-                        ('BACKGROUND', (0, 5), (-1, 5), colors.lightcoral),  # Total
-                        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica-Bold'),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                    ]))
-                    
-                    story.append(laporan_table)
-                    story.append(Spacer(1, 15))
-            else:
-                story.append(Paragraph("Data BKU tidak tersedia", normal_style))
-            
-            # Build PDF
-            doc.build(story)
-            messagebox.showinfo("Berhasil", f"Laporan PDF berhasil disimpan di:\n{file_path}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Gagal membuat PDF: {str(e)}")
+        include_details = False
+        if self.processor.bku_data_available:
+            include_details = messagebox.askyesno(
+                "Lampiran", "Sertakan lampiran rincian seluruh transaksi BKU?")
+        
+        self._set_export_button_state('disabled')
+        self._create_progress_dialog("Membuat Laporan PDF", self._cancel_export)
+        
+        # Snapshot tidak berubah selama export, jadi processor aman dibaca di worker
+        self.export_job = self.main_app.job_runner.submit(
+            self._export_pdf_job, self.processor, file_path, include_details,
+            name='export-pdf',
+            on_progress=self._update_progress,
+            on_done=self._on_export_done,
+            on_error=self._on_export_error,
+            on_cancel=self._on_export_cancelled
+        )
+
+    def export_all_schools_to_pdf(self):
+        """Export the ringkasan PDF of every school in the session, one file per school"""
+        if self.export_job is not None or self.upload_job is not None or not len(self.main_app.session):
+            return
+        
+        output_dir = filedialog.askdirectory(title="Pilih Folder untuk PDF Semua Sekolah")
+        if not output_dir:
+            return
+        
+        combined_path = None
+        if messagebox.askyesno("PDF Gabungan", "Buat juga satu PDF gabungan semua sekolah?"):
+            combined_path = os.path.join(output_dir, "Ringkasan_Semua_Sekolah.pdf")
+        
+        self.bulk_pdf_btn.config(state='disabled')
+        self._create_progress_dialog("Membuat PDF Semua Sekolah", lambda: self._cancel_export("PDF semua sekolah"))
+        
+        # Snapshot yang masih di memori dipakai apa adanya (PDF sama dengan layar),
+        # sekolah yang sudah dikeluarkan diekstrak ulang dari file di worker
+        sources = [entry.snapshot or entry.file_path for entry in self.main_app.session]
+        self.export_job = self.main_app.job_runner.submit(
+            self._bulk_export_job, sources, output_dir, combined_path,
+            name='bulk-export-pdf',
+            on_progress=self._update_progress,
+            on_done=self._on_bulk_export_done,
+            on_error=lambda error: self._on_export_error(error, "PDF semua sekolah"),
+            on_cancel=self._on_export_cancelled
+        )
+
+    def export_to_excel(self):
+        """Export reconciled RKAS vs BKU data of the current school (or all schools) to xlsx"""
+        if self.export_job is not None or self.upload_job is not None or not self.processor.is_loaded:
+            return
+        
+        session = self.main_app.session
+        sources = [self.main_app.snapshot]
+        if len(session) > 1:
+            answer = messagebox.askyesnocancel(
+                "Export Excel", "Ekspor semua sekolah di sesi ini?\n(Pilih 'No' untuk sekolah yang sedang dibuka saja)")
+            if answer is None:
+                return
+            if answer:
+                # Sekolah yang sudah dikeluarkan dari memori dimuat ulang di worker
+                sources = [entry.snapshot or entry.file_path for entry in session]
+        
+        file_path = filedialog.asksaveasfilename(
+            title="Simpan Data Rekonsiliasi",
+            defaultextension=".xlsx",
+            filetypes=[("Excel files", "*.xlsx")]
+        )
+        if not file_path:
+            return
+        
+        self.excel_export_btn.config(state='disabled')
+        self._create_progress_dialog("Membuat File Excel", lambda: self._cancel_export("file Excel"))
+        
+        self.export_job = self.main_app.job_runner.submit(
+            self._excel_export_job, sources, file_path,
+            name='export-excel',
+            on_progress=self._update_progress,
+            on_done=self._on_excel_export_done,
+            on_error=lambda error: self._on_export_error(error, "file Excel"),
+            on_cancel=self._on_export_cancelled
+        )
+
+    def _excel_export_job(self, job, sources, file_path):
+        """Stream the xlsx export (worker thread)"""
+        # Modul export baru dimuat saat pertama kali dipakai (startup lebih cepat)
+        from backend.excel_export import export_reconciled_workbook
+        
+        def processors():
+            for source in sources:
+                if isinstance(source, str):
+                    processor = BOSDataProcessor()
+                    processor.extract_excel_data(source, cancel_token=job.token)
+                    yield processor
+                else:
+                    yield source.processor
+        
+        export_reconciled_workbook(file_path, processors(), total=len(sources),
+                                   progress=job.report_progress, cancel_token=job.token)
+        return file_path
+
+    def _on_excel_export_done(self, file_path):
+        """Handle finished Excel export (Tk thread)"""
+        self._finish_export()
+        messagebox.showinfo("Berhasil", f"Data rekonsiliasi berhasil disimpan di:\n{file_path}")
+
+    def _bulk_export_job(self, job, sources, output_dir, combined_path):
+        """Render all schools across a process pool (worker thread)"""
+        from backend.bulk_report import generate_bulk_reports
+        
+        def report(done, total, result):
+            job.report_progress(done / total * 95, f"{done}/{total} sekolah selesai")
+        
+        return generate_bulk_reports(sources, output_dir, combined_path,
+                                     progress=report, cancel_token=job.token)
+
+    def _on_bulk_export_done(self, results):
+        """Handle finished bulk export (Tk thread)"""
+        self._finish_export()
+        failed = [result for result in results if result.error]
+        message = f"{len(results) - len(failed)} PDF sekolah berhasil dibuat."
+        if failed:
+            message += "\n\nGagal:\n" + "\n".join(
+                f"{os.path.basename(result.source)}: {result.error}" for result in failed)
+        messagebox.showinfo("Selesai", message)
+
+    def _export_pdf_job(self, job, processor, file_path, include_details=False):
+        """Build the ringkasan PDF in a background job (worker thread)"""
+        # reportlab baru dimuat saat export pertama
+        from backend.pdf_report import RingkasanReport
+        
+        return RingkasanReport(processor, include_details=include_details).build(
+            file_path, progress=job.report_progress, cancel_token=job.token)
+
+    def _finish_export(self):
+        """Common cleanup after an export job ends (Tk thread)"""
+        self.export_job = None
+        self._close_progress_dialog()
+        self._set_export_button_state('normal')
+        self._refresh_school_list()
+
+    def _on_export_done(self, file_path):
+        """Handle finished PDF export (Tk thread)"""
+        self._finish_export()
+        messagebox.showinfo("Berhasil", f"Laporan PDF berhasil disimpan di:\n{file_path}")
+
+    def _on_export_error(self, error, label="PDF"):
+        """Handle failed export (Tk thread), label names what was being made"""
+        self._finish_export()
+        messagebox.showerror("Error", f"Gagal membuat {label}: {str(error)}")
+
+    def _on_export_cancelled(self):
+        """Handle cancelled export (Tk thread)"""
+        self._finish_export()
+
+    def _cancel_export(self, label="PDF"):
+        """Request cancellation of the running export, label names what is being made"""
+        if self.export_job is not None and not self.export_job.cancelled:
+            self.export_job.cancel()
+            self.progress_label.config(text=f"Membatalkan pembuatan {label}...")
+            self.cancel_btn.config(state='disabled')
+
+    def _set_export_button_state(self, state):
+        """Enable/disable the Export PDF button of the BKU summary panel"""
+        if self.bku_summary_panel.action_button is not None:
+            self.bku_summary_panel.action_button.config(state=state)
 
     def _create_header(self):
         """Create header section with back button"""
@@ -617,17 +525,38 @@ class RKASPage(BasePage):  # Inherit dari BasePage
         self.file_label = tk.Label(upload_frame, text="Belum ada file yang dipilih", 
                                 font=('Arial', 10), bg='#ecf0f1', fg='#7f8c8d')
         self.file_label.pack(pady=5)
+        
+        # Sekolah yang sudah dimuat di sesi ini, pindah tanpa upload ulang
+        school_frame = tk.Frame(upload_frame, bg='#ecf0f1')
+        school_frame.pack(pady=(0, 10))
+        
+        tk.Label(school_frame, text="Sekolah:", font=('Arial', 10, 'bold'),
+                 bg='#ecf0f1', fg='#2c3e50').pack(side='left', padx=(0, 5))
+        
+        self.school_combo = ttk.Combobox(school_frame, state='disabled', width=50)
+        self.school_combo.pack(side='left')
+        self.school_combo.bind('<<ComboboxSelected>>', self._on_school_selected)
+        
+        self.bulk_pdf_btn = tk.Button(school_frame, text="📄 PDF Semua Sekolah", command=self.export_all_schools_to_pdf,
+                                      bg='#e74c3c', fg='white', font=('Arial', 9, 'bold'),
+                                      padx=10, cursor='hand2', state='disabled')
+        self.bulk_pdf_btn.pack(side='left', padx=(5, 0))
+        
+        self.excel_export_btn = tk.Button(school_frame, text="📊 Export Excel", command=self.export_to_excel,
+                                          bg='#27ae60', fg='white', font=('Arial', 9, 'bold'),
+                                          padx=10, cursor='hand2', state='disabled')
+        self.excel_export_btn.pack(side='left', padx=(5, 0))
 
-    def _create_progress_dialog(self):
+    def _create_progress_dialog(self, title="Memproses File Excel", on_cancel=None):
         """Create progress dialog window - CENTERED VERSION"""
+        on_cancel = on_cancel or self._cancel_upload
         self.progress_window = tk.Toplevel(self.main_app.root)
-        self.progress_window.title("Memproses File Excel")
-        self.progress_window.geometry("400x150")
+        self.progress_window.title(title)
+        self.progress_window.geometry("400x190")
         self.progress_window.resizable(False, False)
         
-        # Center the progress window
+        # Non-modal: data sebelumnya tetap bisa dijelajahi selama file baru dimuat
         self.progress_window.transient(self.main_app.root)
-        self.progress_window.grab_set()
         
         # FIXED: Center positioning - gunakan screen dimensions
         # Get screen dimensions
@@ -636,7 +565,7 @@ class RKASPage(BasePage):  # Inherit dari BasePage
         
         # Calculate position for center
         window_width = 400
-        window_height = 150
+        window_height = 190
         x = (screen_width - window_width) // 2
         y = (screen_height - window_height) // 2
         
@@ -676,6 +605,22 @@ class RKASPage(BasePage):  # Inherit dari BasePage
         )
         self.percentage_label.pack()
         
+        # Cancel button - menghentikan ekstraksi, data sebelumnya tetap utuh
+        self.cancel_btn = tk.Button(
+            progress_frame,
+            text="Batal",
+            command=on_cancel,
+            bg='#e74c3c',
+            fg='white',
+            font=('Arial', 10, 'bold'),
+            padx=15,
+            cursor='hand2',
+            relief='raised',
+            bd=2
+        )
+        self.cancel_btn.pack(pady=(10, 0))
+        self.progress_window.protocol("WM_DELETE_WINDOW", on_cancel)
+        
         # Style the progress bar
         style = ttk.Style()
         style.configure(
@@ -688,60 +633,46 @@ class RKASPage(BasePage):  # Inherit dari BasePage
         )
 
     def _update_progress(self, progress, message):
-        """Update progress bar and message"""
+        """Update progress bar and message (Tk thread, dipanggil oleh job runner)"""
         if hasattr(self, 'progress_window') and self.progress_window.winfo_exists():
             self.progress_bar['value'] = progress
             self.progress_label.config(text=message)
             self.percentage_label.config(text=f"{int(progress)}%")
-            self.progress_window.update()
+
+    def _cancel_upload(self):
+        """Request cancellation of the running upload job"""
+        if self.upload_job is not None and not self.upload_job.cancelled:
+            self.upload_job.cancel()
+            self.progress_label.config(text="Membatalkan pemrosesan...")
+            self.cancel_btn.config(state='disabled')
 
     def _close_progress_dialog(self):
         """Close progress dialog"""
         if hasattr(self, 'progress_window') and self.progress_window.winfo_exists():
-            self.progress_window.grab_release()
             self.progress_window.destroy()
 
-    def _process_excel_with_progress(self, file_path):
-        """Process Excel file with progress updates"""
-        try:
-            # Step 1: Initialize
-            self._update_progress(10, "Membaca file Excel...")
-            time.sleep(0.2)
-            
-            # Step 2: Extract Excel data
-            self._update_progress(30, "Mengekstrak data RKAS...")
-            self.processor.extract_excel_data(file_path)
-            time.sleep(0.3)
-            
-            # Step 3: Process RKAS data
-            self._update_progress(60, "Memproses data anggaran...")
-            time.sleep(0.2)
-            
-            # Step 4: Process BKU data (if available)
-            if hasattr(self.processor, 'bku_data_available') and self.processor.bku_data_available:
-                self._update_progress(80, "Memproses data BKU...")
-                time.sleep(0.3)
-            else:
-                self._update_progress(80, "Menyelesaikan pemrosesan...")
-                time.sleep(0.2)
-            
-            # Step 5: Finalize
-            self._update_progress(95, "Mempersiapkan tampilan...")
-            time.sleep(0.2)
-            
-            # Step 6: Complete
-            self._update_progress(100, "Selesai!")
-            time.sleep(0.3)
-            
-            # Success flag
-            self.processing_success = True
-            self.processing_error = None
-            
-        except Exception as e:
-            self.processing_success = False
-            self.processing_error = str(e)
-            self._update_progress(100, f"Error: {str(e)}")
-            time.sleep(1)
+    def _process_excel_with_progress(self, job, file_path, previous=None, save=True):
+        """
+        Load an Excel file into a new snapshot in a background job (worker thread).
+        The current snapshot is untouched until the page swaps the result in.
+        `previous` is the resident snapshot of the same file, if any, so an
+        appended BKU ledger only parses its new rows. With save=False (reload
+        of a school already in the session) nothing is written to the store.
+        Returns (snapshot, estimated size, store error or None) so the session
+        budget is not computed on the Tk thread.
+        """
+        snapshot = load_snapshot(file_path, cancel_token=job.token, progress=job.report_progress,
+                                 previous=previous)
+        store_error = None
+        if save and self.main_app.store is not None:
+            from backend.store import STORE_ERRORS  # sudah dimuat oleh main app
+            # Gagal simpan (DB terkunci, disk penuh, tahun tidak diketahui) tidak
+            # menggagalkan upload; ANALYZE hanya dijalankan oleh import CLI / watcher
+            try:
+                self.main_app.store.save_processor(snapshot.processor, source_path=file_path, analyze=False)
+            except STORE_ERRORS as e:
+                store_error = e
+        return snapshot, estimate_size(snapshot), store_error
 
     def _create_button_section(self):
         """Create navigation button section - diubah untuk menggunakan scrollable_frame"""
@@ -764,6 +695,11 @@ class RKASPage(BasePage):  # Inherit dari BasePage
 
     def _create_split_results_section(self):
         """Create split results display section - diubah untuk menggunakan scrollable_frame"""
+        # Style untuk memperbesar font tabel - cukup sekali
+        style = ttk.Style()
+        style.configure("Treeview", font=('Arial', 10))
+        style.configure("Treeview.Heading", font=('Arial', 12, 'bold'))
+        
         # Main container for split results
         self.main_results_container = tk.Frame(self.scrollable_frame, bg='#f0f0f0', height=620)
         self.main_results_container.pack(fill='both', expand=True, padx=10, pady=10)
@@ -808,36 +744,69 @@ class RKASPage(BasePage):  # Inherit dari BasePage
         # Bind RKAS events
         self.rkas_frame.bind('<Configure>', self._on_rkas_frame_configure)
         self.rkas_canvas.bind('<Configure>', self._on_rkas_canvas_configure)
-        self.rkas_canvas.bind("<MouseWheel>", self._on_rkas_mousewheel)
-        self.rkas_canvas.bind("<Button-4>", self._on_rkas_mousewheel)
-        self.rkas_canvas.bind("<Button-5>", self._on_rkas_mousewheel)
+        # Wheel di atas tabel RKAS menggulir area RKAS dulu, lalu halaman jika sudah mentok
+        self.main_app.wheel_router.register_canvas(self.rkas_canvas)
+        
+        # Panel RKAS dibuat sekali, lalu hanya isinya yang diperbarui
+        self._create_rkas_panels()
         
         # Create initial RKAS placeholder
         self._create_rkas_placeholder()
 
+    def _create_rkas_panels(self):
+        """Create persistent RKAS panels (placeholder, detail table, ringkasan)"""
+        self.rkas_stack = PanelStack()
+        self.rkas_message_panel = MessagePanel(self.rkas_frame)
+        
+        self.rkas_detail_panel = TablePanel(
+            self.rkas_frame,
+            ('Kode Rekening', 'Kode Kegiatan', 'Uraian', 'Jumlah (Rp)'),
+            {
+                'Kode Rekening': {'width': 120, 'anchor': 'center'},
+                'Kode Kegiatan': {'width': 100, 'anchor': 'center'},
+                'Uraian': {'width': 280, 'anchor': 'w'},
+                'Jumlah (Rp)': {'width': 120, 'anchor': 'w'}
+            })
+        
+        self.rkas_ringkasan_panel = TablePanel(
+            self.rkas_frame,
+            ('Kategori', 'Jumlah (Rp)'),
+            {
+                'Kategori': {'width': 320, 'anchor': 'w'},
+                'Jumlah (Rp)': {'width': 160, 'anchor': 'w'}
+            },
+            school_pack={'anchor': 'w', 'pady': 5})
+        self.rkas_ringkasan_panel.table.tag_configure('highlight', background='#2ecc71', foreground='white')
+
+    def _show_rkas_panel(self, panel):
+        """Switch the visible RKAS panel and reset scroll position"""
+        self.rkas_canvas.yview_moveto(0)
+        self.rkas_stack.show(panel)
+        self.main_app.layout.update_scrollregion(self.rkas_canvas)
+
     def _create_rkas_placeholder(self):
         """Create placeholder content for RKAS section"""
         # Check if RKAS data is available
-        if hasattr(self.processor, 'excel_data') and self.processor.excel_data:
+        if self.processor.is_loaded:
             # If data is available but no specific category is selected
-            instruction_label = tk.Label(self.rkas_frame, 
-                                    text="Pilih kategori anggaran\nuntuk melihat data RKAS", 
-                                    font=('Arial', 14, 'bold'), 
-                                    fg='#2c3e50', bg='#ffffff', pady=30)
-            instruction_label.pack(expand=True)
-            
-            detail_label = tk.Label(self.rkas_frame, 
-                                text="Data RKAS tersedia.\nKlik salah satu tombol kategori di atas.", 
-                                font=('Arial', 12), 
-                                fg='#7f8c8d', bg='#ffffff')
-            detail_label.pack(pady=10)
+            lines = [
+                ({'text': "Pilih kategori anggaran\nuntuk melihat data RKAS",
+                  'font': ('Arial', 14, 'bold'), 'fg': '#2c3e50', 'pady': 30},
+                 {'expand': True}),
+                ({'text': "Data RKAS tersedia.\nKlik salah satu tombol kategori di atas.",
+                  'font': ('Arial', 12), 'fg': '#7f8c8d'},
+                 {'pady': 10})
+            ]
         else:
             # Original placeholder when no RKAS data
-            placeholder_label = tk.Label(self.rkas_frame, 
-                                    text="Fitur RKAS\n(Upload File Terlebih Dahulu, Lalu Pilih Kategori)", 
-                                    font=('Arial', 16, 'italic'), 
-                                    fg='#7f8c8d', bg='#ffffff', pady=50)
-            placeholder_label.pack(expand=True)
+            lines = [
+                ({'text': "Fitur RKAS\n(Upload File Terlebih Dahulu, Lalu Pilih Kategori)",
+                  'font': ('Arial', 16, 'italic'), 'fg': '#7f8c8d', 'pady': 50},
+                 {'expand': True})
+            ]
+        
+        self.rkas_message_panel.set_lines(lines)
+        self._show_rkas_panel(self.rkas_message_panel)
 
     def _create_bku_section(self):
         """Create BKU Realisasi section on the right with Triwulan dropdown"""
@@ -887,9 +856,10 @@ class RKASPage(BasePage):  # Inherit dari BasePage
         # Bind BKU events
         self.bku_frame.bind('<Configure>', self._on_bku_frame_configure)
         self.bku_canvas.bind('<Configure>', self._on_bku_canvas_configure)
-        self.bku_canvas.bind("<MouseWheel>", self._on_bku_mousewheel)
-        self.bku_canvas.bind("<Button-4>", self._on_bku_mousewheel)
-        self.bku_canvas.bind("<Button-5>", self._on_bku_mousewheel)
+        self.main_app.wheel_router.register_canvas(self.bku_canvas)
+        
+        # Panel BKU dibuat sekali, lalu hanya isinya yang diperbarui
+        self._create_bku_panels()
         
         # Placeholder content for BKU section
         self._create_bku_placeholder()
@@ -910,8 +880,57 @@ class RKASPage(BasePage):  # Inherit dari BasePage
             if self.selected_triwulan.get() == "Laporan Keuangan":
                 self.selected_triwulan.set("Triwulan 1")
 
+    def _create_bku_panels(self):
+        """Create persistent BKU panels (placeholder, detail table, ringkasan, laporan keuangan)"""
+        self.bku_stack = PanelStack()
+        self.bku_message_panel = MessagePanel(self.bku_frame)
+        
+        self.bku_detail_panel = TablePanel(
+            self.bku_frame,
+            ('Tanggal', 'Kode Rekening', 'Kode Kegiatan', 'Uraian', 'Jumlah (Rp)'),
+            {
+                'Tanggal': {'width': 80, 'anchor': 'center'},
+                'Kode Rekening': {'width': 100, 'anchor': 'center'},
+                'Kode Kegiatan': {'width': 80, 'anchor': 'center'},
+                'Uraian': {'width': 250, 'anchor': 'w'},
+                'Jumlah (Rp)': {'width': 120, 'anchor': 'w'}
+            })
+        
+        summary_columns = ('Kategori', 'Jumlah (Rp)')
+        summary_column_options = {
+            'Kategori': {'width': 320, 'anchor': 'w'},
+            'Jumlah (Rp)': {'width': 160, 'anchor': 'w'}
+        }
+        
+        self.bku_summary_panel = TablePanel(
+            self.bku_frame, summary_columns, summary_column_options,
+            school_pack={'anchor': 'w', 'pady': (10, 5), 'padx': 10},
+            action={'text': "📄 Export PDF", 'command': self.export_ringkasan_to_pdf,
+                    'bg': '#e74c3c', 'hover_bg': '#c0392b'})
+        summary_table = self.bku_summary_panel.table
+        summary_table.tag_configure('highlight', background='#e74c3c', foreground='white')
+        summary_table.tag_configure('green_highlight', background='#27ae60', foreground='white')
+        summary_table.tag_configure('blue_highlight', background='#3498db', foreground='white')
+        summary_table.tag_configure('purple_highlight', background='#9b59b6', foreground='white')
+        summary_table.tag_configure('orange_highlight', background='#e67e22', foreground='white')
+        
+        self.bku_laporan_panel = TablePanel(
+            self.bku_frame, summary_columns, summary_column_options,
+            school_pack={'anchor': 'w', 'pady': (10, 5), 'padx': 10})
+        self.bku_laporan_panel.table.tag_configure('category', background='#3498db', foreground='white')
+        self.bku_laporan_panel.table.tag_configure('total_highlight', background='#e74c3c', foreground='white')
+
+    def _show_bku_panel(self, panel):
+        """Switch the visible BKU panel and reset scroll position"""
+        self.bku_canvas.yview_moveto(0)
+        self.bku_stack.show(panel)
+        self.main_app.layout.update_scrollregion(self.bku_canvas)
+
     def _create_bku_placeholder(self):
         """Create placeholder content for BKU section - FIXED untuk include Belanja Jasa"""
+        # Placeholder menggantikan render BKU yang masih tertunda di UI scheduler
+        self.main_app.ui_tasks.cancel(BKU_DISPLAY_CHANNEL)
+        
         # Check if BKU data is available
         if hasattr(self.processor, 'bku_data_available') and self.processor.bku_data_available:
             # Check if current active tab supports BKU display
@@ -921,31 +940,31 @@ class RKASPage(BasePage):  # Inherit dari BasePage
             
             if current_tab in supported_categories:
                 # Show instruction to select triwulan
-                instruction_label = tk.Label(self.bku_frame, 
-                                        text="Pilih Triwulan untuk melihat\ndata realisasi BKU", 
-                                        font=('Arial', 14, 'bold'), 
-                                        fg='#2c3e50', bg='#ffffff', pady=30)
-                instruction_label.pack(expand=True)
-                
-                detail_label = tk.Label(self.bku_frame, 
-                                    text="Data BKU tersedia.\nGunakan dropdown di atas untuk memilih periode.", 
-                                    font=('Arial', 12), 
-                                    fg='#7f8c8d', bg='#ffffff')
-                detail_label.pack(pady=10)
+                lines = [
+                    ({'text': "Pilih Triwulan untuk melihat\ndata realisasi BKU",
+                      'font': ('Arial', 14, 'bold'), 'fg': '#2c3e50', 'pady': 30},
+                     {'expand': True}),
+                    ({'text': "Data BKU tersedia.\nGunakan dropdown di atas untuk memilih periode.",
+                      'font': ('Arial', 12), 'fg': '#7f8c8d'},
+                     {'pady': 10})
+                ]
             else:
                 # Show message for non-supported categories
-                placeholder_label = tk.Label(self.bku_frame, 
-                                        text="Fitur Realisasi BKU\nTidak tersedia untuk kategori ini", 
-                                        font=('Arial', 14, 'italic'), 
-                                        fg='#7f8c8d', bg='#ffffff', pady=50)
-                placeholder_label.pack(expand=True)
+                lines = [
+                    ({'text': "Fitur Realisasi BKU\nTidak tersedia untuk kategori ini",
+                      'font': ('Arial', 14, 'italic'), 'fg': '#7f8c8d', 'pady': 50},
+                     {'expand': True})
+                ]
         else:
             # Original placeholder when no BKU data
-            placeholder_label = tk.Label(self.bku_frame, 
-                                    text="Fitur Realisasi BKU\n(Upload File Terlebih Dahulu, Lalu Pilih Kategori)", 
-                                    font=('Arial', 16, 'italic'), 
-                                    fg='#7f8c8d', bg='#ffffff', pady=50)
-            placeholder_label.pack(expand=True)
+            lines = [
+                ({'text': "Fitur Realisasi BKU\n(Upload File Terlebih Dahulu, Lalu Pilih Kategori)",
+                  'font': ('Arial', 16, 'italic'), 'fg': '#7f8c8d', 'pady': 50},
+                 {'expand': True})
+            ]
+        
+        self.bku_message_panel.set_lines(lines)
+        self._show_bku_panel(self.bku_message_panel)
 
     def on_triwulan_changed(self, event=None):
         """Handle triwulan dropdown selection change - UPDATED dengan conditional Laporan Keuangan"""
@@ -962,14 +981,14 @@ class RKASPage(BasePage):  # Inherit dari BasePage
             else:
                 # Determine current triwulan based on active tab or default to TW4
                 current_tw = "Triwulan 4"  # Default atau bisa diambil dari logika lain
-                self._display_laporan_keuangan(current_tw)
+                self._schedule_bku_display(self._display_laporan_keuangan, current_tw)
                 return
         
         # Check if we're currently on Ringkasan tab
         if self.active_tab == "Ringkasan":
             # Update BKU summary display
             if hasattr(self.processor, 'bku_data_available') and self.processor.bku_data_available:
-                self._display_bku_summary_for_triwulan(selected)
+                self._schedule_bku_display(self._display_bku_summary_for_triwulan, selected)
             return
         
         # For other supported categories
@@ -984,310 +1003,256 @@ class RKASPage(BasePage):  # Inherit dari BasePage
                 "Aset Tetap": "Aset Tetap",
                 "Belanja Jasa": "Belanja Jasa"
             }
-            self._display_bku_for_category(category_map[self.active_tab])
+            self._schedule_bku_display(self._display_bku_for_category, category_map[self.active_tab])
+
+    def _schedule_bku_display(self, display, *args):
+        """
+        Render the BKU side through the UI scheduler, after the RKAS side has
+        been drawn. A newer click (category or triwulan) cancels a BKU render
+        that has not run yet, so an outdated triwulan is never shown.
+        """
+        self.main_app.ui_tasks.submit(self._bku_display_task, display, args,
+                                      name=display.__name__, channel=BKU_DISPLAY_CHANNEL)
+
+    def _bku_display_task(self, display, args):
+        """Generator task: give the event loop a turn, then render"""
+        yield
+        display(*args)
 
     def _display_laporan_keuangan(self, current_triwulan):
         """Display laporan keuangan data sampai triwulan saat ini"""
-        # Clear current BKU content
-        for widget in self.bku_frame.winfo_children():
-            widget.destroy()
-            
-        # Reset BKU canvas scroll position to top
-        self.bku_canvas.yview_moveto(0)
-        
         # Check if BKU data is available
         if not hasattr(self.processor, 'bku_data_available') or not self.processor.bku_data_available:
             self._create_bku_placeholder()
             return
         
-        # Get laporan keuangan data
-        laporan_data = self.processor.get_laporan_keuangan_data_by_triwulan(current_triwulan)
+        view_model = self.view_models.laporan_keuangan.get(current_triwulan) if self.view_models else None
         
-        if not laporan_data or laporan_data.get('grand_total', 0) == 0:
+        if view_model is None:
             # No data
-            no_data_label = tk.Label(self.bku_frame, 
-                                text="Tidak ada data laporan keuangan", 
-                                font=('Arial', 14, 'bold'), 
-                                fg='#e74c3c', bg='#ffffff', pady=30)
-            no_data_label.pack(expand=True)
+            self.bku_message_panel.set_lines([
+                ({'text': "Tidak ada data laporan keuangan",
+                  'font': ('Arial', 14, 'bold'), 'fg': '#e74c3c', 'pady': 30},
+                 {'expand': True})
+            ])
+            self._show_bku_panel(self.bku_message_panel)
             return
         
-        # Title frame
-        title_frame = tk.Frame(self.bku_frame, bg='#ffffff')
-        title_frame.pack(fill='x', pady=(20, 10))
-        
-        title_label = tk.Label(title_frame, 
-                            text=f"Laporan Keuangan Realisasi", 
-                            font=('Arial', 14, 'bold'), 
-                            bg='#ffffff', fg='#2c3e50')
-        title_label.pack()
-        
-        # Create table frame
-        table_frame = tk.Frame(self.bku_frame, bg='#ffffff')
-        table_frame.pack(fill='both', expand=True, padx=10, pady=10)
-        
-        # Create treeview for laporan data
-        columns = ('Kategori', 'Jumlah (Rp)')
-        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
-        
-        # Configure column headings and widths
-        for col in columns:
-            tree.heading(col, text=col)
-        
-        tree.column('Kategori', width=320, anchor='w')
-        tree.column('Jumlah (Rp)', width=160, anchor='w')
-        
-        # Data laporan keuangan
-        laporan_items = [
-            ("PAKAI HABIS", laporan_data['total_belanja_persediaan'], True),
-            ("BARANG DAN JASA", laporan_data['total_barang_dan_jasa'], True),
-            ("PERALATAN DAN MESIN", laporan_data['total_peralatan_mesin'], True),
-            ("ASET TETAP LAINNYA", laporan_data['total_aset_tetap'], True),
-            ("", "", False),  # Separator
-            ("TOTAL REALISASI", laporan_data['grand_total'], "total")
-        ]
-        
-        # Insert data into table
-        for kategori, jumlah, style in laporan_items:
-            # Handle empty separator row
-            if kategori == "" and jumlah == "":
-                tree.insert('', 'end', values=("", ""))
-                continue
-            
-            formatted_jumlah = FormatUtils.format_currency(jumlah)
-            item_id = tree.insert('', 'end', values=(kategori, formatted_jumlah))
-            
-            # Set background color based on style
-            if style == True:  # Category items
-                tree.tag_configure('category', background='#3498db', foreground='white')
-                tree.item(item_id, tags=('category',))
-            elif style == "total":  # Total row
-                tree.tag_configure('total_highlight', background='#e74c3c', foreground='white')
-                tree.item(item_id, tags=('total_highlight',))
-        
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        tree.pack(side='left', fill='both', expand=True)
-        scrollbar.pack(side='right', fill='y')
-        
-        # Summary section
-        summary_frame = tk.Frame(self.bku_frame, bg='#ecf0f1', relief='raised', bd=1)
-        summary_frame.pack(fill='x', padx=10, pady=10)
-        
-        # School name
-        school_label = tk.Label(summary_frame, 
-                            text=f"SEKOLAH {self.processor.nama_sekolah}", 
-                            font=('Arial', 10, 'bold'), bg='#ecf0f1', fg='#2c3e50')
-        school_label.pack(anchor='w', pady=(10, 5), padx=10)
-        
-        # Update canvas scroll region
-        self.bku_frame.update_idletasks()
-        self.bku_canvas.configure(scrollregion=self.bku_canvas.bbox("all"))
+        self.bku_laporan_panel.bind(view_model)
+        self._show_bku_panel(self.bku_laporan_panel)
 
     def _display_bku_for_category(self, category):
         """Display BKU data for specific category with appropriate summary format - FIXED"""
-        # Clear current BKU content
-        for widget in self.bku_frame.winfo_children():
-            widget.destroy()
-            
-        # Reset BKU canvas scroll position to top
-        self.bku_canvas.yview_moveto(0)
-        
         # Check if BKU data is available
         if not hasattr(self.processor, 'bku_data_available') or not self.processor.bku_data_available:
             self._create_bku_placeholder()
             return
         
-        # Set default triwulan and get data
+        # For other categories, show placeholder
+        if category not in BKU_CATEGORIES:
+            self._create_bku_placeholder()
+            return
+        
+        # Ambil view model yang sudah diformat untuk kategori dan triwulan terpilih
         selected_triwulan = self.selected_triwulan.get()
+        view_model = self.view_models.bku.get((category, selected_triwulan)) if self.view_models else None
         
-        # Get BKU data based on category dan panggil method yang sesuai
-        if category == "Belanja Jasa":  # FIXED: gunakan nama yang konsisten
-            bku_data = self.processor.get_bku_belanja_jasa_by_triwulan(selected_triwulan)
-            title = f"Realisasi Belanja Jasa (5.1.02.02) - {selected_triwulan}"
-            if bku_data:
-                # KHUSUS JASA - gunakan method dengan breakdown honor
-                self._display_bku_jasa_data(selected_triwulan, bku_data, title)
-            else:
-                # No data handling untuk Jasa
-                self._handle_no_bku_data(selected_triwulan)
-        elif category == "Belanja Persediaan":
-            bku_data = self.processor.get_bku_belanja_persediaan_by_triwulan(selected_triwulan)
-            title = f"Realisasi Belanja Persediaan (5.1.02.01) - {selected_triwulan}"
-            if bku_data:
-                self._display_bku_data_generic(selected_triwulan, bku_data, title)
-            else:
-                self._handle_no_bku_data(selected_triwulan)
-        elif category == "Pemeliharaan":
-            bku_data = self.processor.get_bku_belanja_pemeliharaan_by_triwulan(selected_triwulan)
-            title = f"Realisasi Belanja Pemeliharaan (5.1.02.03) - {selected_triwulan}"
-            if bku_data:
-                self._display_bku_data_generic(selected_triwulan, bku_data, title)
-            else:
-                self._handle_no_bku_data(selected_triwulan)
-        elif category == "Perjalanan Dinas":
-            bku_data = self.processor.get_bku_belanja_perjalanan_by_triwulan(selected_triwulan)
-            title = f"Realisasi Belanja Perjalanan Dinas (5.1.02.04) - {selected_triwulan}"
-            if bku_data:
-                self._display_bku_data_generic(selected_triwulan, bku_data, title)
-            else:
-                self._handle_no_bku_data(selected_triwulan)
-        elif category == "Peralatan":
-            bku_data = self.processor.get_bku_peralatan_by_triwulan(selected_triwulan)
-            title = f"Realisasi Peralatan dan Mesin (5.2.02 & 5.2.04) - {selected_triwulan}"
-            if bku_data:
-                self._display_bku_data_generic(selected_triwulan, bku_data, title)
-            else:
-                self._handle_no_bku_data(selected_triwulan)
-        elif category == "Aset Tetap":
-            bku_data = self.processor.get_bku_aset_tetap_by_triwulan(selected_triwulan)
-            title = f"Realisasi Aset Tetap Lainnya (5.2.05) - {selected_triwulan}"
-            if bku_data:
-                self._display_bku_data_generic(selected_triwulan, bku_data, title)
-            else:
-                self._handle_no_bku_data(selected_triwulan)
-        else:
-            # For other categories, show placeholder
-            self._create_bku_placeholder()
+        if view_model is None:
+            self._handle_no_bku_data(selected_triwulan)
             return
         
-        # Update canvas scroll region
-        self.bku_frame.update_idletasks()
-        self.bku_canvas.configure(scrollregion=self.bku_canvas.bbox("all"))
+        # Belanja Jasa sudah membawa breakdown honor di totals view model
+        self.bku_detail_panel.bind(view_model)
+        self._show_bku_panel(self.bku_detail_panel)
 
     def _handle_no_bku_data(self, selected_triwulan):
         """Handle case when no BKU data is available for selected triwulan"""
-        no_data_label = tk.Label(self.bku_frame, 
-                            text=f"Tidak ada data realisasi\nuntuk {selected_triwulan}", 
-                            font=('Arial', 14, 'bold'), 
-                            fg='#e74c3c', bg='#ffffff', pady=30)
-        no_data_label.pack(expand=True)
-        
-        # Show triwulan status
-        self._show_triwulan_status(selected_triwulan)
+        self.bku_message_panel.set_lines([
+            ({'text': f"Tidak ada data realisasi\nuntuk {selected_triwulan}",
+              'font': ('Arial', 14, 'bold'), 'fg': '#e74c3c', 'pady': 30},
+             {'expand': True}),
+            # Show triwulan status
+            self._get_triwulan_status_line(selected_triwulan)
+        ])
+        self._show_bku_panel(self.bku_message_panel)
 
     # RKAS Canvas Event Handlers
     def _on_rkas_frame_configure(self, event):
         """Handle RKAS frame configure event for vertical scrolling"""
-        self.rkas_canvas.configure(scrollregion=self.rkas_canvas.bbox("all"))
+        self.main_app.layout.update_scrollregion(self.rkas_canvas)
 
     def _on_rkas_canvas_configure(self, event):
         """Handle RKAS canvas configure event"""
-        canvas_width = self.rkas_canvas.winfo_width()
-        self.rkas_canvas.itemconfig(self.rkas_canvas_window, width=canvas_width)
-
-    def _on_rkas_mousewheel(self, event):
-        """Handle mouse wheel scrolling for RKAS area"""
-        if event.delta:
-            self.rkas_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        elif event.num == 4:
-            self.rkas_canvas.yview_scroll(-1, "units")
-        elif event.num == 5:
-            self.rkas_canvas.yview_scroll(1, "units")
+        self.main_app.layout.fit_width(self.rkas_canvas, self.rkas_canvas_window)
 
     # BKU Canvas Event Handlers
     def _on_bku_frame_configure(self, event):
         """Handle BKU frame configure event for vertical scrolling"""
-        self.bku_canvas.configure(scrollregion=self.bku_canvas.bbox("all"))
+        self.main_app.layout.update_scrollregion(self.bku_canvas)
 
     def _on_bku_canvas_configure(self, event):
         """Handle BKU canvas configure event"""
-        canvas_width = self.bku_canvas.winfo_width()
-        self.bku_canvas.itemconfig(self.bku_canvas_window, width=canvas_width)
-
-    def _on_bku_mousewheel(self, event):
-        """Handle mouse wheel scrolling for BKU area"""
-        if event.delta:
-            self.bku_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        elif event.num == 4:
-            self.bku_canvas.yview_scroll(-1, "units")
-        elif event.num == 5:
-            self.bku_canvas.yview_scroll(1, "units")
+        self.main_app.layout.fit_width(self.bku_canvas, self.bku_canvas_window)
 
     def upload_excel(self):
         """Handle Excel file upload with progress bar"""
+        # Satu job background dalam satu waktu; jangan buka dialog yang pilihannya akan dibuang
+        if self.export_job is not None:
+            messagebox.showinfo("Info", "Tunggu hingga proses export selesai sebelum memilih file baru.")
+            return
+        
         file_path = filedialog.askopenfilename(
             title="Pilih File Excel RKAS", 
             filetypes=[("Excel files", "*.xlsx")]
         )
         
         if file_path:
-            # Initialize processing flags
-            self.processing_success = False
-            self.processing_error = None
-            
-            # Disable upload button during processing
-            self.upload_btn.config(state='disabled', text="Pilih File Excel (.xlsx)")
-            
-            # Create and show progress dialog
-            self._create_progress_dialog()
-            
-            # Start processing in separate thread
-            processing_thread = threading.Thread(
-                target=self._process_excel_with_progress,
-                args=(file_path,)
-            )
-            processing_thread.daemon = True
-            processing_thread.start()
+            self._start_load(file_path, self._on_processing_done)
+
+    def _start_load(self, file_path, on_done, save=True):
+        """Load file_path in a background job, used by upload and school reload"""
+        # Disable upload button and school selector during processing
+        self.upload_btn.config(state='disabled', text="Pilih File Excel (.xlsx)")
+        self.school_combo.config(state='disabled')
+        
+        # Create and show progress dialog
+        self._create_progress_dialog()
+        
+        # Snapshot lama file yang sama (jika masih di memori) untuk ingest BKU inkremental
+        previous = self.main_app.session.resident_snapshot_for(file_path)
+        
+        # Start processing as background job, hasil dikirim kembali ke Tk thread
+        self.upload_job = self.main_app.job_runner.submit(
+            self._process_excel_with_progress, file_path, previous, save,
+            name='upload-excel',
+            on_progress=self._update_progress,
+            on_done=on_done,
+            on_error=self._on_processing_error,
+            on_cancel=self._on_processing_cancelled
+        )
+
+    def _finish_load(self, result):
+        """Put a loaded snapshot into the session and swap it in (Tk thread)"""
+        snapshot, size, store_error = result
+        self.upload_job = None
+        self._close_progress_dialog()
+        self.main_app.session.put(snapshot, size)
+        self.main_app.swap_snapshot(snapshot)
+        
+        self.file_label.config(text=f"File dipilih: {os.path.basename(snapshot.file_path)}", fg='#27ae60')
+        self.upload_btn.config(state='normal', text="Pilih File Excel (.xlsx)")
+        self._refresh_school_list()
+        
+        if store_error is not None:
+            messagebox.showwarning(
+                "Database", f"File berhasil dimuat, tetapi tidak tersimpan ke database:\n{store_error}")
+        return snapshot
+
+    def _on_processing_done(self, result):
+        """Handle successful upload (Tk thread) - swap in the new snapshot"""
+        self._finish_load(result)
+        
+        # Update placeholders
+        self._update_rkas_placeholder_after_upload()
+        self._create_bku_placeholder()
+        
+        # Prepare success message
+        bku_status = "BKU sheet ditemukan dan diproses" if self.processor.bku_data_available else "BKU sheet tidak ditemukan"
+        
+        # Count BKU data if available
+        bku_info = ""
+        if self.processor.bku_data_available:
+            total_bku_items = 0
+            for triwulan in ['Triwulan 1', 'Triwulan 2', 'Triwulan 3', 'Triwulan 4']:
+                items = self.processor.get_bku_belanja_persediaan_by_triwulan(triwulan)
+                if items:
+                    total_bku_items += len(items)
+                    bku_info += f"\n{triwulan}: {len(items)} item realisasi"
             
-            # Monitor processing completion
-            self._monitor_processing_completion(file_path, processing_thread)
-
-    def _monitor_processing_completion(self, file_path, processing_thread):
-        """Monitor processing completion and handle results"""
-        if processing_thread.is_alive():
-            # Check again in 100ms
-            self.main_app.root.after(100, lambda: self._monitor_processing_completion(file_path, processing_thread))
-            return
+            if total_bku_items > 0:
+                bku_status += f" ({total_bku_items} total item){bku_info}"
+        
+        # Show success message
+        messagebox.showinfo("Berhasil", 
+            f"File Excel berhasil diproses!\n"
+            f"Sheet RKAS: Berhasil diproses\n"
+            f"Sheet BKU: Berhasil diproses\n"
+            f"Total Penerimaan: {FormatUtils.format_currency(self.processor.total_penerimaan)}\n"
+            f"Ditemukan {len(self.processor.belanja_persediaan_items)} item belanja persediaan\n"
+            f"Ditemukan {len(self.processor.belanja_jasa_items)} item belanja jasa\n"
+            f"Ditemukan {len(self.processor.belanja_pemeliharaan_items)} item belanja pemeliharaan\n"
+            f"Ditemukan {len(self.processor.belanja_perjalanan_items)} item belanja perjalanan\n"
+            f"Ditemukan {len(self.processor.peralatan_items)} item peralatan dan mesin\n"
+            f"Ditemukan {len(self.processor.aset_tetap_items)} item aset tetap lainnya")
+
+    def _on_processing_error(self, error):
+        """Handle processing failure (Tk thread)"""
+        self.upload_job = None
+        self._close_progress_dialog()
         
-        # Processing completed
+        # Error handling
+        messagebox.showerror("Error", f"Gagal membaca file Excel: {error}")
+        
+        # Re-enable upload button on error
+        self.upload_btn.config(state='normal', text="Pilih File Excel (.xlsx)")
+        self._refresh_school_list()
+
+    def _on_processing_cancelled(self):
+        """Handle cancelled processing (Tk thread)"""
+        self.upload_job = None
         self._close_progress_dialog()
+        self.upload_btn.config(state='normal', text="Pilih File Excel (.xlsx)")
+        self._refresh_school_list()
+
+    def _refresh_school_list(self):
+        """Sync the school selector with the session entries"""
+        session = self.main_app.session
+        entries = list(session)
+        self._school_keys = [entry.key for entry in entries]
+        self.school_combo.config(values=[entry.label for entry in entries],
+                                 state='readonly' if entries else 'disabled')
+        self.bulk_pdf_btn.config(state='normal' if entries else 'disabled')
+        self.excel_export_btn.config(state='normal' if entries else 'disabled')
+        if session.current_key in self._school_keys:
+            self.school_combo.current(self._school_keys.index(session.current_key))
+        else:
+            self.school_combo.set("")
+
+    def _on_school_selected(self, event=None):
+        """Switch to another loaded school, reload it when it was evicted"""
+        index = self.school_combo.current()
+        if index < 0 or self.upload_job is not None:
+            return
+        key = self._school_keys[index]
+        session = self.main_app.session
+        if key == session.current_key:
+            return
         
-        if self.processing_success:
-            # Success handling
-            self.file_label.config(text=f"File dipilih: {file_path.split('/')[-1]}", fg='#27ae60')
-            
-            # Update placeholders
-            self._update_rkas_placeholder_after_upload()
-            self._create_bku_placeholder()
-            
-            # Prepare success message
-            bku_status = "BKU sheet ditemukan dan diproses" if self.processor.bku_data_available else "BKU sheet tidak ditemukan"
-            
-            # Count BKU data if available
-            bku_info = ""
-            if self.processor.bku_data_available:
-                total_bku_items = 0
-                for triwulan in ['Triwulan 1', 'Triwulan 2', 'Triwulan 3', 'Triwulan 4']:
-                    items = self.processor.get_bku_belanja_persediaan_by_triwulan(triwulan)
-                    if items:
-                        total_bku_items += len(items)
-                        bku_info += f"\n{triwulan}: {len(items)} item realisasi"
-                
-                if total_bku_items > 0:
-                    bku_status += f" ({total_bku_items} total item){bku_info}"
-            
-            # Show success message
-            messagebox.showinfo("Berhasil", 
-                f"File Excel berhasil diproses!\n"
-                f"Sheet RKAS: Berhasil diproses\n"
-                f"Sheet BKU: Berhasil diproses\n"
-                f"Total Penerimaan: {FormatUtils.format_currency(self.processor.total_penerimaan)}\n"
-                f"Ditemukan {len(self.processor.belanja_persediaan_items)} item belanja persediaan\n"
-                f"Ditemukan {len(self.processor.belanja_jasa_items)} item belanja jasa\n"
-                f"Ditemukan {len(self.processor.belanja_pemeliharaan_items)} item belanja pemeliharaan\n"
-                f"Ditemukan {len(self.processor.belanja_perjalanan_items)} item belanja perjalanan\n"
-                f"Ditemukan {len(self.processor.peralatan_items)} item peralatan dan mesin\n"
-                f"Ditemukan {len(self.processor.aset_tetap_items)} item aset tetap lainnya")
-    
-            
+        entry = session.get(key)
+        if entry.resident:
+            session.touch(key)
+            self.main_app.swap_snapshot(entry.snapshot)
+            self.file_label.config(text=f"File dipilih: {os.path.basename(entry.file_path)}", fg='#27ae60')
+            self._refresh_school_list()
+            self._refresh_active_view()
         else:
-            # Error handling
-            messagebox.showerror("Error", f"Gagal membaca file Excel: {self.processing_error}")
-            
-            # Re-enable upload button on error
-            self.upload_btn.config(state='normal', text="Pilih File Excel (.xlsx)")
+            # Sudah dikeluarkan dari memori, muat ulang dari file aslinya
+            # (datanya sudah disimpan ke database saat upload pertama)
+            self._start_load(entry.file_path, self._on_school_reloaded, save=False)
+
+    def _on_school_reloaded(self, result):
+        """Handle reload of an evicted school (Tk thread)"""
+        self._finish_load(result)
+        self._refresh_active_view()
+
+    def _refresh_active_view(self):
+        """Re-show the active category for the current snapshot"""
+        command = self.tab_commands.get(self.active_tab)
+        if command is not None:
+            command()
+        else:
+            self._create_rkas_placeholder()
+            self._create_bku_placeholder()
 
     def __del__(self):
         """Cleanup when object is destroyed"""
@@ -1300,182 +1265,39 @@ class RKASPage(BasePage):  # Inherit dari BasePage
 
     def _update_rkas_placeholder_after_upload(self):
         """Update RKAS placeholder after successful file upload"""
-        # Clear current RKAS content
-        for widget in self.rkas_frame.winfo_children():
-            widget.destroy()
-        
-        # Reset RKAS canvas scroll position to top
-        self.rkas_canvas.yview_moveto(0)
-        
         # Create updated placeholder
         self._create_rkas_placeholder()
-        
-        # Update canvas scroll region
-        self.rkas_frame.update_idletasks()
-        self.rkas_canvas.configure(scrollregion=self.rkas_canvas.bbox("all"))
     
     def reset_data(self):
         """Reset all data and UI - UPDATED"""
-        self.processor.reset_data()
+        self.main_app.swap_snapshot(empty_snapshot())
+        self.main_app.session.clear()
+        self._refresh_school_list()
 
-        # Clear RKAS display and recreate placeholder
-        for widget in self.rkas_frame.winfo_children():
-            widget.destroy()
-        
-        # Re-add RKAS placeholder
-        self._create_rkas_placeholder()
+        # Reset active tab first so placeholders reflect the empty state
+        self.active_tab = None
 
-        # Clear BKU display and recreate placeholder
-        for widget in self.bku_frame.winfo_children():
-            widget.destroy()
-        
-        # Re-add BKU placeholder
+        # Show RKAS and BKU placeholders (panels are kept, only switched)
+        self._create_rkas_placeholder()
         self._create_bku_placeholder()
         
         # Reset triwulan selection to default
         self.selected_triwulan.set("Triwulan 1")
 
-        # Reset scroll positions
-        self.rkas_canvas.yview_moveto(0)
-        self.bku_canvas.yview_moveto(0)
-
         # Clear file label
         self.file_label.config(text="Belum ada file yang dipilih")
 
         # Re-enable upload button
         self.upload_btn.config(state='normal')
 
-        # Reset active tab
-        self.active_tab = None
-        
         # Reset button highlights
         for tab_name, (btn, orig_color) in self.tab_buttons.items():
             btn.config(bg=orig_color)
 
         messagebox.showinfo("Reset", "Data berhasil dibersihkan.")
 
-    def create_standard_table(self, title, columns):
-        """Create standard table layout in RKAS section with aligned positioning"""
-        for widget in self.rkas_frame.winfo_children():
-            widget.destroy()
-        
-        # Reset canvas scroll position to top
-        self.rkas_canvas.yview_moveto(0)
-        
-        # FIXED: Add consistent top padding for title alignment
-        title_frame = tk.Frame(self.rkas_frame, bg='#ffffff')
-        title_frame.pack(fill='x', pady=(20, 10))  # Same padding as BKU section
-        
-        self.result_title = tk.Label(title_frame, text=title, 
-                                    font=('Arial', 14, 'bold'), bg='#ffffff', fg='#2c3e50')
-        self.result_title.pack()
-        
-        self.table_frame = tk.Frame(self.rkas_frame, bg='#ffffff')
-        self.table_frame.pack(fill='both', expand=True, padx=10, pady=10)
-        
-        # Adjust table height for split view
-        self.tree = ttk.Treeview(self.table_frame, columns=columns, show='headings', height=15)
-        
-        # Style untuk memperbesar font tabel
-        style = ttk.Style()
-        style.configure("Treeview", font=('Arial', 10))
-        style.configure("Treeview.Heading", font=('Arial', 12, 'bold'))
-        
-        for col in columns:
-            self.tree.heading(col, text=col)
-        
-        # Adjust column widths for split view
-        if len(columns) == 4:  # Standard detail table
-            self.tree.column(columns[0], width=120, anchor='center')  # Kode Rekening
-            self.tree.column(columns[1], width=100, anchor='center')  # Kode Kegiatan
-            self.tree.column(columns[2], width=280, anchor='w')       # Uraian
-            self.tree.column(columns[3], width=120, anchor='w')       # Jumlah
-        elif len(columns) == 2:  # Summary table
-            self.tree.column(columns[0], width=320, anchor='w')       # Kategori
-            self.tree.column(columns[1], width=160, anchor='w')       # Jumlah
-        
-        table_scrollbar = ttk.Scrollbar(self.table_frame, orient='vertical', command=self.tree.yview)
-        self.tree.configure(yscrollcommand=table_scrollbar.set)
-        self.tree.pack(side='left', fill='both', expand=True)
-        table_scrollbar.pack(side='right', fill='y')
-        
-        self.summary_frame = tk.Frame(self.rkas_frame, bg='#ecf0f1', relief='raised', bd=1)
-        self.summary_frame.pack(fill='x', padx=10, pady=10)
-        
-        # Force update of canvas scroll region
-        self.rkas_frame.update_idletasks()
-        self.rkas_canvas.configure(scrollregion=self.rkas_canvas.bbox("all"))
-
-    def _display_bku_data_generic(self, triwulan, data, title):
-        """Display BKU realisasi data in table format - TANPA BREAKDOWN HONOR untuk kategori selain Jasa"""
-        # Title frame
-        title_frame = tk.Frame(self.bku_frame, bg='#ffffff')
-        title_frame.pack(fill='x', pady=(20, 10))
-        
-        title_label = tk.Label(title_frame, 
-                            text=title, 
-                            font=('Arial', 14, 'bold'), 
-                            bg='#ffffff', fg='#2c3e50')
-        title_label.pack()
-        
-        # Create table frame
-        table_frame = tk.Frame(self.bku_frame, bg='#ffffff')
-        table_frame.pack(fill='both', expand=True, padx=10, pady=10)
-        
-        # Create treeview for BKU data
-        columns = ('Tanggal', 'Kode Rekening', 'Kode Kegiatan', 'Uraian', 'Jumlah (Rp)')
-        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
-        
-        # Configure column headings and widths
-        for col in columns:
-            tree.heading(col, text=col)
-        
-        tree.column('Tanggal', width=80, anchor='center')
-        tree.column('Kode Rekening', width=100, anchor='center')
-        tree.column('Kode Kegiatan', width=80, anchor='center')
-        tree.column('Uraian', width=250, anchor='w')
-        tree.column('Jumlah (Rp)', width=120, anchor='w')
-        
-        # Insert data - TANPA LOGIK HONOR untuk kategori selain Jasa
-        total_realisasi = 0
-        for item in data:
-            formatted_tanggal = item['tanggal'].strftime('%d-%m-%Y')
-            formatted_jumlah = FormatUtils.format_currency(item['jumlah'])
-            
-            tree.insert('', 'end', values=(
-                formatted_tanggal,
-                item['kode_rekening'],
-                item['kode_kegiatan'],
-                item['uraian'],
-                formatted_jumlah
-            ))
-            total_realisasi += item['jumlah']
-        
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        tree.pack(side='left', fill='both', expand=True)
-        scrollbar.pack(side='right', fill='y')
-        
-        # Summary section - SIMPLE SUMMARY untuk kategori selain Jasa
-        summary_frame = tk.Frame(self.bku_frame, bg='#ecf0f1', relief='raised', bd=1)
-        summary_frame.pack(fill='x', padx=10, pady=10)
-        
-        # Total realisasi saja - TANPA BREAKDOWN
-        total_label = tk.Label(summary_frame, 
-                            text=f"Total Realisasi {triwulan}: {FormatUtils.format_currency(total_realisasi)}", 
-                            font=('Arial', 12, 'bold'), bg='#ecf0f1', fg='#27ae60')
-        total_label.pack(pady=5)
-        
-        # School name
-        school_label = tk.Label(summary_frame, 
-                            text=f"SEKOLAH {self.processor.nama_sekolah}", 
-                            font=('Arial', 10, 'bold'), bg='#ecf0f1', fg='#2c3e50')
-        school_label.pack(anchor='w', pady=(10, 5))
-
-
-    def _show_triwulan_status(self, triwulan):
-        """Show status information for triwulan"""
+    def _get_triwulan_status_line(self, triwulan):
+        """Get status information message line for triwulan"""
         # Determine months for triwulan
         if triwulan == "Triwulan 1":
             months = "Januari - Maret"
@@ -1488,536 +1310,95 @@ class RKASPage(BasePage):  # Inherit dari BasePage
         else:
             months = "Tidak dikenal"
         
-        info_label = tk.Label(self.bku_frame, 
-                            text=f"Periode: {months}\n\nKemungkinan penyebab:\n• Data {triwulan} belum lengkap\n• Bulan terakhir periode belum ada data\n• Kode rekening tidak ditemukan", 
-                            font=('Arial', 11), 
-                            fg='#7f8c8d', bg='#ffffff',
-                            justify='left')
-        info_label.pack(pady=20, padx=20)
-
-    def display_standard_results(self, items: List[Dict], title: str, total_label: str):
-        """Display results in standard format with consistent summary layout"""
-        columns = ('Kode Rekening', 'Kode Kegiatan', 'Uraian', 'Jumlah (Rp)')
-        self.create_standard_table(title, columns)
-        
-        total_jumlah = 0
-        if items:
-            for item in items:
-                formatted_jumlah = FormatUtils.format_currency(item['jumlah'])
-                self.tree.insert('', 'end', values=(
-                    item['kode_rekening'], 
-                    item['kode_kegiatan'], 
-                    item['uraian'], 
-                    formatted_jumlah
-                ))
-                total_jumlah += item['jumlah']
-        else:
-            self.tree.insert('', 'end', values=('', '', 'Tidak ada data ditemukan untuk kategori ini', 'Rp 0'))
-        
-        # Create consistent summary layout
-        self._create_consistent_summary(total_label, total_jumlah)
-
-    def _create_consistent_summary(self, total_label: str, total_jumlah: int):
-        """Create consistent summary section with center total and left school name - TANPA BREAKDOWN HONOR"""
-        # Main total label at center
-        self.total_label = tk.Label(self.summary_frame, text=f"{total_label}: {FormatUtils.format_currency(total_jumlah)}", 
-                                font=('Arial', 12, 'bold'), bg='#ecf0f1', fg='#27ae60')
-        self.total_label.pack(pady=5)
-        
-        # School name label at bottom left
-        self.sekolah_label = tk.Label(self.summary_frame, 
-                                    text=f"SEKOLAH {self.processor.nama_sekolah}", 
-                                    font=('Arial', 10, 'bold'), bg='#ecf0f1', fg='#2c3e50')
-        self.sekolah_label.pack(anchor='w', pady=(10, 5))
-
-    def display_belanja_jasa_results(self, items: List[Dict]):
-        """Display belanja jasa results with extended summary including honor breakdown"""
-        columns = ('Kode Rekening', 'Kode Kegiatan', 'Uraian', 'Jumlah (Rp)')
-        self.create_standard_table("Rincian Belanja Jasa (5.1.02.02)", columns)
-        
-        total_belanja_jasa = 0
-        if items:
-            for item in items:
-                formatted_jumlah = FormatUtils.format_currency(item['jumlah'])
-                self.tree.insert('', 'end', values=(
-                    item['kode_rekening'], 
-                    item['kode_kegiatan'], 
-                    item['uraian'], 
-                    formatted_jumlah
-                ))
-                total_belanja_jasa += item['jumlah']
-        else:
-            self.tree.insert('', 'end', values=('', '', 'Tidak ada data ditemukan untuk kategori ini', 'Rp 0'))
-        
-        # Calculate honor and actual service - KHUSUS UNTUK JASA
-        honor_items = self.processor.filter_budget_by_codes(self.processor.kategori_kode['honor'])
-        total_honor = sum(item['jumlah'] for item in honor_items)
-        jasa_sesungguhnya = total_belanja_jasa - total_honor
-        
-        # Create extended summary dengan data honor breakdown - HANYA UNTUK JASA
-        self.total_label = tk.Label(self.summary_frame, text=f"Total Belanja Jasa (RKAS): {FormatUtils.format_currency(total_belanja_jasa)}", 
-                                font=('Arial', 12, 'bold'), bg='#ecf0f1')
-        self.total_label.pack(pady=5)
-        
-        self.honor_label = tk.Label(self.summary_frame, 
-                                text=f"Pembayaran Honor (RKAS): {FormatUtils.format_currency(total_honor)}", 
-                                font=('Arial', 12, 'bold'), bg='#ecf0f1')
-        self.honor_label.pack(pady=5)
-        
-        self.jasa_sesungguhnya_label = tk.Label(self.summary_frame, 
-                                            text=f"Jasa Sesungguhnya (RKAS): {FormatUtils.format_currency(jasa_sesungguhnya)}", 
-                                            font=('Arial', 12, 'bold'), bg='#ecf0f1', fg='#27ae60')
-        self.jasa_sesungguhnya_label.pack(pady=5)
-        
-        self.sekolah_label = tk.Label(self.summary_frame, 
-                                    text=f"SEKOLAH {self.processor.nama_sekolah}", 
-                                    font=('Arial', 10, 'bold'), bg='#ecf0f1', fg='#2c3e50')
-        self.sekolah_label.pack(anchor='w', pady=(10, 5))
-
-    def _display_bku_jasa_data(self, triwulan, data, title):
-        """Display BKU jasa data dengan summary yang menghitung honor dan jasa sesungguhnya - KHUSUS JASA"""
-        # Title frame
-        title_frame = tk.Frame(self.bku_frame, bg='#ffffff')
-        title_frame.pack(fill='x', pady=(20, 10))
-        
-        title_label = tk.Label(title_frame, 
-                            text=title, 
-                            font=('Arial', 14, 'bold'), 
-                            bg='#ffffff', fg='#2c3e50')
-        title_label.pack()
-        
-        # Create table frame
-        table_frame = tk.Frame(self.bku_frame, bg='#ffffff')
-        table_frame.pack(fill='both', expand=True, padx=10, pady=10)
-        
-        # Create treeview for BKU data
-        columns = ('Tanggal', 'Kode Rekening', 'Kode Kegiatan', 'Uraian', 'Jumlah (Rp)')
-        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
-        
-        # Configure column headings and widths
-        for col in columns:
-            tree.heading(col, text=col)
-        
-        tree.column('Tanggal', width=80, anchor='center')
-        tree.column('Kode Rekening', width=100, anchor='center')
-        tree.column('Kode Kegiatan', width=80, anchor='center')
-        tree.column('Uraian', width=250, anchor='w')
-        tree.column('Jumlah (Rp)', width=120, anchor='w')
-        
-        # Insert data dan hitung honor vs jasa sesungguhnya - LOGIK KHUSUS JASA
-        total_realisasi = 0
-        total_honor_bku = 0
-        
-        for item in data:
-            formatted_tanggal = item['tanggal'].strftime('%d-%m-%Y')
-            formatted_jumlah = FormatUtils.format_currency(item['jumlah'])
-            
-            tree.insert('', 'end', values=(
-                formatted_tanggal,
-                item['kode_rekening'],
-                item['kode_kegiatan'],
-                item['uraian'],
-                formatted_jumlah
-            ))
-            
-            total_realisasi += item['jumlah']
-            
-            # Hitung honor berdasarkan kode kegiatan yang dimulai dengan 07.12 - KHUSUS JASA
-            if item['kode_kegiatan'].startswith('07.12'):
-                total_honor_bku += item['jumlah']
-        
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        tree.pack(side='left', fill='both', expand=True)
-        scrollbar.pack(side='right', fill='y')
-        
-        # Summary section dengan breakdown honor dan jasa sesungguhnya - KHUSUS JASA
-        summary_frame = tk.Frame(self.bku_frame, bg='#ecf0f1', relief='raised', bd=1)
-        summary_frame.pack(fill='x', padx=10, pady=10)
-        
-        # Total realisasi
-        total_label = tk.Label(summary_frame, 
-                            text=f"Total Realisasi {triwulan}: {FormatUtils.format_currency(total_realisasi)}", 
-                            font=('Arial', 12, 'bold'), bg='#ecf0f1')
-        total_label.pack(pady=5)
-        
-        # Honor realisasi - KHUSUS JASA
-        honor_bku_label = tk.Label(summary_frame, 
-                                text=f"Pembayaran Honor (Realisasi): {FormatUtils.format_currency(total_honor_bku)}", 
-                                font=('Arial', 12, 'bold'), bg='#ecf0f1')
-        honor_bku_label.pack(pady=5)
-        
-        # Jasa sesungguhnya realisasi - KHUSUS JASA
-        jasa_sesungguhnya_bku = total_realisasi - total_honor_bku
-        jasa_bku_label = tk.Label(summary_frame, 
-                                text=f"Jasa Sesungguhnya (Realisasi): {FormatUtils.format_currency(jasa_sesungguhnya_bku)}", 
-                                font=('Arial', 12, 'bold'), bg='#ecf0f1', fg='#27ae60')
-        jasa_bku_label.pack(pady=5)
-        
-        # School name
-        school_label = tk.Label(summary_frame, 
-                            text=f"SEKOLAH {self.processor.nama_sekolah}", 
-                            font=('Arial', 10, 'bold'), bg='#ecf0f1', fg='#2c3e50')
-        school_label.pack(anchor='w', pady=(10, 5))
+        return ({'text': f"Periode: {months}\n\nKemungkinan penyebab:\n• Data {triwulan} belum lengkap\n• Bulan terakhir periode belum ada data\n• Kode rekening tidak ditemukan",
+                 'font': ('Arial', 11), 'fg': '#7f8c8d', 'justify': 'left'},
+                {'pady': 20, 'padx': 20})
+
+    def _show_category(self, category):
+        """Show both RKAS and BKU data for a category from precomputed view models"""
+        view_model = self.view_models.rkas.get(category) if self.view_models else None
+        if view_model is None:
+            messagebox.showwarning("Peringatan", "Data dalam kategori tersebut tidak ada atau file belum diupload!")
+            return
+        
+        # Display RKAS data
+        self.rkas_detail_panel.bind(view_model)
+        self._show_rkas_panel(self.rkas_detail_panel)
+        
+        # AUTO-DISPLAY BKU DATA
+        self._schedule_bku_display(self._display_bku_for_category, category)
 
     def _display_bku_summary_for_triwulan(self, triwulan):
         """Display BKU summary data untuk triwulan tertentu - ENHANCED VERSION dengan ringkasan tambahan"""
-        # Clear current BKU content
-        for widget in self.bku_frame.winfo_children():
-            widget.destroy()
-            
-        # Reset BKU canvas scroll position to top
-        self.bku_canvas.yview_moveto(0)
-        
         # Check if BKU data is available
         if not hasattr(self.processor, 'bku_data_available') or not self.processor.bku_data_available:
             print("Debug: BKU data not available in _display_bku_summary_for_triwulan")
             self._create_bku_placeholder()
             return
         
-        # Get BKU summary data
-        try:
-            summary_data = self.processor.get_bku_summary_data_by_triwulan(triwulan)
-            print(f"Debug: Got BKU summary data: {summary_data}")
-        except Exception as e:
-            print(f"Debug: Error getting BKU summary data: {e}")
-            self._create_bku_placeholder()
-            return
+        view_model = self.view_models.bku_ringkasan.get(triwulan) if self.view_models else None
         
-        if not summary_data or summary_data.get('total_realisasi', 0) == 0:
+        if view_model is None:
             # No data for this triwulan
             print(f"Debug: No BKU data for {triwulan}")
-            no_data_label = tk.Label(self.bku_frame, 
-                                text=f"Tidak ada data realisasi\nuntuk {triwulan}", 
-                                font=('Arial', 14, 'bold'), 
-                                fg='#e74c3c', bg='#ffffff', pady=30)
-            no_data_label.pack(expand=True)
+            self.bku_message_panel.set_lines([
+                ({'text': f"Tidak ada data realisasi\nuntuk {triwulan}",
+                  'font': ('Arial', 14, 'bold'), 'fg': '#e74c3c', 'pady': 30},
+                 {'expand': True})
+            ])
+            self._show_bku_panel(self.bku_message_panel)
             return
         
-        print(f"Debug: Displaying BKU data with total realisasi: {summary_data['total_realisasi']}")
-        
-        # Title frame
-        title_frame = tk.Frame(self.bku_frame, bg='#ffffff')
-        title_frame.pack(fill='x', pady=(20, 10))
-        
-        title_label = tk.Label(title_frame, 
-                            text=f"Ringkasan Realisasi BKU - {triwulan}", 
-                            font=('Arial', 14, 'bold'), 
-                            bg='#ffffff', fg='#2c3e50')
-        title_label.pack()
-        
-        # Create table frame
-        table_frame = tk.Frame(self.bku_frame, bg='#ffffff')
-        table_frame.pack(fill='both', expand=True, padx=10, pady=10)
-        
-        # Create treeview for summary
-        columns = ('Kategori', 'Jumlah (Rp)')
-        tree = ttk.Treeview(table_frame, columns=columns, show='headings', height=15)
-        
-        # Configure column headings and widths
-        for col in columns:
-            tree.heading(col, text=col)
-        
-        tree.column('Kategori', width=320, anchor='w')
-        tree.column('Jumlah (Rp)', width=160, anchor='w')
-        
-        # ENHANCED: Calculate additional summary data first
-        total_realisasi_sampai_saat_ini = self._calculate_total_realisasi_sampai_saat_ini(triwulan)
-        total_pagu_rkas = self.processor.total_penerimaan
-        total_sisa_dana_1_tahun = total_pagu_rkas - total_realisasi_sampai_saat_ini
-        total_sisa_dana_sampai_saat_ini = (total_pagu_rkas * 0.5) - total_realisasi_sampai_saat_ini
-        persentase_realisasi = (total_realisasi_sampai_saat_ini / total_pagu_rkas * 100) if total_pagu_rkas > 0 else 0
-        
-        # Data ringkasan BKU dengan informasi tambahan terintegrasi
-        ringkasan_data = [
-            ("BELANJA OPERASI", summary_data['total_belanja_operasi_bku'], True),
-            ("  BELANJA HONOR", summary_data['total_honor_bku'], False),
-            ("  BELANJA JASA", summary_data['jasa_sesungguhnya_bku'], False),
-            ("  BELANJA PEMELIHARAAN", summary_data['total_pemeliharaan_bku'], False),
-            ("  BELANJA PERJALANAN", summary_data['total_perjalanan_bku'], False),
-            ("  BELANJA PERSEDIAAN", summary_data['total_persediaan_bku'], False),
-            ("BELANJA MODAL", summary_data['belanja_modal_bku'], True),
-            ("  PERALATAN DAN MESIN", summary_data['total_peralatan_bku'], False),
-            ("  ASET TETAP LAINNYA", summary_data['total_aset_tetap_bku'], False),
-            ("TOTAL REALISASI", summary_data['total_realisasi'], True),
-            # ENHANCED: Add separator and additional summary info
-            ("", "", False),  # Empty row as separator
-            (f"TOTAL REALISASI SAMPAI SAAT INI ({self._get_periode_text(triwulan)})", total_realisasi_sampai_saat_ini, "green"),
-            ("TOTAL SISA DANA BOSP REGULER (1 TAHUN)", total_sisa_dana_1_tahun, "blue"),
-            ("TOTAL SISA DANA BOSP REGULER SAMPAI SAAT INI (50%)", total_sisa_dana_sampai_saat_ini, "purple"),
-            ("PERSENTASE REALISASI DANA BOSP SAMPAI SAAT INI", f"{persentase_realisasi:.2f}%", "orange")
-        ]
-        
-        # Insert data into table with enhanced styling
-        for kategori, jumlah, style in ringkasan_data:
-            # Handle empty separator row
-            if kategori == "" and jumlah == "":
-                item_id = tree.insert('', 'end', values=("", ""))
-                continue
-            
-            # Format value based on type
-            if isinstance(jumlah, str):  # For percentage
-                formatted_jumlah = jumlah
-            else:  # For currency values
-                formatted_jumlah = FormatUtils.format_currency(jumlah)
-            
-            item_id = tree.insert('', 'end', values=(kategori, formatted_jumlah))
-            
-            # Set background color and styling based on style type
-            if style == True:  # Original highlight items (red background)
-                tree.tag_configure('highlight', background='#e74c3c', foreground='white')
-                tree.item(item_id, tags=('highlight',))
-            elif style == "green":
-                tree.tag_configure('green_highlight', background='#27ae60', foreground='white')
-                tree.item(item_id, tags=('green_highlight',))
-            elif style == "blue":
-                tree.tag_configure('blue_highlight', background='#3498db', foreground='white')
-                tree.item(item_id, tags=('blue_highlight',))
-            elif style == "purple":
-                tree.tag_configure('purple_highlight', background='#9b59b6', foreground='white')
-                tree.item(item_id, tags=('purple_highlight',))
-            elif style == "orange":
-                tree.tag_configure('orange_highlight', background='#e67e22', foreground='white')
-                tree.item(item_id, tags=('orange_highlight',))
-        
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
-        tree.pack(side='left', fill='both', expand=True)
-        scrollbar.pack(side='right', fill='y')
-        
-        # Summary section - simplified since enhanced info is now in table
-        summary_frame = tk.Frame(self.bku_frame, bg='#ecf0f1', relief='raised', bd=1)
-        summary_frame.pack(fill='x', padx=10, pady=10)
-        
-        # School name only
-        school_label = tk.Label(summary_frame, 
-                            text=f"SEKOLAH {self.processor.nama_sekolah}", 
-                            font=('Arial', 10, 'bold'), bg='#ecf0f1', fg='#2c3e50')
-        school_label.pack(anchor='w', pady=(10, 5), padx=10)
-
-        # Export PDF button
-        export_btn = tk.Button(summary_frame,
-                             text="📄 Export PDF",
-                             command=self.export_ringkasan_to_pdf,
-                             bg='#e74c3c',
-                             fg='white',
-                             font=('Arial', 10, 'bold'),
-                             padx=15,
-                             pady=5,
-                             cursor='hand2',
-                             relief='raised',
-                             bd=2)
-        export_btn.pack(anchor='w', pady=(5, 10), padx=10)
-        
-        # Add hover effect to export button
-        def on_export_hover(e):
-            export_btn.config(bg='#c0392b')
-        def on_export_leave(e):
-            export_btn.config(bg='#e74c3c')
-        
-        export_btn.bind('<Enter>', on_export_hover)
-        export_btn.bind('<Leave>', on_export_leave)
-        
-        # Update canvas scroll region
-        self.bku_frame.update_idletasks()
-        self.bku_canvas.configure(scrollregion=self.bku_canvas.bbox("all"))
-
-    def _calculate_total_realisasi_sampai_saat_ini(self, current_triwulan):
-        """Calculate total realisasi from TW1 up to current triwulan"""
-        triwulan_order = ["Triwulan 1", "Triwulan 2", "Triwulan 3", "Triwulan 4"]
-        current_index = triwulan_order.index(current_triwulan)
-        
-        total_realisasi = 0
-        
-        # Sum up realisasi from TW1 to current triwulan
-        for i in range(current_index + 1):
-            triwulan = triwulan_order[i]
-            try:
-                summary_data = self.processor.get_bku_summary_data_by_triwulan(triwulan)
-                if summary_data and summary_data.get('total_realisasi', 0) > 0:
-                    total_realisasi += summary_data['total_realisasi']
-                    print(f"Debug: Added {FormatUtils.format_currency(summary_data['total_realisasi'])} from {triwulan}")
-            except Exception as e:
-                print(f"Debug: Error getting data for {triwulan}: {e}")
-                continue
-        
-        print(f"Debug: Total realisasi sampai {current_triwulan}: {FormatUtils.format_currency(total_realisasi)}")
-        return total_realisasi
-
-    def _get_periode_text(self, triwulan):
-        """Get period text for triwulan"""
-        periode_map = {
-            "Triwulan 1": "Jan-Mar",
-            "Triwulan 2": "Jan-Jun", 
-            "Triwulan 3": "Jan-Sep",
-            "Triwulan 4": "Jan-Des"
-        }
-        return periode_map.get(triwulan, "Tidak dikenal")
-
+        # Info tambahan sudah di tabel, summary hanya nama sekolah dan tombol export PDF
+        self.bku_summary_panel.bind(view_model)
+        self._show_bku_panel(self.bku_summary_panel)
 
     # Navigation methods - UPDATED with auto BKU display for supported categories
     def show_belanja_persediaan(self):
         """Show both RKAS and BKU data for Belanja Persediaan"""
-        if not self.processor.belanja_persediaan_items:
-            messagebox.showwarning("Peringatan", "Data dalam kategori tersebut tidak ada atau file belum diupload!")
-            return
-        
-        # Display RKAS data
-        self.display_standard_results(self.processor.belanja_persediaan_items, 
-                                    "Rincian Belanja Persediaan (5.1.02.01)", 
-                                    "Total Belanja Persediaan")
-        
-        # AUTO-DISPLAY BKU DATA
-        self._display_bku_for_category("Belanja Persediaan")
+        self._show_category("Belanja Persediaan")
 
     def show_belanja_jasa(self):
         """Show RKAS data for Belanja Jasa - FIXED"""
-        if not self.processor.belanja_jasa_items:
-            messagebox.showwarning("Peringatan", "Data dalam kategori tersebut tidak ada atau file belum diupload!")
-            return
-        self.display_belanja_jasa_results(self.processor.belanja_jasa_items)
-        
-        # FIXED: gunakan nama kategori yang konsisten 
-        self._display_bku_for_category("Belanja Jasa")
+        self._show_category("Belanja Jasa")
 
     def show_belanja_pemeliharaan(self):
         """Show both RKAS and BKU data for Belanja Pemeliharaan"""
-        if not self.processor.belanja_pemeliharaan_items:
-            messagebox.showwarning("Peringatan", "Data dalam kategori tersebut tidak ada atau file belum diupload!")
-            return
-        
-        # Display RKAS data
-        self.display_standard_results(self.processor.belanja_pemeliharaan_items,
-                                    "Rincian Belanja Pemeliharaan (5.1.02.03)",
-                                    "Total Belanja Pemeliharaan")
-        
-        # AUTO-DISPLAY BKU DATA
-        self._display_bku_for_category("Pemeliharaan")
+        self._show_category("Pemeliharaan")
 
     def show_belanja_perjalanan(self):
         """Show both RKAS and BKU data for Belanja Perjalanan"""
-        if not self.processor.belanja_perjalanan_items:
-            messagebox.showwarning("Peringatan", "Data dalam kategori tersebut tidak ada atau file belum diupload!")
-            return
-        
-        # Display RKAS data
-        self.display_standard_results(self.processor.belanja_perjalanan_items,
-                                    "Rincian Perjalanan Dinas (5.1.02.04)",
-                                    "Total Belanja Perjalanan Dinas")
-        
-        # AUTO-DISPLAY BKU DATA
-        self._display_bku_for_category("Perjalanan Dinas")
+        self._show_category("Perjalanan Dinas")
 
     def show_peralatan(self):
         """Show both RKAS and BKU data for Peralatan"""
-        if not self.processor.peralatan_items:
-            messagebox.showwarning("Peringatan", "Data dalam kategori tersebut tidak ada atau file belum diupload!")
-            return
-        
-        # Display RKAS data
-        self.display_standard_results(self.processor.peralatan_items,
-                                    "Rincian Peralatan dan Mesin (5.2.02 & 5.2.04)",
-                                    "Total Peralatan")
-        
-        # AUTO-DISPLAY BKU DATA
-        self._display_bku_for_category("Peralatan")
+        self._show_category("Peralatan")
 
     def show_aset_tetap(self):
         """Show RKAS data for Aset Tetap"""
-        if not self.processor.aset_tetap_items:
-            messagebox.showwarning("Peringatan", "Data dalam kategori tersebut tidak ada atau file belum diupload!")
-            return
-        self.display_standard_results(self.processor.aset_tetap_items,
-                                    "Rincian Aset Tetap Lainnya (5.2.05)",
-                                    "Total Aset Tetap Lainnya")
-        
-        # Clear BKU section for non-supported categories
-        self._display_bku_for_category("Aset Tetap")
+        self._show_category("Aset Tetap")
 
     def show_ringkasan(self):
-        """Show summary data - FIXED VERSION dengan debug"""
-        if not self.processor.excel_data and self.processor.total_penerimaan == 0:
+        """Show summary data from precomputed view models"""
+        if self.view_models is None:
             messagebox.showwarning("Peringatan", "File belum diupload!")
             return
         
-        # Display RKAS summary
-        columns = ('Kategori', 'Jumlah (Rp)')
-        self.create_standard_table("Ringkasan Anggaran", columns)
-        
-        # Get summary data from processor
-        summary_data = self.processor.get_summary_data()
-        
-        # Data ringkasan dengan background color info
-        ringkasan_data = [
-            ("PAGU TAHUN 2025", self.processor.total_penerimaan, True),
-            ("BELANJA OPERASI", summary_data['total_belanja_operasi'], True),
-            ("  BELANJA HONOR", summary_data['total_honor'], False),
-            ("  BELANJA JASA", summary_data['jasa_sesungguhnya'], False),
-            ("  BELANJA PEMELIHARAAN", summary_data['total_pemeliharaan'], False),
-            ("  BELANJA PERJALANAN", summary_data['total_perjalanan'], False),
-            ("  BELANJA PERSEDIAAN", summary_data['belanja_persediaan_ringkasan'], False),
-            ("BELANJA MODAL", summary_data['belanja_modal'], True),
-            ("  PERALATAN DAN MESIN", summary_data['total_peralatan'], False),
-            ("  ASET TETAP LAINNYA", summary_data['total_aset_tetap'], False),
-            ("TOTAL ANGGARAN", summary_data['total_anggaran'], True)
-        ]
-        
-        # Insert data into table
-        for kategori, jumlah, is_highlight in ringkasan_data:
-            formatted_jumlah = FormatUtils.format_currency(jumlah)
-            item_id = self.tree.insert('', 'end', values=(kategori, formatted_jumlah))
-            
-            # Set background color for highlighted items
-            if is_highlight:
-                self.tree.set(item_id, 'Kategori', kategori)
-                self.tree.set(item_id, 'Jumlah (Rp)', formatted_jumlah)
-                # Configure tag for green background
-                self.tree.tag_configure('highlight', background='#2ecc71', foreground='white')
-                self.tree.item(item_id, tags=('highlight',))
-        
-        # Add school name label using consistent layout
-        sekolah_label = tk.Label(self.summary_frame, text=f"SEKOLAH {self.processor.nama_sekolah}", 
-                                font=('Arial', 10, 'bold'), bg='#ecf0f1', fg='#2c3e50')
-        sekolah_label.pack(anchor='w', pady=5)
-        
-        # DEBUG: Print BKU info
-        print(f"Debug: Checking BKU data availability...")
-        print(f"Debug: hasattr bku_data_available: {hasattr(self.processor, 'bku_data_available')}")
-        if hasattr(self.processor, 'bku_data_available'):
-            print(f"Debug: bku_data_available value: {self.processor.bku_data_available}")
+        # Display RKAS summary, baris highlight diberi background hijau
+        self.rkas_ringkasan_panel.bind(self.view_models.rkas_ringkasan)
+        self._show_rkas_panel(self.rkas_ringkasan_panel)
         
         # AUTO-DISPLAY BKU SUMMARY untuk triwulan yang dipilih
         if hasattr(self.processor, 'bku_data_available') and self.processor.bku_data_available:
-            selected_triwulan = self.selected_triwulan.get()
-            print(f"Debug: Displaying BKU summary for {selected_triwulan}")
-            
-            # DEBUG: Cek summary data sebelum display
-            summary_data_bku = self.processor.get_bku_summary_data_by_triwulan(selected_triwulan)
-            print(f"Debug: BKU summary data: {summary_data_bku}")
-            
-            self._display_bku_summary_for_triwulan(selected_triwulan)
+            self._schedule_bku_display(self._display_bku_summary_for_triwulan, self.selected_triwulan.get())
         else:
-            print("Debug: BKU data not available, showing placeholder")
             # Clear BKU section jika tidak ada data
-            self._clear_bku_for_non_supported()
+            self._schedule_bku_display(self._clear_bku_for_non_supported)
             
     def _clear_bku_for_non_supported(self):
             """Clear BKU section and show placeholder for non-supported categories"""
-            # Clear current BKU content
-            for widget in self.bku_frame.winfo_children():
-                widget.destroy()
-            
-            # Reset BKU canvas scroll position to top
-            self.bku_canvas.yview_moveto(0)
-            
             # Show placeholder
             self._create_bku_placeholder()
-            
-            # Update canvas scroll region
-            self.bku_frame.update_idletasks()
-            self.bku_canvas.configure(scrollregion=self.bku_canvas.bbox("all"))
 
     def _on_mousewheel(self, event):
         """Handle mouse wheel scrolling untuk scroll horizontal"""
@@ -2032,18 +1413,14 @@ class RKASPage(BasePage):  # Inherit dari BasePage
             
     def _on_canvas_configure(self, event):
         """Handle canvas configure event"""
-        # Update scroll region
-        self.button_canvas.configure(scrollregion=self.button_canvas.bbox("all"))
-        
-        # Update canvas window height to match canvas
-        canvas_height = self.button_canvas.winfo_height()
+        # Update scroll region and canvas window height to match canvas
         if hasattr(self, 'canvas_window'):
-            self.button_canvas.itemconfig(self.canvas_window, height=canvas_height)
+            self.main_app.layout.fit_width(self.button_canvas, self.canvas_window, orient='x')
     
     def _on_frame_configure(self, event):
         """Handle frame configure event"""
         # Update scroll region when frame changes
-        self.button_canvas.configure(scrollregion=self.button_canvas.bbox("all"))
+        self.main_app.layout.update_scrollregion(self.button_canvas)
 
 
     # Tambahkan method-method yang hilang ini ke dalam class RKASPage
@@ -2063,6 +1440,7 @@ class RKASPage(BasePage):  # Inherit dari BasePage
         
         # Clear existing buttons
         self.tab_buttons.clear()
+        self.tab_commands.clear()
         
         # Create buttons
         for text, command, color in button_configs:
@@ -2083,10 +1461,10 @@ class RKASPage(BasePage):  # Inherit dari BasePage
             
             # Store button reference with original color
             self.tab_buttons[text] = (btn, color)
+            self.tab_commands[text] = command
         
         # Update scroll region
-        self.scrollable_button_frame.update_idletasks()
-        self.button_canvas.configure(scrollregion=self.button_canvas.bbox("all"))
+        self.main_app.layout.update_scrollregion(self.button_canvas)
 
     # Modifikasi method _handle_button_click untuk update dropdown
     def _handle_button_click(self, command, tab_name):
@@ -0,0 +1,103 @@
+"""
+Startup measurement mode for SIKELAR application
+When SIKELAR_STARTUP_BENCHMARK names a file, main.py records how long the
+imports, Tk setup and home page construction take, writes the timings to
+that file as JSON and closes the app as soon as the home page is
+interactive. Used by benchmarks/startup.py for source and frozen builds
+"""
+
+import os
+import sys
+import json
+import time
+import functools
+
+
+STARTUP_BENCHMARK_ENV = 'SIKELAR_STARTUP_BENCHMARK'
+# time.time() saat proses diluncurkan, diisi oleh benchmark
+STARTUP_SPAWNED_ENV = 'SIKELAR_STARTUP_SPAWNED'
+# Batas tunggu home page tampil sebelum menyerah (ms)
+FIRST_FRAME_TIMEOUT_MS = 30000
+
+
+class StartupProbe:
+    """
+    Startup marks in ms. Marks are relative to `started` (perf_counter at
+    the top of main.py); `spawn` is the interpreter / bootloader time before
+    that, when the launcher passed its spawn time.
+    """
+
+    def __init__(self, output_path, started):
+        self.output_path = output_path
+        self.started = started
+        self.marks = {}
+        self.durations = {}
+
+        spawned = os.environ.get(STARTUP_SPAWNED_ENV)
+        if spawned:
+            self.marks['spawn'] = round(((time.time() - float(spawned)) - (time.perf_counter() - started)) * 1000, 2)
+
+    @classmethod
+    def from_env(cls, started):
+        """Probe when measurement mode is on, otherwise None"""
+        output_path = os.environ.get(STARTUP_BENCHMARK_ENV)
+        return cls(output_path, started) if output_path else None
+
+    def mark(self, name, at=None):
+        """Record a mark now (or at perf_counter value `at`)"""
+        at = time.perf_counter() if at is None else at
+        self.marks[name] = round((at - self.started) * 1000, 2)
+
+    def time_method(self, cls, method_name):
+        """Add the run time of every cls.method_name call to durations"""
+        original = getattr(cls, method_name)
+        key = f"{cls.__name__}.{method_name}"
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            begin = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = (time.perf_counter() - begin) * 1000
+                self.durations[key] = round(self.durations.get(key, 0) + elapsed, 2)
+
+        setattr(cls, method_name, timed)
+
+    def watch(self, root, app):
+        """
+        Mark first_frame once the home page is mapped and drawn, and
+        interactive when the event loop is idle after that. Then write the
+        result and close the app.
+        """
+        deadline = time.perf_counter() + FIRST_FRAME_TIMEOUT_MS / 1000
+
+        def check_first_frame():
+            page = app.pages.get('home')
+            if page is None or page.page_frame is None or not page.page_frame.winfo_ismapped():
+                if time.perf_counter() > deadline:
+                    self.finish(app, error="Home page tidak tampil")
+                else:
+                    root.after(1, check_first_frame)
+                return
+            root.update_idletasks()
+            self.mark('first_frame')
+            root.after_idle(on_idle)
+
+        def on_idle():
+            self.mark('interactive')
+            self.finish(app)
+
+        root.after(1, check_first_frame)
+
+    def finish(self, app, error=None):
+        """Write the timings and close the app"""
+        result = {
+            'marks_ms': self.marks,
+            'durations_ms': self.durations,
+            'frozen': bool(getattr(sys, 'frozen', False)),
+            'error': error
+        }
+        with open(self.output_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=1)
+        app.on_close()
@@ -0,0 +1,143 @@
+"""
+Cooperative UI task scheduler for SIKELAR application
+Long UI work (filling a large text area, rendering several panels) runs on
+the Tk thread in time slices: a task is a generator that yields between
+small steps, and the scheduler runs steps for at most `slice_ms` before
+giving the event loop a turn. Tasks have priorities, and a task submitted
+on a channel cancels the outdated task on that channel, so a new click
+always wins over a render that is still running
+"""
+
+import sys
+import time
+import heapq
+import itertools
+
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# Waktu kerja per frame sebelum event loop mendapat giliran (ms)
+DEFAULT_SLICE_MS = 8
+
+
+class UITask:
+    """Handle for one submitted UI task"""
+
+    def __init__(self, task_id, name, priority, channel, steps, on_done):
+        self.id = task_id
+        self.name = name
+        self.priority = priority
+        self.channel = channel
+        self.steps = steps
+        self.on_done = on_done
+        self.cancelled = False
+        self.finished = False
+
+    def cancel(self):
+        """Stop the task before its next step"""
+        self.cancelled = True
+
+
+class UITaskScheduler:
+    """
+    Runs generator tasks on the Tk loop in slices of `slice_ms`.
+
+    `submit(work, *args)` calls work(*args); a generator is stepped until it
+    is exhausted, any other return value means the work is already done.
+    Higher priority tasks (lower number) run first, equal priorities in
+    submission order.
+    """
+
+    def __init__(self, root, slice_ms=DEFAULT_SLICE_MS):
+        self.root = root
+        self.slice_ms = slice_ms
+        self._heap = []
+        self._channels = {}   # channel -> task terbaru di channel itu
+        self._ids = itertools.count(1)
+        self._after_id = None
+
+    def submit(self, work, *args, name=None, priority=PRIORITY_NORMAL, channel=None, on_done=None):
+        """
+        Schedule work(*args). With a channel, the previous task on the same
+        channel is cancelled. `on_done()` is called after the last step.
+        """
+        if channel is not None:
+            self.cancel(channel)
+
+        steps = work(*args)
+        task = UITask(next(self._ids), name or getattr(work, '__name__', 'ui-task'),
+                      priority, channel, steps, on_done)
+        if not hasattr(steps, 'send'):
+            # Bukan generator: pekerjaan sudah selesai saat dipanggil
+            self._finish(task)
+            return task
+
+        if channel is not None:
+            self._channels[channel] = task
+        heapq.heappush(self._heap, (priority, task.id, task))
+        self._schedule(idle=True)
+        return task
+
+    def cancel(self, channel):
+        """Cancel the pending task on channel (no-op when there is none)"""
+        task = self._channels.pop(channel, None)
+        if task is not None:
+            task.cancel()
+
+    def cancel_all(self):
+        """Cancel every pending task"""
+        for _, _, task in self._heap:
+            task.cancel()
+        self._heap.clear()
+        self._channels.clear()
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def is_pending(self, channel):
+        return channel in self._channels
+
+    def _schedule(self, idle=False):
+        if self._after_id is None:
+            # Slice pertama langsung setelah handler klik selesai, berikutnya
+            # setelah event loop sempat memproses input dan menggambar
+            if idle:
+                self._after_id = self.root.after_idle(self._run_slice)
+            else:
+                self._after_id = self.root.after(1, self._run_slice)
+
+    def _run_slice(self):
+        self._after_id = None
+        deadline = time.perf_counter() + self.slice_ms / 1000
+        while self._heap:
+            task = self._heap[0][2]
+            if task.cancelled:
+                heapq.heappop(self._heap)
+                task.steps.close()
+                continue
+            try:
+                next(task.steps)
+            except StopIteration:
+                heapq.heappop(self._heap)
+                self._finish(task)
+            except Exception:
+                heapq.heappop(self._heap)
+                self._forget(task)
+                self.root.report_callback_exception(*sys.exc_info())
+            if time.perf_counter() >= deadline:
+                break
+
+        if self._heap:
+            self._schedule()
+
+    def _forget(self, task):
+        task.finished = True
+        if task.channel is not None and self._channels.get(task.channel) is task:
+            del self._channels[task.channel]
+
+    def _finish(self, task):
+        self._forget(task)
+        if task.on_done is not None:
+            task.on_done()
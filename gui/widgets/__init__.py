@@ -0,0 +1,4 @@
+# gui/widgets/__init__.py
+"""
+Reusable widgets for SIKELAR GUI
+"""
@@ -0,0 +1,172 @@
+"""
+Persistent panel widgets for SIKELAR application
+Panels are built once and updated in place, so switching category or
+triwulan only changes label text and table rows instead of rebuilding widgets
+"""
+
+import tkinter as tk
+
+from .virtual_table import VirtualTable
+
+
+# Nilai default label pesan, supaya opsi dari pesan sebelumnya tidak terbawa
+MESSAGE_LABEL_DEFAULTS = {
+    'font': ('Arial', 12),
+    'fg': '#7f8c8d',
+    'padx': 1,
+    'pady': 1,
+    'justify': 'center'
+}
+
+
+def set_label(label, **options):
+    """Configure only the label options that actually changed"""
+    changed = {key: value for key, value in options.items() if str(label.cget(key)) != str(value)}
+    if changed:
+        label.config(**changed)
+
+
+class PanelStack:
+    """Show one panel at a time inside a parent frame using pack/pack_forget"""
+
+    def __init__(self):
+        self.current = None
+
+    def show(self, panel):
+        """Make `panel` the visible panel, no-op when it already is"""
+        if self.current is panel:
+            return
+        if self.current is not None:
+            self.current.frame.pack_forget()
+        panel.frame.pack(fill='both', expand=True)
+        self.current = panel
+
+
+class MessagePanel:
+    """
+    Placeholder / info messages made of reusable labels.
+    Each line is (label_options, pack_options); labels are only re-packed
+    when the layout of the lines changes.
+    """
+
+    def __init__(self, parent, bg='#ffffff'):
+        self.bg = bg
+        self.frame = tk.Frame(parent, bg=bg)
+        self._labels = []
+        self._label_options = []
+        self._layout = None
+
+    def set_lines(self, lines):
+        """Show the given message lines"""
+        while len(self._labels) < len(lines):
+            self._labels.append(tk.Label(self.frame, bg=self.bg))
+            self._label_options.append(None)
+
+        for i, (label_options, _) in enumerate(lines):
+            options = dict(MESSAGE_LABEL_DEFAULTS, **label_options)
+            if self._label_options[i] != options:
+                self._labels[i].config(**options)
+                self._label_options[i] = options
+
+        layout = [pack_options for _, pack_options in lines]
+        if layout != self._layout:
+            for label in self._labels:
+                label.pack_forget()
+            for label, pack_options in zip(self._labels, layout):
+                label.pack(**pack_options)
+            self._layout = layout
+
+
+class TablePanel:
+    """
+    Title, virtual table and summary block that are created once.
+
+    `set_content` applies a new title, rows and summary texts in place: the
+    table diffs its visible rows and summary labels are reused, only shown
+    or hidden when the number of total lines changes.
+    """
+
+    def __init__(self, parent, columns, column_options=None, height=15,
+                 school_pack=None, action=None, bg='#ffffff'):
+        self.frame = tk.Frame(parent, bg=bg)
+
+        # Title
+        title_frame = tk.Frame(self.frame, bg=bg)
+        title_frame.pack(fill='x', pady=(20, 10))
+        self.title_label = tk.Label(title_frame, text="", font=('Arial', 14, 'bold'),
+                                    bg=bg, fg='#2c3e50')
+        self.title_label.pack()
+
+        # Table
+        table_frame = tk.Frame(self.frame, bg=bg)
+        table_frame.pack(fill='both', expand=True, padx=10, pady=10)
+        self.table = VirtualTable(table_frame, columns, height=height, bg=bg)
+        for col, options in (column_options or {}).items():
+            self.table.column(col, **options)
+        self.table.pack(fill='both', expand=True)
+
+        # Summary: baris total (jumlahnya bisa berubah) lalu nama sekolah
+        self.summary_frame = tk.Frame(self.frame, bg='#ecf0f1', relief='raised', bd=1)
+        self.summary_frame.pack(fill='x', padx=10, pady=10)
+        self.total_labels = []
+        self._visible_totals = 0
+
+        self.school_label = tk.Label(self.summary_frame, text="", font=('Arial', 10, 'bold'),
+                                     bg='#ecf0f1', fg='#2c3e50')
+        self.school_label.pack(**(school_pack or {'anchor': 'w', 'pady': (10, 5)}))
+
+        self.action_button = None
+        if action:
+            self._create_action_button(action)
+
+    def _create_action_button(self, action):
+        """Create optional button below the school name"""
+        button = tk.Button(self.summary_frame,
+                           text=action['text'],
+                           command=action['command'],
+                           bg=action['bg'],
+                           fg='white',
+                           font=('Arial', 10, 'bold'),
+                           padx=15,
+                           pady=5,
+                           cursor='hand2',
+                           relief='raised',
+                           bd=2)
+        button.pack(anchor='w', pady=(5, 10), padx=10)
+
+        button.bind('<Enter>', lambda e: button.config(bg=action['hover_bg']))
+        button.bind('<Leave>', lambda e: button.config(bg=action['bg']))
+        self.action_button = button
+
+    def set_content(self, title, rows, row_formatter=None, row_tagger=None, totals=(), school="",
+                    row_tags=None):
+        """
+        Update the panel in place. `totals` is a list of (text, fg) summary
+        lines shown above the school name, fg None means default color.
+        """
+        set_label(self.title_label, text=title)
+        self.table.set_rows(rows, row_formatter, row_tagger, row_tags)
+        self._set_totals(totals)
+        set_label(self.school_label, text=school)
+
+    def bind(self, view_model):
+        """Show a precomputed TableViewModel, no formatting is done here"""
+        self.set_content(view_model.title, view_model.rows, totals=view_model.totals,
+                         school=view_model.school, row_tags=view_model.tags)
+
+    def _set_totals(self, totals):
+        """Reuse total labels, packing or hiding only the difference"""
+        while len(self.total_labels) < len(totals):
+            self.total_labels.append(tk.Label(self.summary_frame, font=('Arial', 12, 'bold'),
+                                              bg='#ecf0f1'))
+
+        for i, label in enumerate(self.total_labels):
+            if i < len(totals):
+                text, fg = totals[i]
+                set_label(label, text=text, fg=fg or 'black')
+                if i >= self._visible_totals:
+                    label.pack(pady=5, before=self.school_label)
+            elif i < self._visible_totals:
+                label.pack_forget()
+
+        self._visible_totals = len(totals)
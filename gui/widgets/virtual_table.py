@@ -0,0 +1,215 @@
+"""
+Virtual table widget for SIKELAR application
+A ttk.Treeview that only materializes the rows in view (plus a small overscan)
+so that memory and redraw cost stay constant regardless of row count
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTable:
+    """
+    Treeview wrapper with on-demand row materialization.
+
+    The Treeview always holds at most `height` items. Scrolling rewrites the
+    values of those items from the backing row list, and rows are formatted
+    lazily through `row_formatter` only when they enter the view window.
+    """
+
+    def __init__(self, parent, columns, height=15, overscan=5, bg='#ffffff'):
+        self.columns = tuple(columns)
+        self.height = height
+        self.overscan = overscan
+
+        self.frame = tk.Frame(parent, bg=bg)
+        self.tree = ttk.Treeview(self.frame, columns=self.columns, show='headings',
+                                 height=height, selectmode='browse')
+        self.scrollbar = ttk.Scrollbar(self.frame, orient='vertical', command=self.yview)
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+        for col in self.columns:
+            self.tree.heading(col, text=col)
+
+        # Backing data dan state window
+        self.rows = []
+        self.row_formatter = None
+        self.row_tagger = None
+        self.row_tags = None
+        self.offset = 0
+        self.selected_index = None
+
+        self._item_ids = []     # Pool item Treeview yang dipakai ulang
+        self._shown = []        # (values, tags) yang sedang tampil per slot pool
+        self._formatted = {}    # index -> (values, tags) untuk window + overscan
+
+        self.tree.bind('<MouseWheel>', self._on_mousewheel, add='+')
+        self.tree.bind('<Button-4>', self._on_mousewheel, add='+')
+        self.tree.bind('<Button-5>', self._on_mousewheel, add='+')
+        self.tree.bind('<<TreeviewSelect>>', self._on_select, add='+')
+        self.tree.bind('<Up>', lambda e: self._move_selection(-1))
+        self.tree.bind('<Down>', lambda e: self._move_selection(1))
+        self.tree.bind('<Prior>', lambda e: self._move_selection(-self.height))
+        self.tree.bind('<Next>', lambda e: self._move_selection(self.height))
+
+    # Geometry pass-through supaya bisa dipakai seperti widget biasa
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def pack_forget(self):
+        self.frame.pack_forget()
+
+    def column(self, col, **kwargs):
+        return self.tree.column(col, **kwargs)
+
+    def heading(self, col, **kwargs):
+        return self.tree.heading(col, **kwargs)
+
+    def tag_configure(self, tag, **kwargs):
+        return self.tree.tag_configure(tag, **kwargs)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def set_rows(self, rows, row_formatter=None, row_tagger=None, row_tags=None):
+        """
+        Replace backing rows. `row_formatter(row)` returns the tuple of display
+        values, `row_tagger(row)` returns a tuple of tags. Without a formatter,
+        rows are assumed to already be display tuples; precomputed tags can be
+        given as `row_tags`, a sequence parallel to rows.
+        """
+        self.rows = rows if isinstance(rows, (list, tuple)) else list(rows)
+        self.row_formatter = row_formatter
+        self.row_tagger = row_tagger
+        self.row_tags = row_tags
+        self.offset = 0
+        self.selected_index = None
+        self._formatted = {}
+        self.tree.selection_remove(self.tree.selection())
+        self._refresh()
+
+    def clear(self):
+        """Remove all rows"""
+        self.set_rows([])
+
+    def scroll_to(self, offset):
+        """Scroll so that row `offset` is the first visible row"""
+        max_offset = max(0, len(self.rows) - self.height)
+        offset = max(0, min(int(offset), max_offset))
+        if offset != self.offset:
+            self.offset = offset
+            self._refresh()
+
+    def yview(self, *args):
+        """Scrollbar command handler (moveto / scroll units / scroll pages)"""
+        if not args:
+            return
+        total = len(self.rows)
+        if args[0] == 'moveto':
+            self.scroll_to(round(float(args[1]) * total))
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if len(args) > 2 and args[2] == 'pages':
+                step *= self.height
+            self.scroll_to(self.offset + step)
+
+    def _on_mousewheel(self, event):
+        """Handle mouse wheel scrolling on the table"""
+        if event.num == 4:
+            step = -1
+        elif event.num == 5:
+            step = 1
+        elif event.delta:
+            step = int(-1 * (event.delta / 120)) or (-1 if event.delta > 0 else 1)
+        else:
+            return
+        self.scroll_to(self.offset + step * 3)
+        # Jangan teruskan ke router mouse wheel halaman (bind_all)
+        return "break"
+
+    def _on_select(self, event=None):
+        """Track selection as a data index so it survives item recycling"""
+        selection = self.tree.selection()
+        if selection and selection[0] in self._item_ids:
+            self.selected_index = self.offset + self._item_ids.index(selection[0])
+
+    def _move_selection(self, step):
+        """Keyboard navigation across the whole row list, not only the visible window"""
+        if not self.rows:
+            return 'break'
+        if self.selected_index is None:
+            index = self.offset
+        else:
+            index = max(0, min(self.selected_index + step, len(self.rows) - 1))
+
+        if index < self.offset:
+            self.scroll_to(index)
+        elif index >= self.offset + self.height:
+            self.scroll_to(index - self.height + 1)
+
+        self.selected_index = index
+        self._apply_selection()
+        return 'break'
+
+    def _apply_selection(self):
+        """Reselect the pool item that currently shows the selected row"""
+        slot = None if self.selected_index is None else self.selected_index - self.offset
+        if slot is not None and 0 <= slot < len(self._item_ids):
+            iid = self._item_ids[slot]
+            if self.tree.selection() != (iid,):
+                self.tree.selection_set(iid)
+            self.tree.focus(iid)
+        elif self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+
+    def _materialize(self, index):
+        """Format a row lazily, caching it while it stays near the view"""
+        cached = self._formatted.get(index)
+        if cached is None:
+            row = self.rows[index]
+            values = self.row_formatter(row) if self.row_formatter else row
+            if self.row_tags is not None:
+                tags = self.row_tags[index]
+            else:
+                tags = self.row_tagger(row) if self.row_tagger else ()
+            cached = (values, tags)
+            self._formatted[index] = cached
+        return cached
+
+    def _refresh(self):
+        """Bind the visible window of rows onto the recycled Treeview items"""
+        total = len(self.rows)
+        visible = min(self.height, total - self.offset)
+
+        # Buang baris terformat di luar window + overscan
+        low = self.offset - self.overscan
+        high = self.offset + self.height + self.overscan
+        for index in [i for i in self._formatted if i < low or i >= high]:
+            del self._formatted[index]
+
+        # Sesuaikan ukuran pool item
+        while len(self._item_ids) > visible:
+            self.tree.delete(self._item_ids.pop())
+            self._shown.pop()
+        while len(self._item_ids) < visible:
+            self._item_ids.append(self.tree.insert('', 'end'))
+            self._shown.append(None)
+
+        # Diff per slot: item hanya ditulis ulang jika isinya berubah
+        for slot, iid in enumerate(self._item_ids):
+            row = self._materialize(self.offset + slot)
+            if self._shown[slot] != row:
+                self.tree.item(iid, values=row[0], tags=row[1])
+                self._shown[slot] = row
+
+        # Pre-format overscan supaya scroll kecil tidak perlu format ulang
+        for index in range(max(0, low), min(total, high)):
+            self._materialize(index)
+
+        if total > self.height:
+            self.scrollbar.set(self.offset / total, (self.offset + self.height) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+        self._apply_selection()
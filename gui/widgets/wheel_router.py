@@ -0,0 +1,111 @@
+"""
+Mouse wheel router for SIKELAR application
+One application-wide binding for the mouse wheel (bind_all) instead of
+binding every widget of a page on show and unbinding it on hide. Pages
+register their scroll targets once; an event is routed to the nearest
+registered ancestor of the widget under the pointer, found from the Tk
+path name and cached per widget
+"""
+
+import tkinter as tk
+
+
+class MouseWheelRouter:
+    """
+    Routes <MouseWheel> (Windows/macOS) and <Button-4>/<Button-5> (X11).
+
+    A target is a container widget plus a handler `handler(step)` where step
+    is the number of units to scroll (negative is up/left). A handler that
+    returns False could not scroll, the event then goes to the next
+    registered ancestor. A target registered with handler None is a
+    passthrough: widgets inside it (ScrolledText, ...) keep their own wheel
+    handling and nothing is routed. Hidden pages are not under the pointer,
+    so targets stay registered while a page is hidden.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._targets = {}   # path widget -> handler (None = passthrough)
+        self._cache = {}     # path widget di bawah pointer -> list handler, terdekat dulu
+
+        root.bind_all('<MouseWheel>', self._on_wheel, add='+')
+        root.bind_all('<Button-4>', self._on_wheel, add='+')
+        root.bind_all('<Button-5>', self._on_wheel, add='+')
+
+    def register(self, widget, handler):
+        """Route wheel events over widget (and its descendants) to handler"""
+        self._targets[str(widget)] = handler
+        self._cache.clear()
+
+    def register_canvas(self, canvas, container=None, orient='y'):
+        """Scroll `canvas` for wheel events over container (default: the canvas itself)"""
+        def scroll(step):
+            view = canvas.yview() if orient == 'y' else canvas.xview()
+            # Konten sudah mentok (atau muat semua), teruskan ke target di atasnya
+            if (step < 0 and view[0] <= 0) or (step > 0 and view[1] >= 1):
+                return False
+            if orient == 'y':
+                canvas.yview_scroll(step, 'units')
+            else:
+                canvas.xview_scroll(step, 'units')
+            return True
+
+        self.register(container if container is not None else canvas, scroll)
+
+    def passthrough(self, widget):
+        """Leave wheel events over widget to the widget's own bindings"""
+        self.register(widget, None)
+
+    def unregister(self, widget):
+        """Remove a target (e.g. before destroying its widget)"""
+        if self._targets.pop(str(widget), False) is not False:
+            self._cache.clear()
+
+    def _handlers_for(self, path):
+        """Handlers of the registered ancestors of path, nearest first (cached)"""
+        handlers = self._cache.get(path)
+        if handlers is None:
+            handlers = []
+            current = path
+            while current:
+                if current in self._targets:
+                    handler = self._targets[current]
+                    if handler is None:
+                        break
+                    handlers.append(handler)
+                if current == '.':
+                    break
+                current = current.rsplit('.', 1)[0] or '.'
+            self._cache[path] = handlers
+        return handlers
+
+    @staticmethod
+    def wheel_step(event):
+        """Scroll units of a wheel event, negative is up"""
+        if event.num == 4:
+            return -1
+        if event.num == 5:
+            return 1
+        if event.delta:
+            # delta kelipatan 120 di Windows, kecil (±1..) di macOS
+            return int(-1 * (event.delta / 120)) or (-1 if event.delta > 0 else 1)
+        return 0
+
+    def _on_wheel(self, event):
+        step = self.wheel_step(event)
+        if not step:
+            return
+        try:
+            widget = self.root.winfo_containing(event.x_root, event.y_root)
+        except KeyError:
+            # Widget di bawah pointer bukan widget tkinter (mis. popup combobox)
+            return
+        if widget is None:
+            return
+        for handler in self._handlers_for(str(widget)):
+            try:
+                if handler(step) is not False:
+                    return
+            except tk.TclError:
+                # Widget target sudah dihancurkan
+                continue
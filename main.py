@@ -3,34 +3,22 @@ Main entry point untuk aplikasi SIKELAR
 Pastikan file ini dinamakan main.py atau sikelar_main.py
 """
 
+import time
+_STARTED = time.perf_counter()  # Awal startup, dipakai mode pengukuran startup
+
 import tkinter as tk
 import os
 import sys
-import ctypes
+import multiprocessing
 from gui.main_app import SikelarMainApp  # Import class utama
+from gui.startup_probe import StartupProbe
+_IMPORTED = time.perf_counter()
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
-    try:
-        # PyInstaller creates a temp folder and stores path in _MEIPASS
-        base_path = sys._MEIPASS
-        print(f"Running from PyInstaller bundle: {base_path}")
-    except Exception:
-        base_path = os.path.abspath(".")
-        print(f"Running from source directory: {base_path}")
-    
-    full_path = os.path.join(base_path, relative_path)
-    print(f"Looking for resource: {full_path}")
-    print(f"Resource exists: {os.path.exists(full_path)}")
-    
-    # Debug: list available files in base directory
-    try:
-        available_files = os.listdir(base_path)
-        print(f"Available files in {base_path}: {available_files[:10]}...")  # Show first 10 files
-    except Exception as e:
-        print(f"Could not list directory contents: {e}")
-    
-    return full_path
+    # PyInstaller creates a temp folder and stores path in _MEIPASS
+    base_path = getattr(sys, '_MEIPASS', None) or os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
 
 def set_window_icon(root):
     """Set window icon with multiple fallback options"""
@@ -66,10 +54,20 @@ def set_taskbar_icon():
 
 def main():
     """Main function to run SIKELAR application"""
+    # Mode pengukuran startup (SIKELAR_STARTUP_BENCHMARK), None saat dipakai biasa
+    probe = StartupProbe.from_env(_STARTED)
+    if probe:
+        from gui.pages.home_page import HomePage
+        probe.mark('imports', _IMPORTED)
+        probe.time_method(HomePage, 'build_page')
+        probe.time_method(HomePage, 'create_tool_cards')
+    
     # Set taskbar icon sebelum membuat window
     set_taskbar_icon()
     
     root = tk.Tk()
+    if probe:
+        probe.mark('tk_root')
     
     # Set window icon
     icon_path = set_window_icon(root)
@@ -101,6 +99,9 @@ def main():
     
     # Create and run application
     app = SikelarMainApp(root)
+    if probe:
+        probe.mark('app_created')
+        probe.watch(root, app)
     
     try:
         root.mainloop()
@@ -112,4 +113,6 @@ def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    # Wajib untuk process pool (export PDF massal) pada build PyInstaller di Windows
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -6,7 +6,9 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('sikelar_logo3.ico', '.'), ('gui', 'gui'), ('backend', 'backend')],
-    hiddenimports=[],
+    # Modul yang diimport lazy (di dalam fungsi) saat export / navigasi pertama
+    hiddenimports=['gui.pages.pengesahan_page', 'gui.pages.rkas_page', 'backend.pdf_report',
+                   'backend.bulk_report', 'backend.excel_export'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],